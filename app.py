@@ -2,7 +2,8 @@
 from flask import Flask, request
 import logging
 from flask_cors import CORS
-from extensions import mail
+from extensions import mail, mail_queue, autocomplete
+from models.database import init_db
 from routes import register_blueprints  # ✅ mail이 분리됐으니 이건 ok
 
 app = Flask(__name__)
@@ -25,6 +26,9 @@ app.config['MAIL_DEFAULT_SENDER'] = 'yeji0045@itsin.co.kr'   # 기본 보내는
 
 # 초기화
 mail.init_app(app)
+mail_queue.init_app(app)  # 메일은 요청 안에서 보내지 않고 큐에 넣어 백그라운드 발송
+init_db(app)  # 요청 단위 DB 세션 (commit/rollback/반납 자동)
+autocomplete.init_app(app)  # 자동완성 색인 백그라운드 적재
 
 # CORS
 CORS(app,
@@ -33,7 +37,7 @@ CORS(app,
               "http://172.22.208.1:3000"
      ]}},
      supports_credentials=True,
-     expose_headers=["Content-Disposition"])
+     expose_headers=["Content-Disposition", "X-Next-Cursor", "X-Has-Next", "X-Page-Limit"])
 
 # 로깅 설정
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
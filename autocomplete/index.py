@@ -0,0 +1,149 @@
+import re
+import bisect
+import threading
+
+# 📌 한글 초성 (호환 자모) - '가'(0xAC00) 부터 초성 1개당 588 글자
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_HANGUL_FIRST, _HANGUL_LAST = 0xAC00, 0xD7A3
+_CHOSEONG_ONLY = re.compile(f"^[{CHOSEONG}]+$")
+_WORD_SPLIT = re.compile(r"[\s()\[\]{}.,/_\-·㈜]+")
+
+
+def normalize(text):
+    """비교용 문자열 - 소문자, 공백 제거"""
+    return re.sub(r"\s+", "", str(text or "")).lower()
+
+
+def to_choseong(text):
+    """'잇신정보' → 'ㅇㅅㅈㅂ' (한글이 아닌 글자는 그대로)"""
+    chars = []
+    for ch in text:
+        code = ord(ch)
+        if _HANGUL_FIRST <= code <= _HANGUL_LAST:
+            chars.append(CHOSEONG[(code - _HANGUL_FIRST) // 588])
+        else:
+            chars.append(ch)
+    return "".join(chars)
+
+
+def has_hangul(text):
+    return any(_HANGUL_FIRST <= ord(ch) <= _HANGUL_LAST for ch in text)
+
+
+def is_choseong_query(text):
+    return bool(_CHOSEONG_ONLY.match(text))
+
+
+def prefix_keys(text):
+    """
+    검색 키 목록 - 전체 문자열 + 단어별 시작 위치 (중간 단어로도 찾을 수 있게)
+    - '잇신 정보통신' → ['잇신정보통신', '정보통신']
+    """
+    text = str(text or "").strip()
+    if not text:
+        return []
+    keys = [normalize(text)]
+    words = [w for w in _WORD_SPLIT.split(text) if w]
+    for i in range(1, len(words)):
+        keys.append(normalize("".join(words[i:])))
+    return list(dict.fromkeys(k for k in keys if k))
+
+
+class PrefixIndex:
+    """
+    정렬된 (키, 필드 우선순위, id) 배열 + bisect 로 앞글자 검색
+    - 키는 일반 문자열용 / 초성용 배열을 따로 둠 ('ㅇㅅ' 처럼 초성만 입력하면 초성 배열에서 검색)
+    - upsert/remove 로 한 건씩 갱신 (insort), replace 로 전체 교체
+    - records: {id: 응답에 내려줄 dict}
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys = []
+        self._choseong_keys = []
+        self._entries = {}  # {id: [(배열, 항목), ...]} - 삭제용
+        self.records = {}
+
+    @staticmethod
+    def _build(record_id, fields):
+        """fields: [(우선순위, 값), ...] → (일반 키 항목, 초성 키 항목)"""
+        plain, choseong = [], []
+        for priority, value in fields:
+            for key in prefix_keys(value):
+                plain.append((key, priority, record_id))
+                if has_hangul(key):
+                    choseong.append((to_choseong(key), priority, record_id))
+        return plain, choseong
+
+    def replace(self, items):
+        """items: [(id, record, fields), ...] 로 전체 재구성"""
+        keys, choseong_keys, entries, records = [], [], {}, {}
+        for record_id, record, fields in items:
+            plain, choseong = self._build(record_id, fields)
+            keys.extend(plain)
+            choseong_keys.extend(choseong)
+            entries[record_id] = (plain, choseong)
+            records[record_id] = record
+        keys.sort()
+        choseong_keys.sort()
+        with self._lock:
+            self._keys, self._choseong_keys, self._entries, self.records = keys, choseong_keys, entries, records
+
+    def _remove_locked(self, record_id):
+        plain, choseong = self._entries.pop(record_id, ([], []))
+        for array, items in ((self._keys, plain), (self._choseong_keys, choseong)):
+            for item in items:
+                i = bisect.bisect_left(array, item)
+                if i < len(array) and array[i] == item:
+                    del array[i]
+        self.records.pop(record_id, None)
+
+    def upsert(self, record_id, record, fields):
+        plain, choseong = self._build(record_id, fields)
+        with self._lock:
+            self._remove_locked(record_id)
+            for item in plain:
+                bisect.insort(self._keys, item)
+            for item in choseong:
+                bisect.insort(self._choseong_keys, item)
+            self._entries[record_id] = (plain, choseong)
+            self.records[record_id] = record
+
+    def remove(self, record_id):
+        with self._lock:
+            self._remove_locked(record_id)
+
+    def search(self, query, limit, accept=None, scan_max=500):
+        """
+        앞글자 일치 검색 → [record, ...]
+        - 정렬: 키 전체 일치 → 필드 우선순위 → 짧은 키 순
+        - accept: record → bool (유형 필터 등)
+        """
+        query = normalize(query)
+        if not query:
+            return []
+        with self._lock:
+            array = self._choseong_keys if is_choseong_query(query) else self._keys
+            start = bisect.bisect_left(array, (query,))
+            matches = {}
+            for key, priority, record_id in array[start:start + scan_max]:
+                if not key.startswith(query):
+                    break
+                rank = (key != query, priority, len(key))
+                if record_id not in matches or rank < matches[record_id]:
+                    matches[record_id] = rank
+            records = self.records
+
+            ordered = sorted(matches, key=lambda record_id: (matches[record_id], record_id))
+            results = []
+            for record_id in ordered:
+                record = records.get(record_id)
+                if record is None or (accept and not accept(record)):
+                    continue
+                results.append(record)
+                if len(results) >= limit:
+                    break
+        return results
+
+    def __len__(self):
+        return len(self.records)
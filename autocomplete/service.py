@@ -0,0 +1,271 @@
+import re
+import time
+import logging
+import threading
+
+from autocomplete.index import PrefixIndex
+from models.cache import CACHE_REDIS, CACHE_REDIS_RETRY
+from models.database import get_db_connection
+
+try:
+    import redis
+except ImportError:  # redis 패키지가 없으면 워커 간 변경 전파 없이 주기적 전체 재적재만
+    redis = None
+
+# 📌 자동완성 설정
+AUTOCOMPLETE_DEFAULT_LIMIT = 10
+AUTOCOMPLETE_MAX_LIMIT = 50
+AUTOCOMPLETE_SYNC_INTERVAL = 1.0       # 다른 워커의 변경 확인 간격(초) - 이 사이의 검색은 메모리만 사용
+AUTOCOMPLETE_FULL_RELOAD = 10 * 60     # 전체 재적재 간격(초) - 변경 전파를 놓쳤을 때를 대비
+AUTOCOMPLETE_CHANGE_LOG_MAX = 1000     # Redis 에 남겨두는 변경 기록 수 (넘으면 전체 재적재)
+
+# 📌 변경 기록 추가 (번호 증가 + 기록을 한 번에 → 번호만 늘고 기록이 없는 순간이 생기지 않음)
+#   KEYS: [번호 키, 기록 키], ARGV: [보관 개수, id, id, ...] → 각 id 에 붙은 번호 목록
+_PUBLISH_SCRIPT = """
+local seqs = {}
+for i = 2, #ARGV do
+    local seq = redis.call('INCR', KEYS[1])
+    redis.call('ZADD', KEYS[2], seq, ARGV[i] .. ':' .. seq)
+    seqs[#seqs + 1] = seq
+end
+redis.call('ZREMRANGEBYRANK', KEYS[2], 0, -tonumber(ARGV[1]) - 1)
+return seqs
+"""
+
+
+def _biz_num_digits(value):
+    return re.sub(r"\D", "", value or "")
+
+
+# 📌 자동완성 대상
+#  - sql: 전체 적재 쿼리 (id 컬럼 필수), WHERE 로 id 목록을 붙여 한 건씩 갱신할 때도 사용
+#  - fields: row → [(우선순위, 검색 값), ...] (우선순위 작을수록 먼저)
+#  - record: row → 응답 dict
+#  - filters: {쿼리 파라미터: record 키} - 값이 같은 항목만
+ENTITIES = {
+    "customers": {
+        "sql": "SELECT customer_id AS id, customer_nm, biz_num, customer_type FROM customer",
+        "id_column": "customer_id",
+        "fields": lambda row: [(0, row["customer_nm"]), (1, row["biz_num"]), (1, _biz_num_digits(row["biz_num"]))],
+        "record": lambda row: {"id": row["id"], "customerNm": row["customer_nm"], "bizNum": row["biz_num"],
+                               "customerType": row["customer_type"]},
+        "filters": {"customerType": "customerType"},
+    },
+    "products": {
+        "sql": "SELECT id, p_name, p_vendor FROM t_product_add",
+        "id_column": "id",
+        "fields": lambda row: [(0, row["p_name"]), (1, row["p_vendor"])],
+        "record": lambda row: {"id": row["id"], "pName": row["p_name"], "pVendor": row["p_vendor"]},
+        "filters": {"vendor": "pVendor"},
+    },
+    "users": {
+        "sql": "SELECT usr_id AS id, name, email, position, role_cd FROM user",
+        "id_column": "usr_id",
+        "fields": lambda row: [(0, row["name"]), (1, row["email"]), (1, (row["email"] or "").split("@")[0])],
+        "record": lambda row: {"id": row["id"], "name": row["name"], "email": row["email"],
+                               "position": row["position"], "roleCd": row["role_cd"]},
+        "filters": {"roleCd": "roleCd"},
+    },
+}
+
+
+class AutocompleteService:
+    """
+    자동완성용 메모리 색인 (엔티티별 PrefixIndex)
+    - init_app: 앱 시작 시 백그라운드에서 전체 적재 (검색이 먼저 오면 그 요청에서 적재)
+    - changed(entity, *ids): 쓰기 API 가 커밋 후 호출 → 해당 행만 다시 읽어 색인 갱신
+      + Redis 변경 기록에 남겨서 다른 워커도 AUTOCOMPLETE_SYNC_INTERVAL 안에 같은 행만 갱신
+    - search: MySQL 을 거치지 않고 메모리에서 바로 응답
+    """
+
+    def __init__(self, entities=ENTITIES, redis_options=CACHE_REDIS):
+        self.entities = entities
+        self._indexes = {name: PrefixIndex() for name in entities}
+        self._loaded_at = {}   # {entity: 전체 적재 시각}
+        self._seen = {}        # {entity: 마지막으로 반영한 Redis 변경 번호}
+        self._synced_at = {}
+        self._reloading = set()
+        self._lock = threading.Lock()
+        self._redis = None
+        self._publish_script = None
+        if redis is not None and redis_options:
+            self._redis = redis.StrictRedis(decode_responses=True, socket_timeout=0.5, socket_connect_timeout=0.5,
+                                            **redis_options)
+            self._publish_script = self._redis.register_script(_PUBLISH_SCRIPT)
+        self._redis_down_until = 0.0
+
+    def init_app(self, app):
+        threading.Thread(target=self._load_all, name="autocomplete-load", daemon=True).start()
+
+    def _load_all(self):
+        for name in self.entities:
+            try:
+                self._ensure_loaded(name)
+            except Exception:
+                logging.exception(f"⚠️ 자동완성 색인 적재 실패: {name} - 첫 검색 때 다시 시도")
+
+    # ✅ Redis 변경 기록
+    def _shared(self):
+        if self._redis is None or time.monotonic() < self._redis_down_until:
+            return None
+        return self._redis
+
+    def _shared_failed(self, e):
+        self._redis_down_until = time.monotonic() + CACHE_REDIS_RETRY
+        logging.warning(f"⚠️ 자동완성 Redis 사용 불가 - {CACHE_REDIS_RETRY}초 동안 변경 전파 중단: {e}")
+
+    def _seq_key(self, name):
+        return f"autocomplete:{name}:seq"
+
+    def _log_key(self, name):
+        return f"autocomplete:{name}:changes"
+
+    def _current_seq(self, name):
+        shared = self._shared()
+        if shared is None:
+            return None
+        try:
+            return int(shared.get(self._seq_key(name)) or 0)
+        except redis.RedisError as e:
+            self._shared_failed(e)
+            return None
+
+    # ✅ 적재 / 갱신
+    def _fetch(self, name, ids=None):
+        spec = self.entities[name]
+        sql, params = spec["sql"], ()
+        if ids is not None:
+            sql += f" WHERE {spec['id_column']} IN ({', '.join(['%s'] * len(ids))})"
+            params = tuple(ids)
+        conn = get_db_connection()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(sql, params)
+                return cursor.fetchall()
+        finally:
+            conn.close()
+
+    def _load(self, name):
+        spec = self.entities[name]
+        seq = self._current_seq(name)  # 적재 전 번호 - 적재 중 생긴 변경은 다음 동기화에서 다시 반영
+        started = time.monotonic()
+        rows = self._fetch(name)
+        self._indexes[name].replace([(row["id"], spec["record"](row), spec["fields"](row)) for row in rows])
+        self._loaded_at[name] = time.monotonic()
+        if seq is not None:
+            self._seen[name] = seq
+        logging.info(f"🔎 자동완성 색인 적재: {name} {len(rows)}건 ({time.monotonic() - started:.2f}초)")
+
+    def _ensure_loaded(self, name):
+        """처음이면 여기서 적재, 오래됐으면 지금 색인으로 응답하고 백그라운드에서 재적재"""
+        loaded_at = self._loaded_at.get(name)
+        if loaded_at is None:
+            with self._lock:
+                if name not in self._loaded_at:
+                    self._load(name)
+        elif time.monotonic() - loaded_at >= AUTOCOMPLETE_FULL_RELOAD:
+            self._reload_in_background(name)
+
+    def _reload_in_background(self, name):
+        with self._lock:
+            if name in self._reloading:
+                return
+            self._reloading.add(name)
+        threading.Thread(target=self._reload, args=(name,), name=f"autocomplete-reload-{name}", daemon=True).start()
+
+    def _reload(self, name):
+        try:
+            with self._lock:
+                self._load(name)
+        except Exception:
+            logging.exception(f"⚠️ 자동완성 색인 재적재 실패: {name}")
+            self._loaded_at[name] = time.monotonic()  # 다음 주기에 다시 시도
+        finally:
+            self._reloading.discard(name)
+
+    def _apply(self, name, ids):
+        """해당 id 들만 다시 읽어서 색인 갱신 (없어진 행은 삭제)"""
+        spec = self.entities[name]
+        index = self._indexes[name]
+        rows = {row["id"]: row for row in self._fetch(name, ids)}
+        for record_id in ids:
+            row = rows.get(record_id)
+            if row is None:
+                index.remove(record_id)
+            else:
+                index.upsert(record_id, spec["record"](row), spec["fields"](row))
+
+    def _sync(self, name):
+        """다른 워커의 변경 반영 (AUTOCOMPLETE_SYNC_INTERVAL 마다 한 번 Redis 확인)"""
+        now = time.monotonic()
+        if now - self._synced_at.get(name, 0) < AUTOCOMPLETE_SYNC_INTERVAL:
+            return
+        self._synced_at[name] = now
+
+        seq = self._current_seq(name)
+        seen = self._seen.get(name)
+        if seq is None or seen is None or seq == seen:
+            return
+        try:
+            changes = self._redis.zrangebyscore(self._log_key(name), seen + 1, seq, withscores=True)
+        except redis.RedisError as e:
+            self._shared_failed(e)
+            return
+
+        if seq - seen > len(changes):
+            # 변경 기록이 잘려서 빠진 것이 있음 → 지금 색인으로 응답하고 백그라운드에서 전체 재적재
+            self._reload_in_background(name)
+            return
+        with self._lock:
+            if self._seen.get(name) != seen:
+                return  # 다른 스레드가 이미 반영
+            self._apply(name, list(dict.fromkeys(int(member.split(":")[0]) for member, _ in changes)))
+            self._seen[name] = seq
+
+    def changed(self, name, *ids):
+        """쓰기 API 훅 - 커밋 후 호출 (실패해도 요청은 성공 처리, 전체 재적재 때 반영됨)"""
+        try:
+            ids = [int(record_id) for record_id in ids if record_id is not None]
+            if not ids or name not in self.entities:
+                return
+            if name in self._loaded_at:
+                with self._lock:
+                    self._apply(name, ids)
+            self._publish(name, ids)
+        except Exception:
+            logging.exception(f"⚠️ 자동완성 색인 갱신 실패: {name} {ids}")
+
+    def _publish(self, name, ids):
+        if self._shared() is None:
+            return
+        try:
+            seqs = self._publish_script(keys=[self._seq_key(name), self._log_key(name)],
+                                        args=[AUTOCOMPLETE_CHANGE_LOG_MAX, *ids])
+        except redis.RedisError as e:
+            self._shared_failed(e)
+            return
+        with self._lock:
+            if seqs and int(seqs[0]) == self._seen.get(name, -1) + 1:
+                self._seen[name] = int(seqs[-1])  # 이 워커는 이미 반영함
+
+    # ✅ 검색
+    def search(self, name, query, limit=AUTOCOMPLETE_DEFAULT_LIMIT, filters=None):
+        """앞글자 / 초성 검색 → [record, ...] (모르는 엔티티면 KeyError)"""
+        spec = self.entities[name]
+        self._ensure_loaded(name)
+        self._sync(name)
+
+        conditions = {spec["filters"][key]: value for key, value in (filters or {}).items()
+                      if key in spec["filters"] and value}
+        accept = (lambda record: all(record.get(k) == v for k, v in conditions.items())) if conditions else None
+        return self._indexes[name].search(query, limit, accept)
+
+    def metrics(self):
+        return {
+            name: {
+                "records": len(index),
+                "loadedSecondsAgo": round(time.monotonic() - self._loaded_at[name], 1) if name in self._loaded_at else None,
+                "changeSeq": self._seen.get(name),
+            }
+            for name, index in self._indexes.items()
+        }
@@ -0,0 +1,76 @@
+from openpyxl.utils import coordinate_to_tuple
+from openpyxl.worksheet.cell_range import CellRange
+from openpyxl.worksheet.merge import MergedCellRange
+
+
+class MergedCellIndex:
+    """
+    시트의 병합 셀 색인 (셀 좌표 → 병합 범위)
+    - 매번 ws.merged_cells.ranges 를 전부 훑지 않고 dict 조회 한 번으로 병합 범위를 찾음
+    - 병합/행 삭제는 이 객체를 통해서 해야 색인이 시트와 어긋나지 않음
+    - openpyxl 의 delete_rows 는 병합 범위를 옮기지 않으므로, 삭제 후 아래쪽 병합 범위를 직접 당겨 올림
+    """
+
+    def __init__(self, ws):
+        self.ws = ws
+        self._ranges = set()  # 병합 범위 (CellRange)
+        self._cells = {}      # {(row, col): CellRange}
+        for merged_range in ws.merged_cells.ranges:
+            self._add(CellRange(merged_range.coord))
+
+    def _add(self, cell_range):
+        self._ranges.add(cell_range)
+        for cell in cell_range.cells:
+            self._cells[cell] = cell_range
+
+    def _remove(self, cell_range):
+        self._ranges.discard(cell_range)
+        for cell in cell_range.cells:
+            if self._cells.get(cell) == cell_range:
+                del self._cells[cell]
+
+    def find(self, coordinate):
+        """셀이 속한 병합 범위 (병합되지 않은 셀이면 None)"""
+        return self._cells.get(coordinate_to_tuple(coordinate))
+
+    def write(self, coordinate, value):
+        """병합 범위 안의 셀이면 범위의 왼쪽 위 셀에 값 쓰기"""
+        cell_range = self.find(coordinate)
+        if cell_range is None:
+            self.ws[coordinate] = value
+        else:
+            self.ws.cell(row=cell_range.min_row, column=cell_range.min_col, value=value)
+
+    def merge(self, start_cell, end_cell, value):
+        """범위 병합 후 값 쓰기 (이미 같은 범위로 병합돼 있으면 병합은 생략)"""
+        cell_range = CellRange(f"{start_cell}:{end_cell}")
+        if cell_range not in self._ranges:
+            self.ws.merge_cells(cell_range.coord)
+            self._add(cell_range)
+        self.ws.cell(row=cell_range.min_row, column=cell_range.min_col, value=value)
+
+    def delete_rows(self, idx, amount=1):
+        """행 삭제 + 삭제된 행 아래의 병합 범위를 같이 이동 (삭제 구간에 걸친 범위는 줄이거나 제거)"""
+        self.ws.delete_rows(idx, amount)
+        last = idx + amount - 1
+
+        moved = []
+        for cell_range in [r for r in self._ranges if r.max_row >= idx]:
+            self._remove(cell_range)
+            self.ws.merged_cells.remove(cell_range)
+
+            if cell_range.min_row > last:
+                min_row = cell_range.min_row - amount
+            else:
+                min_row = min(cell_range.min_row, idx)
+            overlap = max(0, min(cell_range.max_row, last) - max(cell_range.min_row, idx) + 1)
+            max_row = cell_range.max_row - (amount if cell_range.min_row > last else overlap)
+            if max_row < min_row or (min_row == max_row and cell_range.min_col == cell_range.max_col):
+                continue  # 삭제 구간 안에 있던 범위 / 셀 1개로 줄어든 범위는 병합 해제
+            moved.append(CellRange(min_col=cell_range.min_col, min_row=min_row,
+                                   max_col=cell_range.max_col, max_row=max_row))
+
+        # 셀(MergedCell)은 delete_rows 가 이미 옮겼으므로 범위 정보만 다시 등록
+        for cell_range in moved:
+            self.ws.merged_cells.add(MergedCellRange(self.ws, cell_range.coord))
+            self._add(cell_range)
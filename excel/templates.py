@@ -0,0 +1,48 @@
+import os
+import pickle
+import logging
+import threading
+
+from openpyxl import load_workbook
+
+
+class WorkbookTemplate:
+    """
+    엑셀 템플릿 캐시
+    - 템플릿(.xlsx)은 한 번만 파싱하고, 원본 Workbook 을 pickle 로 보관
+    - 요청마다 clone() 으로 새 Workbook 을 만들어 사용 (원본은 절대 수정되지 않음)
+      ※ copy.deepcopy 는 openpyxl 스타일 인덱스가 깨져 저장이 실패하므로 pickle 사용
+    - 템플릿 파일 수정시각(mtime)이 바뀌면 다시 파싱
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._stamp = None
+        self._pristine = None
+        self._lock = threading.Lock()
+
+    def _load(self, stamp):
+        wb = load_workbook(self.path)
+        self._pristine = pickle.dumps(wb, protocol=pickle.HIGHEST_PROTOCOL)
+        self._stamp = stamp
+        logging.info(f"엑셀 템플릿 로드: {os.path.basename(self.path)}")
+
+    def _ensure_loaded(self):
+        st = os.stat(self.path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        if self._stamp != stamp:
+            with self._lock:
+                if self._stamp != stamp:
+                    self._load(stamp)
+        return self._pristine
+
+    def clone(self):
+        """원본 템플릿의 복사본 Workbook 반환"""
+        return pickle.loads(self._ensure_loaded())
+
+    def warm_up(self):
+        """서버 시작 시 미리 파싱"""
+        try:
+            self._ensure_loaded()
+        except Exception:
+            logging.exception(f"엑셀 템플릿 로드 실패: {self.path}")
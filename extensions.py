@@ -1,4 +1,8 @@
 # extensions.py
 from flask_mail import Mail
+from mailer.queue import MailQueue
+from autocomplete.service import AutocompleteService
 
 mail = Mail()
+mail_queue = MailQueue()  # 비동기 메일 발송 큐 (mail 과 같은 SMTP 설정 사용)
+autocomplete = AutocompleteService()  # 자동완성 메모리 색인 (고객/제품/사용자)
@@ -0,0 +1,104 @@
+import base64
+import mimetypes
+import uuid
+from email.generator import BytesGenerator
+from email.message import Message as MIMEMessage
+from email.parser import BytesParser
+
+# 📌 첨부파일 인코딩 설정
+ENCODE_CHUNK = 57 * 1024  # 57바이트 = base64 한 줄(76자) → 줄 단위로 끊기게 57의 배수로 읽음
+
+_CONTENT_HEADERS = ('content-type', 'content-transfer-encoding', 'content-disposition', 'content-id',
+                    'content-description', 'mime-version')
+
+
+class StreamAttachment:
+    """
+    스트리밍 첨부파일 - 내용을 메모리에 올리지 않고 파일 객체에서 조금씩 읽어 인코딩
+    - fileobj: 업로드 파일(FileStorage.stream) 이나 open(path, 'rb')
+    - size: 크기 제한 검사/스풀 여부 판단용 (바이트)
+    """
+
+    def __init__(self, filename, fileobj, size, content_type=None):
+        self.filename = filename
+        self.fileobj = fileobj
+        self.size = size
+        self.content_type = content_type or mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+
+    @classmethod
+    def from_upload(cls, file):
+        """werkzeug FileStorage → StreamAttachment (크기는 스트림 끝으로 이동해서 측정)"""
+        stream = file.stream
+        stream.seek(0, 2)
+        size = stream.tell()
+        stream.seek(0)
+        return cls(file.filename, stream, size, file.content_type or None)
+
+    @classmethod
+    def from_path(cls, filename, path, size):
+        return cls(filename, open(path, 'rb'), size)
+
+    def close(self):
+        try:
+            self.fileobj.close()
+        except Exception:
+            pass
+
+
+def _flatten(part, out):
+    BytesGenerator(out, mangle_from_=False, maxheaderlen=0).flatten(part)
+
+
+def write_message(message, attachments, out):
+    """
+    flask_mail Message + StreamAttachment 목록 → MIME 원문을 out 에 기록
+    - 본문/헤더는 flask_mail 이 만든 그대로 사용하고, 첨부파일만 multipart/mixed 로 덧붙임
+    - 첨부파일은 ENCODE_CHUNK 단위로 읽어 base64 인코딩 (파일 전체를 메모리에 올리지 않음)
+    """
+    rendered = BytesParser().parsebytes(message.as_bytes())
+    if not attachments:
+        _flatten(rendered, out)
+        return
+
+    boundary = f'=============={uuid.uuid4().hex}=='
+
+    # 1. 바깥 헤더 (From/To/Subject/Date/Message-ID ...) + multipart 선언
+    outer = MIMEMessage()
+    for key, value in rendered.items():
+        if key.lower() not in _CONTENT_HEADERS:
+            outer[key] = value
+    outer['MIME-Version'] = '1.0'
+    outer['Content-Type'] = f'multipart/mixed; boundary="{boundary}"'
+    outer.set_payload('This is a multi-part message in MIME format.\n')  # 파트는 아래에서 직접 기록
+    _flatten(outer, out)
+
+    # 2. 본문 파트 (flask_mail 이 만든 본문/첨부 그대로)
+    for key in {k for k in rendered.keys() if k.lower() not in _CONTENT_HEADERS or k.lower() == 'mime-version'}:
+        del rendered[key]
+    out.write(f'--{boundary}\n'.encode())
+    _flatten(rendered, out)
+
+    # 3. 첨부파일 파트
+    for attachment in attachments:
+        maintype, _, subtype = attachment.content_type.partition('/')
+        part = MIMEMessage()
+        part['Content-Type'] = f'{maintype}/{subtype or "octet-stream"}'
+        part['Content-Transfer-Encoding'] = 'base64'
+        part.add_header('Content-Disposition', 'attachment', filename=('utf-8', '', attachment.filename))
+        out.write(f'\n--{boundary}\n'.encode())
+        _flatten(part, out)
+
+        carry = b''
+        while True:
+            chunk = attachment.fileobj.read(ENCODE_CHUNK)
+            if not chunk:
+                break
+            # 57바이트 단위가 아닌 나머지는 다음 조각과 합쳐서 인코딩 (줄 길이 유지)
+            chunk = carry + chunk
+            cut = len(chunk) - len(chunk) % 57
+            carry = chunk[cut:]
+            out.write(base64.encodebytes(chunk[:cut]))
+        if carry:
+            out.write(base64.encodebytes(carry))
+
+    out.write(f'\n--{boundary}--\n'.encode())
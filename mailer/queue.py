@@ -0,0 +1,390 @@
+import os
+import io
+import json
+import time
+import uuid
+import queue
+import atexit
+import logging
+import smtplib
+import threading
+
+from flask_mail import BadHeaderError, sanitize_address, sanitize_addresses
+
+from mailer.mime import write_message
+
+# 📌 메일 발송 큐 설정
+MAIL_WORKERS = 2            # 발송 스레드 수 (스레드마다 SMTP 연결 1개 유지)
+MAIL_QUEUE_MAX = 1000       # 대기 메일 상한 (넘으면 MailQueueFullError)
+MAIL_BATCH_SIZE = 20        # 한 번 깨어났을 때 같은 연결로 이어서 보내는 최대 건수
+MAIL_IDLE_TIMEOUT = 60      # 이 시간(초) 동안 보낼 메일이 없으면 SMTP 연결 종료
+MAIL_MAX_RETRIES = 5        # 일시적 오류 재시도 횟수 - 넘으면 dead letter
+MAIL_RETRY_BASE = 5         # 재시도 대기(초) = MAIL_RETRY_BASE * 2^(시도-1), 최대 MAIL_RETRY_MAX
+MAIL_RETRY_MAX = 10 * 60
+MAIL_FLUSH_TIMEOUT = 10     # 프로세스 종료 시 남은 메일을 기다리는 시간(초)
+MAIL_SPOOL_THRESHOLD = 256 * 1024  # 첨부파일 합계가 이보다 크면 원문을 메모리 대신 디스크(outbox)에 보관
+MAIL_SEND_BUFFER = 64 * 1024       # 디스크 원문을 SMTP 로 보낼 때 한 번에 보내는 크기
+
+
+class MailQueueFullError(Exception):
+    """대기 중인 메일이 MAIL_QUEUE_MAX 를 넘었을 때 발생"""
+
+
+class _Outgoing:
+    """
+    큐에 들어가는 메일 1건 - 요청 안에서 MIME 원문으로 미리 만들어 둠 (워커는 앱 컨텍스트 불필요)
+    - 첨부파일이 작으면 원문을 메모리(raw)에, 크면 outbox 디렉터리의 파일(path)에 보관
+    """
+
+    __slots__ = ('message_id', 'envelope_from', 'recipients', 'raw', 'path', 'mail_options', 'rcpt_options',
+                 'subject', 'attempts')
+
+    def __init__(self, message, attachments, outbox_dir):
+        self.message_id = uuid.uuid4().hex
+        self.envelope_from = sanitize_address(message.sender)
+        self.recipients = list(sanitize_addresses(message.send_to))
+        self.mail_options = list(message.mail_options)
+        self.rcpt_options = list(message.rcpt_options)
+        self.subject = message.subject
+        self.attempts = 0
+        self.raw = None
+        self.path = None
+
+        if sum(a.size for a in attachments) > MAIL_SPOOL_THRESHOLD:
+            path = os.path.join(outbox_dir, f'{self.message_id}.eml')
+            try:
+                with open(path, 'wb') as f:
+                    write_message(message, attachments, f)
+            except Exception:
+                self.discard(path)
+                raise
+            self.path = path
+        else:
+            buffer = io.BytesIO()
+            write_message(message, attachments, buffer)
+            self.raw = buffer.getvalue()
+
+    def discard(self, path=None):
+        """디스크에 보관한 원문 삭제 (발송 완료 후)"""
+        path = path or self.path
+        if path:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+class MailQueue:
+    """
+    비동기 메일 발송 큐 (flask_mail Message 그대로 사용)
+    - send(msg) 는 큐에 넣고 message id 만 반환, 실제 발송은 백그라운드 스레드에서
+    - 발송 스레드는 SMTP 연결을 계속 유지하며 쌓인 메일을 이어서 보냄 (메일마다 SSL 핸드셰이크 X)
+    - 일시적 오류는 지수 백오프로 재시도, 영구 오류(5xx)나 재시도 초과는 dead letter 로 기록
+    """
+
+    def __init__(self, app=None, spool_dir=None):
+        self.spool_dir = spool_dir or os.path.join(os.getcwd(), 'temp', 'mail')
+        self._settings = None
+        self._queue = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._inflight = 0
+        self._retrying = set()  # 재시도 대기 중인 메일 (타이머)
+        self._idle = threading.Condition(self._lock)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        # SMTP 설정은 flask_mail(mail.init_app) 과 같은 app.config 값 사용
+        config = app.config
+        self._settings = {
+            'server': config.get('MAIL_SERVER', '127.0.0.1'),
+            'port': config.get('MAIL_PORT', 25),
+            'use_ssl': config.get('MAIL_USE_SSL', False),
+            'use_tls': config.get('MAIL_USE_TLS', False),
+            'username': config.get('MAIL_USERNAME'),
+            'password': config.get('MAIL_PASSWORD'),
+            'suppress': config.get('MAIL_SUPPRESS_SEND', app.testing),
+        }
+        os.makedirs(os.path.join(self.spool_dir, 'dead_letter'), exist_ok=True)
+        os.makedirs(os.path.join(self.spool_dir, 'outbox'), exist_ok=True)
+        app.extensions['mail_queue'] = self
+
+    # 📌 요청 쪽
+    def send(self, message, attachments=()):
+        """
+        메일을 발송 큐에 넣고 message id 반환 (요청/앱 컨텍스트 안에서 호출)
+        - attachments: mailer.mime.StreamAttachment 목록 (큰 파일도 메모리에 올리지 않고 인코딩)
+        """
+        if not message.send_to:
+            raise ValueError('수신자가 없습니다.')
+        if not message.sender:
+            raise ValueError('보내는 사람(sender)이 없습니다.')
+        if message.has_bad_headers():
+            raise BadHeaderError('메일 헤더에 줄바꿈 문자가 포함되어 있습니다.')
+        if message.date is None:
+            message.date = time.time()
+
+        if self._settings['suppress']:
+            message_id = uuid.uuid4().hex
+            logging.info(f"메일 발송 생략(MAIL_SUPPRESS_SEND): {message_id} {message.subject}")
+            return message_id
+
+        outbox = self._get_queue()
+        if outbox.full():
+            raise MailQueueFullError('메일 발송 대기열이 가득 찼습니다. 잠시 후 다시 시도해주세요.')
+        item = _Outgoing(message, attachments, os.path.join(self.spool_dir, 'outbox'))
+        try:
+            outbox.put_nowait(item)
+        except queue.Full:
+            item.discard()
+            raise MailQueueFullError('메일 발송 대기열이 가득 찼습니다. 잠시 후 다시 시도해주세요.')
+        logging.info(f"메일 발송 큐 등록: {item.message_id} to={item.recipients} subject={item.subject}")
+        return item.message_id
+
+    def metrics(self):
+        outbox = self._queue if self._pid == os.getpid() else None
+        return {'queued': outbox.qsize() if outbox else 0, 'inFlight': self._inflight,
+                'retrying': len(self._retrying)}
+
+    def flush(self, timeout=MAIL_FLUSH_TIMEOUT):
+        """큐가 빌 때까지 대기 (프로세스 종료 시 호출) - 보내지 못한 건 dead letter 로 남김"""
+        if self._queue is None or self._pid != os.getpid():
+            return
+        deadline = time.monotonic() + timeout
+        with self._idle:
+            while self._queue.unfinished_tasks and time.monotonic() < deadline:
+                self._idle.wait(0.2)
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            self._dead_letter(item, '프로세스 종료 전 발송하지 못함')
+        with self._lock:
+            retrying, self._retrying = list(self._retrying), set()
+        for item in retrying:
+            self._dead_letter(item, '프로세스 종료 전 재시도하지 못함')
+
+    # 📌 발송 스레드 쪽
+    def _get_queue(self):
+        # fork 된 워커마다 자기 큐/발송 스레드를 갖도록 pid 로 구분
+        pid = os.getpid()
+        if self._queue is None or self._pid != pid:
+            with self._lock:
+                if self._queue is None or self._pid != pid:
+                    self._queue = queue.Queue(maxsize=MAIL_QUEUE_MAX)
+                    self._inflight = 0
+                    self._retrying = set()
+                    for i in range(MAIL_WORKERS):
+                        threading.Thread(target=self._worker, name=f'mail-sender-{i}', daemon=True).start()
+                    self._pid = pid
+                    atexit.register(self.flush)
+        return self._queue
+
+    def _connect(self):
+        s = self._settings
+        if s['use_ssl']:
+            host = smtplib.SMTP_SSL(s['server'], s['port'], timeout=30)
+        else:
+            host = smtplib.SMTP(s['server'], s['port'], timeout=30)
+        if s['use_tls']:
+            host.starttls()
+        if s['username'] and s['password']:
+            host.login(s['username'], s['password'])
+        return host
+
+    @staticmethod
+    def _close(host):
+        if host is None:
+            return
+        try:
+            host.quit()
+        except Exception:
+            try:
+                host.close()
+            except Exception:
+                pass
+
+    def _worker(self):
+        outbox = self._queue
+        host = None
+        while True:
+            try:
+                first = outbox.get(timeout=MAIL_IDLE_TIMEOUT)
+            except queue.Empty:
+                self._close(host)  # 한동안 보낼 메일이 없으면 연결 정리
+                host = None
+                continue
+
+            # 쌓여 있는 메일은 같은 연결로 이어서 발송
+            batch = [first]
+            while len(batch) < MAIL_BATCH_SIZE:
+                try:
+                    batch.append(outbox.get_nowait())
+                except queue.Empty:
+                    break
+
+            with self._lock:
+                self._inflight += len(batch)
+            for item in batch:
+                try:
+                    host = self._deliver(host, item)
+                finally:
+                    with self._idle:
+                        self._inflight -= 1
+                        outbox.task_done()
+                        self._idle.notify_all()
+
+    def _deliver(self, host, item):
+        """메일 1건 발송 - 반환값은 다음 메일에 쓸 SMTP 연결 (끊겼으면 None)"""
+        item.attempts += 1
+        for reconnect in (False, True):
+            try:
+                if host is None:
+                    host = self._connect()
+                if item.path is None:
+                    refused = host.sendmail(item.envelope_from, item.recipients, item.raw,
+                                            item.mail_options, item.rcpt_options)
+                else:
+                    refused = self._sendmail_file(host, item)
+                if refused:
+                    logging.warning(f"일부 수신자 거부: {item.message_id} {refused}")
+                logging.info(f"메일 발송 완료: {item.message_id} (시도 {item.attempts}회)")
+                item.discard()
+                return host
+            except (smtplib.SMTPServerDisconnected, ConnectionError) as e:
+                # 유지하던 연결이 서버 쪽에서 끊긴 경우 - 새로 연결해서 한 번 더
+                self._close(host)
+                host = None
+                if reconnect:
+                    self._retry_later(item, e)
+            except (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError) as e:
+                if self._permanent(e):
+                    self._dead_letter(item, f'SMTP 영구 오류: {e}')
+                else:
+                    self._retry_later(item, e)
+                return host
+            except Exception as e:
+                self._close(host)
+                self._retry_later(item, e)
+                return None
+        return host
+
+    @staticmethod
+    def _permanent(error):
+        """
+        5xx 면 영구 오류(dead letter), 4xx 면 재시도
+        - 수신자 거부는 수신자별 코드 (e.recipients) - 모두 4xx(그레이리스팅, 메일함 가득 참 등)일 때만 재시도
+        """
+        if isinstance(error, smtplib.SMTPRecipientsRefused):
+            codes = [code for code, _ in error.recipients.values()]
+        else:
+            codes = [getattr(error, 'smtp_code', None)]
+        return not codes or any(not code or code >= 500 for code in codes)
+
+    @staticmethod
+    def _reset(host):
+        try:
+            host.rset()
+        except smtplib.SMTPServerDisconnected:
+            pass
+
+    def _sendmail_file(self, host, item):
+        """
+        smtplib.sendmail 과 같은 절차지만 원문을 파일에서 읽어 조금씩 전송 (메모리에 전체를 올리지 않음)
+        - 줄 끝은 CRLF 로, '.' 으로 시작하는 줄은 '..' 으로 (SMTP DATA 규칙)
+        """
+        host.ehlo_or_helo_if_needed()
+        options = list(item.mail_options)
+        if host.does_esmtp and host.has_extn('size'):
+            options.append(f'size={os.path.getsize(item.path)}')
+
+        code, resp = host.mail(item.envelope_from, options)
+        if code != 250:
+            self._reset(host)
+            raise smtplib.SMTPSenderRefused(code, resp, item.envelope_from)
+
+        refused = {}
+        for recipient in item.recipients:
+            code, resp = host.rcpt(recipient, item.rcpt_options)
+            if code not in (250, 251):
+                refused[recipient] = (code, resp)
+        if len(refused) == len(item.recipients):
+            self._reset(host)
+            raise smtplib.SMTPRecipientsRefused(refused)
+
+        code, resp = host.docmd('data')
+        if code != 354:
+            self._reset(host)
+            raise smtplib.SMTPDataError(code, resp)
+
+        buffer = bytearray()
+        with open(item.path, 'rb') as f:
+            for line in f:
+                line = line.rstrip(b'\r\n')
+                if line.startswith(b'.'):
+                    buffer += b'.'
+                buffer += line + b'\r\n'
+                if len(buffer) >= MAIL_SEND_BUFFER:
+                    host.send(bytes(buffer))
+                    buffer.clear()
+        buffer += b'.\r\n'
+        host.send(bytes(buffer))
+
+        code, resp = host.getreply()
+        if code != 250:
+            self._reset(host)
+            raise smtplib.SMTPDataError(code, resp)
+        return refused
+
+    def _retry_later(self, item, error):
+        if item.attempts >= MAIL_MAX_RETRIES:
+            self._dead_letter(item, f'재시도 {item.attempts}회 실패: {error}')
+            return
+        delay = min(MAIL_RETRY_BASE * 2 ** (item.attempts - 1), MAIL_RETRY_MAX)
+        logging.warning(f"메일 발송 실패, {delay}초 후 재시도: {item.message_id} ({error})")
+
+        outbox = self._queue
+
+        def requeue():
+            with self._lock:
+                if item not in self._retrying:
+                    return  # flush() 에서 이미 dead letter 처리됨
+                self._retrying.discard(item)
+            try:
+                outbox.put_nowait(item)
+            except queue.Full:
+                self._dead_letter(item, '재시도 시 발송 대기열이 가득 참')
+
+        with self._lock:
+            self._retrying.add(item)
+        timer = threading.Timer(delay, requeue)
+        timer.daemon = True
+        timer.start()
+
+    def _dead_letter(self, item, reason):
+        """발송 포기한 메일 기록 - 원문(.eml) + dead_letter.jsonl 한 줄"""
+        logging.error(f"메일 발송 포기: {item.message_id} to={item.recipients} - {reason}")
+        dead_dir = os.path.join(self.spool_dir, 'dead_letter')
+        try:
+            eml_path = os.path.join(dead_dir, f'{item.message_id}.eml')
+            if item.path is not None:
+                os.replace(item.path, eml_path)
+            else:
+                with open(eml_path, 'wb') as f:
+                    f.write(item.raw)
+            record = {
+                'messageId': item.message_id,
+                'failedAt': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'from': item.envelope_from,
+                'to': item.recipients,
+                'subject': item.subject,
+                'attempts': item.attempts,
+                'reason': reason,
+            }
+            with self._lock:
+                with open(os.path.join(self.spool_dir, 'dead_letter.jsonl'), 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        except OSError:
+            logging.exception("dead letter 기록 실패")
@@ -0,0 +1,24 @@
+-- 📁 내용 주소(content-addressed) 첨부파일 저장소 (storage/blobs.py)
+-- 배포 시 한 번 실행: mysql <DB명> < migrations/001_file_blobs.sql  (다시 실행해도 안전)
+
+-- blob 참조 수 테이블
+--   - storage_name: files.unique_file_name 과 같은 값 (blobs/<sha256 앞 2자리>/<sha256>)
+--   - ref_count: 이 blob 을 가리키는 files 행 수
+CREATE TABLE IF NOT EXISTS file_blobs (
+    storage_name VARCHAR(255) NOT NULL PRIMARY KEY,
+    size BIGINT NOT NULL,
+    ref_count INT NOT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+-- files.unique_file_name 이 새 저장 이름(73자)을 담을 수 있는지 확인 → 짧으면 VARCHAR(255) 로 확장 (NULL 허용 여부는 유지)
+SET @unique_file_name_ddl = (
+    SELECT IF(character_maximum_length < 73,
+              CONCAT('ALTER TABLE files MODIFY unique_file_name VARCHAR(255)', IF(is_nullable = 'NO', ' NOT NULL', '')),
+              'DO 0')
+      FROM information_schema.columns
+     WHERE table_schema = DATABASE() AND table_name = 'files' AND column_name = 'unique_file_name'
+);
+PREPARE stmt FROM @unique_file_name_ddl;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
@@ -0,0 +1,34 @@
+-- 🔎 고객 검색 인덱스 (routes/customers.py customer_search_indexes)
+-- 배포 시 한 번 실행: mysql <DB명> < migrations/002_customer_search_indexes.sql  (다시 실행해도 안전)
+-- ⚠️ 첫 FULLTEXT 인덱스 추가는 customer 테이블을 다시 만들며 그동안 쓰기가 막힘 → 사용량이 적은 시간에 실행
+-- 인덱스가 없는 동안 검색 API 는 LIKE 검색으로 동작
+
+DROP PROCEDURE IF EXISTS add_customer_index;
+DELIMITER //
+CREATE PROCEDURE add_customer_index(IN p_index_name VARCHAR(64), IN p_definition VARCHAR(255))
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM information_schema.statistics
+         WHERE table_schema = DATABASE() AND table_name = 'customer' AND index_name = p_index_name
+    ) THEN
+        SET @ddl = CONCAT('ALTER TABLE customer ADD ', p_definition);
+        PREPARE stmt FROM @ddl;
+        EXECUTE stmt;
+        DEALLOCATE PREPARE stmt;
+    END IF;
+END //
+DELIMITER ;
+
+-- 불용어 목록 사용 안 함: 기본(영어) 불용어가 들어간 2글자 조각('an', 'in' ...)이 색인에서 빠지면 그 이름을 못 찾음
+-- ⚠️ 세션 설정이라 이번 인덱스 생성에만 적용 → 나중에 테이블을 다시 만드는 경우(OPTIMIZE 등)를 위해 서버 설정에도
+--    innodb_ft_enable_stopword = OFF 를 넣어 둘 것
+SET SESSION innodb_ft_enable_stopword = OFF;
+
+-- ngram 파서: 띄어쓰기 없는 한글 이름도 2글자 단위로 색인 ('잇신정보' → 잇신, 신정, 정보)
+CALL add_customer_index('ft_customer_nm', 'FULLTEXT INDEX ft_customer_nm (customer_nm) WITH PARSER ngram');
+CALL add_customer_index('ft_customer_mng_nm', 'FULLTEXT INDEX ft_customer_mng_nm (mng_nm) WITH PARSER ngram');
+CALL add_customer_index('ft_customer_search', 'FULLTEXT INDEX ft_customer_search (customer_nm, mng_nm, biz_num) WITH PARSER ngram');
+-- 사업자등록번호 앞자리 검색 (/customers/search)
+CALL add_customer_index('idx_customer_biz_num', 'INDEX idx_customer_biz_num (biz_num)');
+
+DROP PROCEDURE add_customer_index;
@@ -0,0 +1,13 @@
+-- 📁 통합첨부파일번호(unty_file_no)별 마지막 file_seq (routes/files.py insert_file_rows)
+-- 배포 시 한 번 실행: mysql <DB명> < migrations/003_file_groups.sql  (다시 실행해도 안전)
+-- 업로드는 이 행 하나만 잠가서 번호를 할당 → 같은 새 그룹에 동시에 올려도 gap lock 교착이 없음
+
+CREATE TABLE IF NOT EXISTS file_groups (
+    unty_file_no VARCHAR(100) NOT NULL PRIMARY KEY,
+    last_seq INT NOT NULL
+);
+
+-- 기존 그룹의 마지막 번호 채우기
+INSERT INTO file_groups (unty_file_no, last_seq)
+SELECT unty_file_no, MAX(file_seq) FROM files WHERE unty_file_no IS NOT NULL GROUP BY unty_file_no
+ON DUPLICATE KEY UPDATE last_seq = GREATEST(last_seq, VALUES(last_seq));
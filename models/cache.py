@@ -0,0 +1,207 @@
+import time
+import logging
+import threading
+from collections import OrderedDict
+
+try:
+    import redis
+except ImportError:  # redis 패키지가 없으면 로컬 캐시만 사용
+    redis = None
+
+# 📌 조회 결과 캐시 설정
+CACHE_LOCAL_MAX_ENTRIES = 1000  # 워커(프로세스)별 LRU 최대 항목 수
+CACHE_LOCAL_TTL = 30            # 로컬 항목 유효 시간(초) - Redis 무효화가 실패했을 때 다른 워커에 옛 값이 남는 최대 시간
+CACHE_SHARED_TTL = 60 * 60      # Redis 항목 유효 시간(초)
+CACHE_REDIS_RETRY = 30          # Redis 연결 실패 후 다시 시도하기까지 대기(초)
+CACHE_REDIS = {"host": "localhost", "port": 6379, "db": 0}  # 로그인 토큰과 같은 Redis
+
+
+class ReadThroughCache:
+    """
+    읽기 관통(read-through) 캐시 - 로컬 LRU + (있으면) Redis 공유 캐시
+    - get_or_load(key, loader): 로컬 → Redis → loader() 순서로 찾고, 찾은 값을 위 단계에 채움
+    - invalidate(key): 수정/삭제 커밋 후 호출 → 세대(generation) 번호를 올려서 모든 워커의 기존 값을 무효화
+    - 조회 도중 수정이 끼어들면 세대 번호가 달라지므로 조회한 (옛) 값은 캐시에 남지 않음
+    - Redis 에 무효화를 못 했으면 기억해 뒀다가 Redis 가 다시 살아나면 먼저 무효화
+    - 값은 문자열(직렬화된 응답 등)로 저장
+    """
+
+    def __init__(self, namespace, max_entries=CACHE_LOCAL_MAX_ENTRIES, local_ttl=CACHE_LOCAL_TTL,
+                 shared_ttl=CACHE_SHARED_TTL, redis_options=CACHE_REDIS):
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.local_ttl = local_ttl
+        self.shared_ttl = shared_ttl
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._local = OrderedDict()  # {key: (세대, 만료 시각, 값)}
+        self._local_gens = {}        # Redis 가 없을 때 쓰는 로컬 세대 번호
+        self._pending = set()        # Redis 장애로 무효화하지 못한 키
+        self._counts = {"local_hits": 0, "shared_hits": 0, "misses": 0, "invalidations": 0, "errors": 0}
+
+        self._redis = None
+        if redis is not None and redis_options:
+            self._redis = redis.StrictRedis(decode_responses=True, socket_timeout=0.5, socket_connect_timeout=0.5,
+                                            **redis_options)
+        self._redis_down_until = 0.0
+
+    # ✅ Redis 사용 가능 여부 (실패하면 CACHE_REDIS_RETRY 동안 로컬만 사용)
+    def _shared(self):
+        if self._redis is None or time.monotonic() < self._redis_down_until:
+            return None
+        if self._pending and not self._flush_pending():
+            return None
+        return self._redis
+
+    def _flush_pending(self):
+        """Redis 복구 후 밀린 무효화 먼저 반영 - 끝날 때까지 다른 스레드도 Redis 값을 쓰지 않음"""
+        with self._flush_lock:
+            with self._lock:
+                keys = set(self._pending)
+            if not keys:
+                return True
+            try:
+                self._bump_shared(self._redis, keys)
+            except redis.RedisError as e:
+                self._shared_failed(e)
+                return False
+            with self._lock:
+                self._pending -= keys
+            return True
+
+    def _bump_shared(self, shared, keys):
+        with shared.pipeline() as pipe:
+            for key in keys:
+                pipe.incr(self._gen_key(key))
+                pipe.expire(self._gen_key(key), self.shared_ttl * 2)
+                pipe.delete(self._value_key(key))
+            pipe.execute()
+
+    def _shared_failed(self, e):
+        self._count("errors")
+        self._redis_down_until = time.monotonic() + CACHE_REDIS_RETRY
+        logging.warning(f"⚠️ {self.namespace} 캐시 Redis 사용 불가 - {CACHE_REDIS_RETRY}초 동안 로컬 캐시만 사용: {e}")
+
+    def _gen_key(self, key):
+        return f"cache:{self.namespace}:gen:{key}"
+
+    def _value_key(self, key):
+        return f"cache:{self.namespace}:val:{key}"
+
+    def _count(self, name):
+        with self._lock:
+            self._counts[name] += 1
+
+    def _generation(self, key):
+        """현재 세대 번호 - Redis 가 있으면 모든 워커가 공유, 없으면 이 워커 안에서만"""
+        shared = self._shared()
+        if shared is not None:
+            try:
+                return shared.get(self._gen_key(key)) or "0", shared
+            except redis.RedisError as e:
+                self._shared_failed(e)
+        with self._lock:
+            return str(self._local_gens.get(key, 0)), None
+
+    def _put_local(self, key, generation, value):
+        # Redis 세대 번호로 검증되더라도 짧게 - Redis 무효화가 실패했을 때 옛 값이 오래 남지 않도록
+        with self._lock:
+            self._local[key] = (generation, time.monotonic() + self.local_ttl, value)
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_entries:
+                self._local.popitem(last=False)
+
+    def get_or_load(self, key, loader):
+        """
+        캐시된 값 반환, 없으면 loader() 호출 후 저장
+        - loader 가 None 을 반환하면 (없는 고객 등) 저장하지 않음
+        """
+        key = str(key)
+        generation, shared = self._generation(key)
+
+        # 1) 로컬 LRU
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is not None and entry[0] == generation and entry[1] > time.monotonic():
+                self._local.move_to_end(key)
+                self._counts["local_hits"] += 1
+                return entry[2]
+
+        # 2) Redis - 값 앞에 세대 번호를 붙여 저장 ("<세대>:<값>")
+        if shared is not None:
+            try:
+                stored = shared.get(self._value_key(key))
+            except redis.RedisError as e:
+                self._shared_failed(e)
+                stored = None
+            if stored is not None:
+                stored_gen, _, value = stored.partition(":")
+                if stored_gen == generation:
+                    self._count("shared_hits")
+                    self._put_local(key, generation, value)
+                    return value
+
+        # 3) 원본 조회
+        self._count("misses")
+        value = loader()
+        if value is None:
+            return None
+
+        self._put_local(key, generation, value)
+        if shared is not None:
+            try:
+                # 조회하는 사이 invalidate 됐으면 세대가 바뀌었으므로 저장하지 않음
+                with shared.pipeline() as pipe:
+                    pipe.watch(self._gen_key(key))
+                    if (pipe.get(self._gen_key(key)) or "0") == generation:
+                        pipe.multi()
+                        pipe.set(self._value_key(key), f"{generation}:{value}", ex=self.shared_ttl)
+                        pipe.execute()
+            except redis.WatchError:
+                pass
+            except redis.RedisError as e:
+                self._shared_failed(e)
+        return value
+
+    def invalidate(self, key):
+        """해당 키의 캐시 무효화 (수정/삭제 커밋 후 호출)"""
+        self.invalidate_many([key])
+
+    def invalidate_many(self, keys):
+        """여러 키를 한 번에 무효화 (Redis 왕복 1번)"""
+        keys = {str(key) for key in keys}
+        if not keys:
+            return
+        with self._lock:
+            for key in keys:
+                self._local.pop(key, None)
+                self._local_gens[key] = self._local_gens.get(key, 0) + 1
+            self._counts["invalidations"] += len(keys)
+
+        if self._redis is None:
+            return
+        shared = self._shared()
+        if shared is None:
+            with self._lock:
+                self._pending |= keys
+            return
+        try:
+            self._bump_shared(shared, keys)
+        except redis.RedisError as e:
+            with self._lock:
+                self._pending |= keys  # Redis 가 다시 살아나면 무효화
+            self._shared_failed(e)
+
+    def metrics(self):
+        with self._lock:
+            counts = dict(self._counts)
+            size = len(self._local)
+        lookups = counts["local_hits"] + counts["shared_hits"] + counts["misses"]
+        hits = counts["local_hits"] + counts["shared_hits"]
+        return {
+            **counts,
+            "hit_ratio": round(hits / lookups, 4) if lookups else None,
+            "local_entries": size,
+            "pending_invalidations": len(self._pending),
+            "shared": self._shared() is not None,
+        }
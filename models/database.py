@@ -1,10 +1,267 @@
+import os
+import time
+import queue
+import logging
+import threading
+
 import pymysql
+from pymysql.constants import CLIENT, SERVER_STATUS
+from flask import g, jsonify
+
+# 📌 DB 접속 정보
+DB_CONFIG = {
+    "host": "172.16.21.200",  # 또는 실제 DB 서버 IP
+    "user": "itsin",
+    "password": "1234",
+    "database": "groupware",
+    "cursorclass": pymysql.cursors.DictCursor,
+}
+
+# 📌 커넥션 풀 설정
+POOL_SIZE = 10          # 풀에 유지하는 커넥션 수
+POOL_MAX_OVERFLOW = 10  # 풀이 비었을 때 추가로 열 수 있는 커넥션 수 (반납 시 바로 끊음)
+POOL_TIMEOUT = 10       # 커넥션을 기다리는 최대 시간(초)
+POOL_RECYCLE = 3600     # 커넥션 최대 수명(초) - MySQL wait_timeout 보다 짧게
+POOL_PRE_PING = True    # 꺼낼 때 ping 으로 살아있는지 확인
+MULTI_POOL_SIZE = 4     # 여러 SELECT 를 한 번에 보내는 조회 전용 풀 크기
+
+
+class PoolTimeoutError(Exception):
+    """POOL_TIMEOUT 안에 커넥션을 얻지 못했을 때 발생"""
+
+
+class PooledConnection:
+    """
+    pymysql 커넥션 래퍼
+    - close() 를 호출하면 실제로 끊지 않고 풀에 반납
+    - 나머지 속성(cursor, commit, rollback ...)은 원래 커넥션으로 위임
+    """
+
+    def __init__(self, pool, raw, created_at):
+        self._pool = pool
+        self._raw = raw
+        self._created_at = created_at
+        self._returned = False
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def close(self):
+        if self._returned:
+            return
+        self._returned = True
+        self._pool._checkin(self._raw, self._created_at)
+
+    def invalidate(self):
+        """풀에 돌려놓지 않고 실제로 끊음 (결과를 끝까지 읽지 못한 스트리밍 커서 등)"""
+        if self._returned:
+            return
+        self._returned = True
+        self._pool._discard(self._raw)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __del__(self):
+        # close() 를 빠뜨린 핸들러가 있어도 풀 자리가 새지 않도록
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class ConnectionPool:
+    """
+    스레드 안전한 pymysql 커넥션 풀
+    - size 개는 풀에 유지, max_overflow 개까지는 임시로 더 열 수 있음
+    - 꺼낼 때 수명(recycle) 확인 + ping, 반납할 때 열린 트랜잭션은 rollback
+    """
+
+    def __init__(self, creator, size=POOL_SIZE, max_overflow=POOL_MAX_OVERFLOW,
+                 timeout=POOL_TIMEOUT, recycle=POOL_RECYCLE, pre_ping=POOL_PRE_PING):
+        self._creator = creator
+        self._timeout = timeout
+        self._recycle = recycle
+        self._pre_ping = pre_ping
+        self._idle = queue.LifoQueue(maxsize=size)  # 최근에 쓴 커넥션부터 재사용
+        self._slots = threading.BoundedSemaphore(size + max_overflow)
+
+    def connect(self):
+        if not self._slots.acquire(timeout=self._timeout):
+            raise PoolTimeoutError(f"DB 커넥션 대기 시간 초과 ({self._timeout}초)")
+        try:
+            raw, created_at = self._get_idle()
+        except Exception:
+            self._slots.release()
+            raise
+        return PooledConnection(self, raw, created_at)
+
+    def _get_idle(self):
+        while True:
+            try:
+                raw, created_at = self._idle.get_nowait()
+            except queue.Empty:
+                return self._creator(), time.monotonic()
+
+            if self._recycle and time.monotonic() - created_at > self._recycle:
+                self._close_quietly(raw)
+                continue
+
+            if self._pre_ping:
+                try:
+                    raw.ping(reconnect=False)
+                except Exception:
+                    logging.warning("죽은 DB 커넥션 폐기 후 재연결")
+                    self._close_quietly(raw)
+                    continue
+
+            return raw, created_at
+
+    def _checkin(self, raw, created_at):
+        try:
+            if raw.open and raw.server_status & SERVER_STATUS.SERVER_STATUS_IN_TRANS:
+                raw.rollback()  # 커밋 안 된 작업이 다음 요청으로 넘어가지 않도록
+            if raw.open:
+                self._idle.put_nowait((raw, created_at))
+        except queue.Full:
+            self._close_quietly(raw)  # overflow 커넥션은 반납 시 끊음
+        except Exception:
+            logging.exception("DB 커넥션 반납 중 오류 - 커넥션 폐기")
+            self._close_quietly(raw)
+        finally:
+            self._slots.release()
+
+    def _discard(self, raw):
+        self._close_quietly(raw)
+        self._slots.release()
+
+    @staticmethod
+    def _close_quietly(raw):
+        try:
+            raw.close()
+        except Exception:
+            pass
+
+
+def _create_connection():
+    return pymysql.connect(**DB_CONFIG)
+
+
+def _create_multi_statement_connection():
+    return pymysql.connect(**DB_CONFIG, client_flag=CLIENT.MULTI_STATEMENTS)
+
+
+# 📌 워커(프로세스)별 풀 - fork 된 자식이 부모 소켓을 같이 쓰지 않도록 pid 로 구분
+#   default: 일반 커넥션 / multi: 조회 전용, 세미콜론으로 이어 붙인 SELECT 를 한 번에 실행
+_POOL_FACTORIES = {
+    "default": lambda: ConnectionPool(_create_connection),
+    "multi": lambda: ConnectionPool(_create_multi_statement_connection, size=MULTI_POOL_SIZE),
+}
+_pools = {}
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def _reset_pool_after_fork():
+    global _pools, _pool_pid, _pool_lock
+    _pools = {}
+    _pool_pid = None
+    _pool_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_pool_after_fork)
+
+
+def get_pool(name="default"):
+    global _pools, _pool_pid
+    pid = os.getpid()
+    pool = _pools.get(name) if _pool_pid == pid else None
+    if pool is None:
+        with _pool_lock:
+            if _pool_pid != pid:
+                _pools = {}
+                _pool_pid = pid
+            pool = _pools.get(name)
+            if pool is None:
+                pool = _pools[name] = _POOL_FACTORIES[name]()
+    return pool
+
 
 def get_db_connection():
-    return pymysql.connect(
-        host="172.16.21.200",  # 또는 실제 DB 서버 IP
-        user="itsin",
-        password="1234",
-        database="groupware",
-        cursorclass=pymysql.cursors.DictCursor
-    )
+    """풀에서 커넥션을 꺼내 반환 (conn.close() 시 풀에 반납)"""
+    return get_pool().connect()
+
+
+def get_multi_statement_connection():
+    """
+    여러 SELECT 를 한 번의 왕복으로 보내는 조회 전용 커넥션 (conn.close() 시 풀에 반납)
+    - cursor.execute("SELECT ...; SELECT ...", params) 후 cursor.nextset() 으로 결과를 차례로 읽음
+    - 사용자 입력은 반드시 파라미터(%s)로만 넘길 것 (문자열로 붙이면 문장이 추가로 실행될 수 있음)
+    """
+    return get_pool("multi").connect()
+
+
+def fetch_result_sets(cursor, sql, params=()):
+    """세미콜론으로 이어 붙인 SELECT 실행 → [결과 1 rows, 결과 2 rows, ...]"""
+    cursor.execute(sql, params)
+    results = [list(cursor.fetchall())]
+    while cursor.nextset():
+        results.append(list(cursor.fetchall()))
+    return results
+
+
+# 📌 요청 단위 DB 세션 (flask.g)
+def get_db():
+    """
+    요청 단위 커넥션 반환
+    - 요청 안에서 처음 호출될 때 풀에서 꺼내고, 같은 요청의 다른 쿼리는 같은 커넥션을 재사용
+    - commit 은 응답을 보내기 전(after_request), rollback/반납은 teardown 에서 자동 처리 (핸들러에서 close() 하지 않음)
+    """
+    if "db_conn" not in g:
+        g.db_conn = get_db_connection()
+    return g.db_conn
+
+
+def _commit_db(response):
+    """
+    응답을 보내기 전에 commit - 실패하면 성공 응답 대신 500
+    - 에러 응답(4xx/5xx)으로 끝난 요청은 commit 하지 않음 (teardown 에서 rollback)
+    """
+    conn = g.get("db_conn")
+    if conn is None or response.status_code >= 400:
+        return response
+    if not conn.server_status & SERVER_STATUS.SERVER_STATUS_IN_TRANS:
+        return response
+    try:
+        conn.commit()
+    except Exception as e:
+        logging.exception("응답 전 DB commit 실패")
+        # 새 응답을 만들지 않고 내용만 교체 → 먼저 실행된 after_request(CORS 등) 헤더 유지
+        response.set_data(jsonify({"error": "데이터 저장 중 오류 발생", "details": str(e)}).get_data())
+        response.mimetype = "application/json"
+        response.status_code = 500
+    return response
+
+
+def close_db(exc=None):
+    """요청 종료 - commit 되지 않은 작업은 rollback 후 풀에 반납"""
+    conn = g.pop("db_conn", None)
+    if conn is None:
+        return
+    try:
+        if exc is not None or conn.server_status & SERVER_STATUS.SERVER_STATUS_IN_TRANS:
+            conn.rollback()
+    except Exception:
+        logging.exception("요청 종료 시 DB rollback 실패")
+    finally:
+        conn.close()
+
+
+def init_db(app):
+    """앱에 요청 단위 DB 세션 훅 등록"""
+    app.after_request(_commit_db)
+    app.teardown_appcontext(close_db)
@@ -0,0 +1,132 @@
+import json
+import base64
+from decimal import Decimal
+from datetime import date, datetime
+
+from flask import request
+
+# 📌 페이지 크기 설정
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(values):
+    """정렬 키 값 리스트 → URL 에 실을 수 있는 커서 토큰"""
+    def _plain(v):
+        if isinstance(v, datetime):
+            return v.strftime('%Y-%m-%d %H:%M:%S.%f')
+        if isinstance(v, date):
+            return v.strftime('%Y-%m-%d')
+        if isinstance(v, Decimal):
+            return str(v)
+        return v
+
+    raw = json.dumps([_plain(v) for v in values], ensure_ascii=False)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    padded = token + '=' * (-len(token) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+
+
+class Pagination:
+    """
+    목록 API 공통 페이징
+    - ?page=N&limit=M : LIMIT/OFFSET 방식 (기존 화면 호환)
+    - ?cursor=<token>&limit=M : keyset(seek) 방식, 깊은 페이지도 첫 페이지와 같은 비용
+    - limit 은 MAX_PAGE_SIZE 로 제한, 응답에는 다음 페이지 커서를 같이 내려줌
+    - limit 을 안 보낸 요청도 항상 default_limit 까지만 (큰 테이블 전체를 메모리에 올리지 않도록)
+      → 배열을 그대로 주던 API 는 배열 형식을 유지하고 다음 페이지는 X-Page-* 헤더로 알림
+
+    order_by: [(SQL 컬럼, 결과 row 의 키, 'ASC' | 'DESC'), ...]
+              마지막 항목은 PK 처럼 유일한 컬럼이어야 순서가 안정적임
+    """
+
+    def __init__(self, order_by, default_limit=DEFAULT_PAGE_SIZE, limit_arg='limit'):
+        self.order_by = order_by
+        self.limit = min(max(request.args.get(limit_arg, default_limit, type=int) or default_limit, 1),
+                         MAX_PAGE_SIZE)
+        self.page = max(request.args.get('page', 1, type=int) or 1, 1)
+
+        token = request.args.get('cursor')
+        self.cursor = None
+        if token:
+            try:
+                values = decode_cursor(token)
+            except (ValueError, TypeError):
+                raise ValueError("잘못된 cursor 값입니다.")
+            if not isinstance(values, list) or len(values) != len(order_by):
+                raise ValueError("잘못된 cursor 값입니다.")
+            self.cursor = values
+
+    def where(self):
+        """keyset 조건 (' AND (...)', params) - cursor 가 없으면 빈 조건"""
+        if self.cursor is None:
+            return "", []
+
+        or_parts = []
+        params = []
+        for i, (column, _, direction) in enumerate(self.order_by):
+            and_parts = []
+            branch_params = []
+            for (prev_column, _, _), prev_value in zip(self.order_by[:i], self.cursor[:i]):
+                if prev_value is None:
+                    and_parts.append(f"{prev_column} IS NULL")
+                else:
+                    and_parts.append(f"{prev_column} = %s")
+                    branch_params.append(prev_value)
+
+            # MySQL 은 NULL 을 가장 작은 값으로 취급 (ASC 맨 앞, DESC 맨 뒤)
+            value = self.cursor[i]
+            if direction.upper() == 'DESC':
+                if value is None:
+                    continue  # NULL 뒤에는 더 작은 값이 없음
+                and_parts.append(f"({column} < %s OR {column} IS NULL)")
+                branch_params.append(value)
+            elif value is None:
+                and_parts.append(f"{column} IS NOT NULL")
+            else:
+                and_parts.append(f"{column} > %s")
+                branch_params.append(value)
+
+            or_parts.append("(" + " AND ".join(and_parts) + ")")
+            params.extend(branch_params)
+
+        if not or_parts:
+            return " AND 1=0", []
+        return " AND (" + " OR ".join(or_parts) + ")", params
+
+    def order_limit(self):
+        """' ORDER BY ... LIMIT ... OFFSET ...' 와 params (다음 페이지 여부 확인용으로 1건 더 조회)"""
+        order_sql = ", ".join(f"{column} {direction}" for column, _, direction in self.order_by)
+        offset = 0 if self.cursor is not None else (self.page - 1) * self.limit
+        return f" ORDER BY {order_sql} LIMIT %s OFFSET %s", [self.limit + 1, offset]
+
+    def result(self, rows):
+        """조회 결과를 잘라서 (rows, 페이징 정보) 반환"""
+        rows = list(rows)
+        has_next = len(rows) > self.limit
+        rows = rows[:self.limit]
+
+        next_cursor = None
+        if has_next and rows:
+            last = rows[-1]
+            next_cursor = encode_cursor([last[key] for _, key, _ in self.order_by])
+
+        meta = {
+            "page": self.page if self.cursor is None else None,
+            "limit": self.limit,
+            "hasNext": has_next,
+            "nextCursor": next_cursor,
+        }
+        return rows, meta
+
+
+def set_pagination_headers(response, meta):
+    """목록을 그대로 반환하는 API 용 - 페이징 정보는 헤더로 전달"""
+    response.headers["X-Page-Limit"] = str(meta["limit"])
+    response.headers["X-Has-Next"] = "true" if meta["hasNext"] else "false"
+    if meta["nextCursor"]:
+        response.headers["X-Next-Cursor"] = meta["nextCursor"]
+    return response
@@ -0,0 +1,82 @@
+import re
+import time
+import logging
+import threading
+
+# 📌 검색 설정
+SEARCH_DEFAULT_LIMIT = 20
+SEARCH_MAX_LIMIT = 100
+NGRAM_TOKEN_SIZE = 2  # MySQL ngram_token_size (기본값 2) - 이보다 짧은 검색어는 FULLTEXT 로 찾을 수 없음
+SEARCH_INDEX_RECHECK = 5 * 60  # 인덱스가 없을 때 다시 확인하기까지 대기(초) - 마이그레이션 후 재시작 없이 반영
+
+_BOOLEAN_OPERATORS = re.compile(r'[+\-<>()~*"@]')
+# 회사명 앞뒤에 붙는 법인 표기 - 저장된 이름마다 붙어 있기도, 없기도 해서 검색어에서 제외
+_COMPANY_AFFIXES = re.compile(r'\(주\)|\(유\)|\(사\)|㈜|주식회사|유한회사')
+
+
+def strip_company_affixes(text):
+    return _COMPANY_AFFIXES.sub(" ", text or "")
+
+
+def search_tokens(text):
+    """검색어 → 토큰 목록 (공백 기준, FULLTEXT boolean 연산자 문자는 제거)"""
+    return [token for token in _BOOLEAN_OPERATORS.sub(" ", text or "").split() if token]
+
+
+def boolean_query(tokens):
+    """모든 토큰을 포함하는 행만 (+토큰 +토큰) - ngram 파서는 토큰을 연속된 n-gram 구문으로 검색"""
+    return " ".join(f'+"{token}"' for token in tokens)
+
+
+def escape_like(text):
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class FulltextIndexes:
+    """
+    테이블의 ngram FULLTEXT 인덱스 확인
+    - 인덱스는 배포 시 마이그레이션으로 생성 (migrations/) - 요청 중에는 DDL 을 실행하지 않음
+      (FULLTEXT 인덱스 추가는 테이블을 다시 만들면서 메타데이터 잠금을 잡으므로)
+    - index_names 가 모두 있을 때만 available() 이 True → 아니면 호출한 쪽은 LIKE 검색으로 대체
+    - 없으면 SEARCH_INDEX_RECHECK 마다 information_schema 를 다시 확인
+    - ngram 파서라 한글처럼 띄어쓰기 없는 이름도 2글자 단위로 색인됨 ('잇신정보' → 잇신, 신정, 정보)
+    """
+
+    def __init__(self, table, index_names, connect):
+        self.table = table
+        self.index_names = list(index_names)
+        self._connect = connect
+        self._available = False
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    def available(self):
+        if self._available or (self._checked_at is not None and
+                                time.monotonic() - self._checked_at < SEARCH_INDEX_RECHECK):
+            return self._available
+        with self._lock:
+            if not self._available and (self._checked_at is None or
+                                        time.monotonic() - self._checked_at >= SEARCH_INDEX_RECHECK):
+                try:
+                    missing = self._missing()
+                    if missing:
+                        logging.warning(f"⚠️ {self.table} 검색 인덱스 없음 {missing} - LIKE 검색 사용 (마이그레이션 확인)")
+                    self._available = not missing
+                except Exception:
+                    logging.exception(f"⚠️ {self.table} 검색 인덱스 확인 실패 - LIKE 검색 사용")
+                    self._available = False
+                self._checked_at = time.monotonic()
+        return self._available
+
+    def _missing(self):
+        conn = self._connect()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT DISTINCT index_name AS index_name FROM information_schema.statistics
+                     WHERE table_schema = DATABASE() AND table_name = %s
+                """, (self.table,))
+                existing = {row["index_name"] for row in cursor.fetchall()}
+            return [name for name in self.index_names if name not in existing]
+        finally:
+            conn.close()
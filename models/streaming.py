@@ -0,0 +1,100 @@
+import logging
+
+import pymysql
+from flask import Response, current_app, request, jsonify
+
+from models.database import get_db_connection
+
+# 📌 스트리밍 응답 설정
+STREAM_FORMATS = {
+    "ndjson": "application/x-ndjson",  # 한 줄에 row 하나
+    "json": "application/json",        # 청크 단위로 내려보내는 JSON 배열
+}
+STREAM_CHUNK_SIZE = 64 * 1024  # 이 크기만큼 모아서 전송
+
+
+def get_stream_format():
+    """?stream=ndjson | json 값 반환 (없거나 지원하지 않으면 None)"""
+    fmt = request.args.get("stream", "").strip().lower()
+    return fmt if fmt in STREAM_FORMATS else None
+
+
+def stream_query(sql, params=(), fmt="ndjson", transform=None, download_name=None):
+    """
+    대용량 조회 결과를 메모리에 쌓지 않고 바로 내려보내는 응답
+    - SSDictCursor(서버 사이드 커서)로 한 줄씩 읽어서 변환/직렬화 후 전송
+    - 커넥션 획득 + 쿼리 실행은 응답을 만들기 전에 → 실패하면 빈 200 대신 500 JSON
+      (응답 본문 생성기 안에서는 결과 행만 읽음)
+    - transform: row(dict) → dict (camelCase 변환 등)
+    - Decimal/datetime 직렬화는 jsonify 와 같은 규칙(current_app.json)을 사용
+    """
+    dumps = current_app.json.dumps
+    mimetype = STREAM_FORMATS[fmt]
+
+    conn = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor(pymysql.cursors.SSDictCursor)
+        cursor.execute(sql, params)
+    except Exception:
+        logging.exception("스트리밍 조회 실행 실패")
+        if conn is not None:
+            conn.invalidate()
+        return jsonify({"error": "데이터 조회 중 오류 발생"}), 500
+
+    state = {"completed": False, "released": False}
+
+    def release():
+        if state["released"]:
+            return
+        state["released"] = True
+        if state["completed"]:
+            cursor.close()
+            conn.close()
+        else:
+            # 남은 결과를 다 읽지 않고 커넥션째 폐기 (클라이언트가 끊은 경우, 본문을 읽기 전에 닫힌 경우 포함)
+            conn.invalidate()
+
+    def generate():
+        try:
+            buffer = []
+            size = 0
+            first = True
+            if fmt == "json":
+                buffer.append("[")
+
+            for row in cursor:
+                if transform:
+                    row = transform(row)
+                chunk = dumps(row)
+                if fmt == "ndjson":
+                    chunk += "\n"
+                elif not first:
+                    chunk = "," + chunk
+                first = False
+
+                buffer.append(chunk)
+                size += len(chunk)
+                if size >= STREAM_CHUNK_SIZE:
+                    yield "".join(buffer)
+                    buffer = []
+                    size = 0
+
+            if fmt == "json":
+                buffer.append("]")
+            if buffer:
+                yield "".join(buffer)
+            state["completed"] = True
+
+        except Exception:
+            # 이미 응답 헤더가 나간 뒤라 상태코드를 바꿀 수 없음 → 로그만 남기고 중단
+            logging.exception("스트리밍 조회 중 오류 발생")
+
+        finally:
+            release()
+
+    response = Response(generate(), mimetype=mimetype)
+    response.call_on_close(release)  # 본문을 한 번도 읽지 않고 닫혀도 커넥션 정리
+    if download_name:
+        response.headers["Content-Disposition"] = f"attachment; filename={download_name}"
+    return response
@@ -0,0 +1,65 @@
+import os
+import base64
+import logging
+import mimetypes
+import threading
+
+
+class AssetCache:
+    """
+    PDF 에 들어가는 이미지(로고/직인)를 base64 data URI 로 미리 만들어 메모리에 보관
+    - wkhtmltopdf 가 렌더링마다 file:/// 경로의 이미지를 다시 읽지 않도록 HTML 에 바로 삽입
+    - 파일 수정시각(mtime)/크기가 바뀌면 다시 읽음
+    """
+
+    def __init__(self, assets):
+        self._paths = dict(assets)  # {이름: 파일 경로}
+        self._entries = {}          # {이름: ((mtime, size), data_uri)}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _stamp(path):
+        st = os.stat(path)
+        return st.st_mtime_ns, st.st_size
+
+    def _load(self, name, path, stamp):
+        mime = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        with open(path, 'rb') as f:
+            encoded = base64.b64encode(f.read()).decode('ascii')
+        data_uri = f'data:{mime};base64,{encoded}'
+        self._entries[name] = (stamp, data_uri)
+        logging.info(f"PDF 이미지 로드: {name} ({stamp[1]} bytes)")
+        return data_uri
+
+    def get(self, name):
+        """data URI 반환 (파일이 없으면 None)"""
+        path = self._paths[name]
+        try:
+            stamp = self._stamp(path)
+        except OSError:
+            logging.warning(f"PDF 이미지 파일 없음: {path}")
+            return None
+
+        entry = self._entries.get(name)
+        if entry is not None and entry[0] == stamp:
+            return entry[1]
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None and entry[0] == stamp:
+                return entry[1]
+            return self._load(name, path, stamp)
+
+    def version(self):
+        """현재 파일 상태 - PDF 캐시 키에 포함해 이미지가 바뀌면 캐시도 무효화"""
+        stamps = {}
+        for name, path in self._paths.items():
+            try:
+                stamps[name] = self._stamp(path)
+            except OSError:
+                stamps[name] = None
+        return stamps
+
+    def warm_up(self):
+        """서버 시작 시 전체 미리 로드"""
+        for name in self._paths:
+            self.get(name)
@@ -0,0 +1,95 @@
+import os
+import json
+import shutil
+import hashlib
+import logging
+import threading
+
+# 📌 PDF 캐시 설정
+PDF_CACHE_MAX_BYTES = 512 * 1024 * 1024  # 캐시 최대 용량 - 넘으면 오래 안 쓴 파일부터 삭제
+
+
+def _link_or_copy(src, dst):
+    """하드링크(용량/시간 0) 시도 후 안 되면 복사, 항상 tmp → replace 로 원자적으로 교체"""
+    tmp = f"{dst}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.link(src, tmp)
+    except OSError:
+        shutil.copyfile(src, tmp)
+    os.replace(tmp, dst)
+
+
+class PdfCache:
+    """
+    내용 주소 기반 PDF 캐시
+    - 키 = 문서 데이터 + 렌더링 옵션 + 템플릿 버전(로드된 소스의 해시)의 sha256
+    - 같은 키면 wkhtmltopdf 를 다시 돌리지 않고 저장된 PDF 를 재사용
+    - 용량 제한(max_bytes)을 넘으면 최근 사용 시각(mtime) 기준 LRU 로 삭제
+    """
+
+    def __init__(self, cache_dir, max_bytes=PDF_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(data, template_name, template_version, **options):
+        payload = json.dumps(
+            {"data": data, "options": options, "template": [template_name, template_version]},
+            sort_keys=True, ensure_ascii=False, default=str,  # Decimal/datetime 은 문자열로
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.pdf")
+
+    def get(self, key):
+        """캐시 파일 경로 반환 (없으면 None) - 사용 시각 갱신"""
+        path = self._path(key)
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    def restore(self, key, output_path):
+        """캐시 적중 시 output_path 에 PDF 를 꺼내놓고 True 반환"""
+        path = self.get(key)
+        if path is None:
+            return False
+        try:
+            _link_or_copy(path, output_path)
+        except OSError:
+            logging.warning(f"PDF 캐시 복원 실패: {key}", exc_info=True)
+            return False
+        return True
+
+    def put(self, key, src_path):
+        try:
+            _link_or_copy(src_path, self._path(key))
+        except OSError:
+            logging.warning(f"PDF 캐시 저장 실패: {key}", exc_info=True)
+            return
+        self.evict()
+
+    def evict(self):
+        with self._lock:
+            try:
+                entries = [e for e in os.scandir(self.cache_dir) if e.name.endswith(".pdf")]
+                stats = [(e.stat().st_mtime, e.stat().st_size, e.path) for e in entries]
+            except OSError:
+                return
+
+            total = sum(size for _, size, _ in stats)
+            if total <= self.max_bytes:
+                return
+
+            for _, size, path in sorted(stats):  # 오래 안 쓴 것부터
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                if total <= self.max_bytes:
+                    break
@@ -0,0 +1,200 @@
+import os
+import json
+import time
+import uuid
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# 📌 작업 큐 설정
+JOB_WORKERS = 2        # 동시에 렌더링하는 작업 수 (wkhtmltopdf 프로세스 수)
+JOB_MAX_PENDING = 50   # 대기 + 실행 중 작업 상한 (넘으면 QueueFullError)
+JOB_TTL = 60 * 60      # 끝난 작업 상태 파일 보관 시간(초)
+JOB_HEARTBEAT_INTERVAL = 10   # 워커 프로세스 생존 표시 갱신 간격(초)
+JOB_HEARTBEAT_STALE = 60      # 생존 표시가 이보다 오래되면 그 워커의 미완료 작업은 실패 처리
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class QueueFullError(Exception):
+    """대기 중인 작업이 JOB_MAX_PENDING 을 넘었을 때 발생"""
+
+
+class JobFailed(Exception):
+    """작업 함수가 실패를 알릴 때 - details 는 작업 상태에 같이 저장 (문서별 오류 등)"""
+
+    def __init__(self, message, **details):
+        super().__init__(message)
+        self.details = details
+
+
+class JobQueue:
+    """
+    백그라운드 작업 큐 (제한된 워커 풀)
+    - 실행은 워커 프로세스 안의 스레드 풀에서, 상태는 state_dir 의 JSON 파일에 저장
+      → 같은 서버의 다른 gunicorn 워커에서도 작업 상태 조회 가능 (로컬 Redis 대용)
+    - 작업 함수는 progress(퍼센트) 콜백을 받고, 결과 dict 를 반환하면 상태에 합쳐짐
+    - 작업마다 실행하는 워커 pid(ownerPid)를 기록, 워커는 JOB_HEARTBEAT_INTERVAL 마다 생존 파일을 갱신
+      → 워커가 죽어서 끝나지 못한 작업은 조회할 때 FAILED 로 바꿈 (TTL 까지 202 가 계속되지 않도록)
+    """
+
+    def __init__(self, state_dir, max_workers=JOB_WORKERS, max_pending=JOB_MAX_PENDING,
+                 ttl=JOB_TTL, name='job'):
+        self.state_dir = state_dir
+        self.max_workers = max_workers
+        self.ttl = ttl
+        self.name = name
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._executor = None
+        self._executor_pid = None
+        os.makedirs(state_dir, exist_ok=True)
+
+    def _get_executor(self):
+        # fork 된 워커마다 자기 스레드 풀을 갖도록 pid 로 구분
+        pid = os.getpid()
+        if self._executor is None or self._executor_pid != pid:
+            with self._lock:
+                if self._executor is None or self._executor_pid != pid:
+                    self._beat()  # 작업 상태에 pid 를 적기 전에 생존 파일부터
+                    threading.Thread(target=self._heartbeat, args=(pid,), name=f'{self.name}-heartbeat',
+                                     daemon=True).start()
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                        thread_name_prefix=f'{self.name}-worker')
+                    self._executor_pid = pid
+        return self._executor
+
+    # ✅ 워커 생존 표시
+    def _heartbeat_path(self, pid):
+        return os.path.join(self.state_dir, f'worker_{pid}.alive')
+
+    def _beat(self):
+        path = self._heartbeat_path(os.getpid())
+        with open(path, 'a'):
+            os.utime(path)
+
+    def _heartbeat(self, pid):
+        while os.getpid() == pid:
+            time.sleep(JOB_HEARTBEAT_INTERVAL)
+            try:
+                self._beat()
+            except OSError:
+                logging.warning(f"[{self.name}] 워커 생존 표시 갱신 실패", exc_info=True)
+
+    def _owner_alive(self, job):
+        pid = job.get('ownerPid')
+        if pid is None:
+            return True  # 예전 형식 상태 파일
+        try:
+            beat_at = os.path.getmtime(self._heartbeat_path(pid))
+        except OSError:
+            return False
+        return time.time() - beat_at < JOB_HEARTBEAT_STALE
+
+    def _path(self, job_id):
+        return os.path.join(self.state_dir, f'{job_id}.json')
+
+    def _write(self, job):
+        tmp_path = self._path(job['jobId']) + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(job, f, ensure_ascii=False)
+        os.replace(tmp_path, self._path(job['jobId']))  # 읽는 쪽이 반쯤 쓴 파일을 보지 않도록
+
+    def get(self, job_id):
+        try:
+            uuid.UUID(hex=job_id)  # 경로 조작 방지
+        except (ValueError, TypeError):
+            return None
+        try:
+            with open(self._path(job_id), encoding='utf-8') as f:
+                job = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if job['status'] in (QUEUED, RUNNING) and not self._owner_alive(job):
+            logging.warning(f"[{self.name}] 워커가 종료되어 끝나지 못한 작업: {job_id} (pid {job.get('ownerPid')})")
+            job.update(status=FAILED, error='작업을 실행하던 서버 프로세스가 종료되었습니다. 다시 요청해주세요.',
+                       updatedAt=time.time(), finishedAt=time.time())
+            self._write(job)
+        return job
+
+    def update(self, job_id, **fields):
+        job = self.get(job_id)
+        if job is None:
+            return None
+        job.update(fields, updatedAt=time.time())
+        self._write(job)
+        return job
+
+    def set_latest(self, key, job_id):
+        """key(예: estimate_12) 의 가장 최근 작업 id 기록"""
+        with open(os.path.join(self.state_dir, f'latest_{key}.json'), 'w', encoding='utf-8') as f:
+            json.dump({'jobId': job_id}, f)
+
+    def get_latest(self, key):
+        try:
+            with open(os.path.join(self.state_dir, f'latest_{key}.json'), encoding='utf-8') as f:
+                return self.get(json.load(f)['jobId'])
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            return None
+
+    def submit(self, func, *args, meta=None, **kwargs):
+        if not self._slots.acquire(blocking=False):
+            raise QueueFullError('대기 중인 작업이 너무 많습니다. 잠시 후 다시 시도해주세요.')
+
+        now = time.time()
+        job = {
+            'jobId': uuid.uuid4().hex,
+            'status': QUEUED,
+            'progress': 0,
+            'error': None,
+            'createdAt': now,
+            'updatedAt': now,
+            **(meta or {}),
+        }
+        try:
+            executor = self._get_executor()
+            job['ownerPid'] = os.getpid()
+            self._write(job)
+            executor.submit(self._run, job['jobId'], func, args, kwargs)
+        except Exception:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._pending += 1
+
+        self._cleanup()
+        return job
+
+    def _run(self, job_id, func, args, kwargs):
+        try:
+            self.update(job_id, status=RUNNING, progress=5, startedAt=time.time())
+            result = func(*args, progress=lambda p: self.update(job_id, progress=p), **kwargs)
+            self.update(job_id, status=DONE, progress=100, finishedAt=time.time(), **(result or {}))
+        except JobFailed as e:
+            logging.error(f"[{self.name}] 작업 실패: {job_id} - {e}")
+            self.update(job_id, status=FAILED, error=str(e), finishedAt=time.time(), **e.details)
+        except Exception as e:
+            logging.exception(f"[{self.name}] 작업 실패: {job_id}")
+            self.update(job_id, status=FAILED, error=str(e), finishedAt=time.time())
+        finally:
+            with self._lock:
+                self._pending -= 1
+            self._slots.release()
+
+    def metrics(self):
+        """이 워커 프로세스의 대기 + 실행 중 작업 수"""
+        return {'pending': self._pending, 'workers': self.max_workers}
+
+    def _cleanup(self):
+        """TTL 지난 작업 상태 파일 / 결과 파일 정리"""
+        expire_before = time.time() - self.ttl
+        try:
+            for entry in os.scandir(self.state_dir):
+                if entry.is_file() and entry.stat().st_mtime < expire_before:
+                    os.remove(entry.path)
+        except OSError:
+            logging.warning(f"[{self.name}] 작업 상태 파일 정리 실패", exc_info=True)
@@ -0,0 +1,254 @@
+import os
+import time
+import uuid
+import queue
+import logging
+import threading
+import subprocess
+from collections import deque
+
+import pdfkit
+
+# 📌 렌더러 설정
+WKHTMLTOPDF_PATH = '/usr/local/bin/wkhtmltopdf'  # 실제 경로 확인 필요
+RENDERER_BACKEND = 'pool'   # 'pool': 상주 프로세스 풀 / 'subprocess': 렌더링마다 wkhtmltopdf 실행
+RENDERER_WORKERS = 2        # 상주 wkhtmltopdf 프로세스 수
+RENDERER_MAX_JOBS = 200     # 프로세스당 최대 렌더링 횟수 - 넘으면 재시작 (메모리 누수 방지)
+RENDER_TIMEOUT = 60         # 렌더링 1건 최대 시간(초) - 넘으면 프로세스 종료 후 재시작
+
+
+class RenderError(Exception):
+    """PDF 렌더링 실패"""
+
+
+class _Metrics:
+    """렌더링 지연 시간 / 대기열 길이 통계"""
+
+    def __init__(self, window=500):
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=window)  # 최근 렌더링 시간(초)
+        self.waiting = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.recycled = 0
+
+    def record(self, seconds, ok):
+        with self._lock:
+            self._latencies.append(seconds)
+            if ok:
+                self.completed += 1
+            else:
+                self.failed += 1
+
+    def add(self, name, delta):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + delta)
+
+    def snapshot(self):
+        with self._lock:
+            latencies = sorted(self._latencies)
+            data = {
+                'queueDepth': self.waiting,
+                'inFlight': self.in_flight,
+                'completed': self.completed,
+                'failed': self.failed,
+                'recycled': self.recycled,
+            }
+        if latencies:
+            data['latencyAvgMs'] = round(sum(latencies) / len(latencies) * 1000, 1)
+            data['latencyP95Ms'] = round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000, 1)
+        return data
+
+
+class SubprocessRenderer:
+    """기존 방식 - 렌더링할 때마다 wkhtmltopdf 프로세스를 새로 띄움"""
+
+    name = 'subprocess'
+
+    def __init__(self, binary=WKHTMLTOPDF_PATH):
+        self._config = pdfkit.configuration(wkhtmltopdf=binary)
+        self._metrics = _Metrics()
+
+    def render(self, html, output_path, options):
+        started = time.monotonic()
+        self._metrics.add('in_flight', 1)
+        ok = False
+        try:
+            pdfkit.from_string(html, output_path, configuration=self._config, options=options)
+            ok = True
+        finally:
+            self._metrics.add('in_flight', -1)
+            self._metrics.record(time.monotonic() - started, ok)
+
+    def metrics(self):
+        return {'backend': self.name, **self._metrics.snapshot()}
+
+
+def _quote_arg(value):
+    # --read-args-from-stdin 은 한 줄을 공백 기준으로 나누므로 경로는 따옴표로 감쌈
+    return '"' + str(value).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+class _WkhtmltopdfProcess:
+    """
+    `wkhtmltopdf --read-args-from-stdin` 상주 프로세스 1개
+    - stdin 한 줄 = 변환 1건, 렌더러(Qt) 초기화는 프로세스 시작 때 한 번만
+    - 변환이 끝나면 stderr 에 "Done" 이 찍히는 것으로 완료 판단
+    """
+
+    def __init__(self, binary):
+        self.jobs = 0
+        self._lines = queue.Queue()
+        self._proc = subprocess.Popen(
+            [binary, '--read-args-from-stdin'],
+            stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+            text=True, encoding='utf-8', errors='replace', bufsize=1,
+        )
+        threading.Thread(target=self._read_stderr, daemon=True).start()
+
+    def _read_stderr(self):
+        for line in self._proc.stderr:
+            self._lines.put(line.strip())
+        self._lines.put(None)  # 프로세스 종료
+
+    @property
+    def alive(self):
+        return self._proc.poll() is None
+
+    def render(self, args, timeout):
+        # 이전 작업의 남은 출력 비우기
+        while not self._lines.empty():
+            self._lines.get_nowait()
+
+        self._proc.stdin.write(' '.join(args) + '\n')
+        self._proc.stdin.flush()
+
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise RenderError(f'PDF 렌더링 시간 초과 ({timeout}초)')
+            try:
+                line = self._lines.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            if line is None:
+                raise RenderError('wkhtmltopdf 프로세스가 비정상 종료되었습니다.')
+            if line == 'Done':
+                return
+            if line.startswith('Exit with code') or line.startswith('Error:'):
+                raise RenderError(line)
+
+    def kill(self):
+        try:
+            self._proc.stdin.close()
+        except Exception:
+            pass
+        try:
+            self._proc.terminate()
+            self._proc.wait(timeout=5)
+        except Exception:
+            self._proc.kill()
+
+
+class PersistentRendererPool:
+    """
+    상주 wkhtmltopdf 프로세스 풀
+    - workers 개의 프로세스를 띄워두고 HTML 을 임시 파일로 넘겨 렌더링
+    - max_jobs 건마다, 또는 오류/시간 초과 시 프로세스를 재시작
+    """
+
+    name = 'pool'
+
+    def __init__(self, binary=WKHTMLTOPDF_PATH, workers=RENDERER_WORKERS, max_jobs=RENDERER_MAX_JOBS,
+                 timeout=RENDER_TIMEOUT, work_dir=None):
+        self._binary = binary
+        self._max_jobs = max_jobs
+        self._timeout = timeout
+        self._work_dir = work_dir or os.path.join(os.getcwd(), 'temp', 'render')
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(workers)
+        self._metrics = _Metrics()
+        os.makedirs(self._work_dir, exist_ok=True)
+
+    def _checkout(self):
+        while True:
+            try:
+                proc = self._idle.get_nowait()
+            except queue.Empty:
+                return _WkhtmltopdfProcess(self._binary)
+            if proc.alive:
+                return proc
+            self._metrics.add('recycled', 1)  # 쉬는 사이 죽은 프로세스
+
+    def render(self, html, output_path, options):
+        html_path = os.path.join(self._work_dir, f'{uuid.uuid4().hex}.html')
+        with open(html_path, 'w', encoding='utf-8') as f:
+            f.write(html)
+
+        args = []
+        for key, value in (options or {}).items():
+            args.append(f'--{key}')
+            if value is not None:
+                args.append(_quote_arg(value))
+        args += [_quote_arg(html_path), _quote_arg(output_path)]
+
+        self._metrics.add('waiting', 1)
+        self._slots.acquire()
+        self._metrics.add('waiting', -1)
+        self._metrics.add('in_flight', 1)
+
+        started = time.monotonic()
+        proc = None
+        ok = False
+        try:
+            proc = self._checkout()
+            proc.render(args, self._timeout)
+            proc.jobs += 1
+            if not os.path.exists(output_path) or os.path.getsize(output_path) == 0:
+                raise RenderError('PDF 파일이 생성되지 않았습니다.')
+            ok = True
+        except Exception:
+            if proc is not None:
+                proc.kill()
+                proc = None
+                self._metrics.add('recycled', 1)
+            raise
+        finally:
+            if proc is not None:
+                if proc.jobs >= self._max_jobs:
+                    proc.kill()
+                    self._metrics.add('recycled', 1)
+                else:
+                    self._idle.put(proc)
+            self._slots.release()
+            self._metrics.add('in_flight', -1)
+            self._metrics.record(time.monotonic() - started, ok)
+            try:
+                os.remove(html_path)
+            except OSError:
+                pass
+
+    def metrics(self):
+        return {'backend': self.name, 'idleProcesses': self._idle.qsize(), **self._metrics.snapshot()}
+
+
+# 📌 워커(프로세스)별 렌더러 - fork 된 자식이 부모의 상주 프로세스를 같이 쓰지 않도록 pid 로 구분
+_renderer = None
+_renderer_pid = None
+_renderer_lock = threading.Lock()
+
+
+def get_renderer():
+    global _renderer, _renderer_pid
+    pid = os.getpid()
+    if _renderer is None or _renderer_pid != pid:
+        with _renderer_lock:
+            if _renderer is None or _renderer_pid != pid:
+                if RENDERER_BACKEND == 'pool':
+                    _renderer = PersistentRendererPool()
+                else:
+                    _renderer = SubprocessRenderer()
+                _renderer_pid = pid
+    return _renderer
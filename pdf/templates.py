@@ -0,0 +1,78 @@
+import os
+import hashlib
+import logging
+import weakref
+import threading
+
+from flask import current_app, has_app_context
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache, select_autoescape
+
+
+class TemplateRegistry:
+    """
+    PDF 문서 템플릿 전용 Jinja2 환경
+    - 프로세스당 1개, 컴파일된 템플릿은 메모리에 계속 유지 (요청마다 파싱/컴파일하지 않음)
+    - 컴파일 결과(bytecode)는 디스크에도 저장 → 워커 재시작 후에도 컴파일 생략
+    - 템플릿 파일 변경 확인(auto reload)은 debug 모드에서만
+    - 운영 모드에서는 version() 이 문서 템플릿의 수정시각만 확인 → 파일이 교체됐으면 그 템플릿만 다시 로드
+    - version(name): 실제로 렌더링에 쓰이는 (메모리에 올라간) 템플릿 소스의 해시 → PDF 캐시 키에 사용
+    """
+
+    def __init__(self, template_dir, cache_dir):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.template_dir = template_dir
+        self.env = Environment(
+            loader=FileSystemLoader(template_dir),
+            bytecode_cache=FileSystemBytecodeCache(cache_dir),
+            autoescape=select_autoescape(['html', 'htm', 'xml']),  # Flask render_template 과 동일
+            auto_reload=False,
+            cache_size=-1,  # 템플릿 수가 적으므로 전부 유지
+        )
+        self._lock = threading.Lock()
+        self._versions = {}  # {템플릿명: (템플릿 객체, 소스 sha256)}
+
+    def _sync_auto_reload(self):
+        # app.run(debug=True) 는 앱 생성 이후에 debug 를 켜므로 렌더링 시점에 확인
+        debug = has_app_context() and current_app.debug
+        if self.env.auto_reload != debug:
+            self.env.auto_reload = debug
+
+    def get(self, template_name):
+        self._sync_auto_reload()
+        return self.env.get_template(template_name)
+
+    def version(self, template_name):
+        """
+        지금 로드된 템플릿의 소스 해시
+        - 템플릿이 다시 로드되면 객체가 바뀌므로 그때만 소스를 다시 읽어 해시 계산
+        - auto reload 가 꺼져 있어도 파일 수정시각이 바뀌었으면 캐시에서 빼고 다시 로드
+          (다음 render() 도 새 템플릿 사용)
+        """
+        template = self.get(template_name)
+        if not self.env.auto_reload and not template.is_up_to_date:
+            with self._lock:
+                # Environment 의 템플릿 캐시 키 (jinja2 Environment._load_template 과 동일)
+                self.env.cache.pop((weakref.ref(self.env.loader), template_name), None)
+                template = self.env.get_template(template_name)
+            logging.info(f"PDF 템플릿 다시 로드: {template_name}")
+        cached = self._versions.get(template_name)
+        if cached is not None and cached[0] is template:
+            return cached[1]
+        source, _, _ = self.env.loader.get_source(self.env, template_name)
+        digest = hashlib.sha256(source.encode("utf-8")).hexdigest()
+        self._versions[template_name] = (template, digest)
+        return digest
+
+    def render(self, template_name, **context):
+        return self.get(template_name).render(**context)
+
+    def warm_up(self):
+        """템플릿 폴더의 HTML 템플릿을 미리 컴파일 (서버 시작 시 1회)"""
+        with self._lock:
+            names = self.env.list_templates(extensions=['html'])
+            for name in names:
+                try:
+                    self.env.get_template(name)
+                except Exception:
+                    logging.exception(f"PDF 템플릿 컴파일 실패: {name}")
+            logging.info(f"PDF 템플릿 {len(names)}개 준비 완료")
@@ -16,6 +16,7 @@ from .excel import excel_bp
 from .contractReivew import contractReivew_bp   
 from .contractApproval import contractApproval_bp  
 from .permissions import permissions_bp  
+from .autocomplete import autocomplete_bp
 
 # 📌 Blueprint 등록
 def register_blueprints(app):
@@ -34,3 +35,4 @@ def register_blueprints(app):
     app.register_blueprint(contractReivew_bp)  # 계약검토서 관련 API 등록
     app.register_blueprint(contractApproval_bp)  # 계약검토서 관련 API 등록
     app.register_blueprint(permissions_bp)  # 권한 관련 API 등록
+    app.register_blueprint(autocomplete_bp)  # 자동완성 관련 API 등록
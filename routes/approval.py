@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify
-from models.database import get_db_connection
+from models.database import get_db_connection, get_db
+from models.pagination import Pagination
 import logging
 from datetime import datetime
 import traceback
@@ -465,7 +466,7 @@ def cancel_approval(approval_id):
 def get_approval_detail(approval_id):
     """결재 상세 조회 API"""
     try:
-        conn = get_db_connection()
+        conn = get_db()
         try:
             with conn.cursor() as cursor:
                 # 1. 결재 기본 정보 조회
@@ -534,8 +535,6 @@ def get_approval_detail(approval_id):
         except Exception as e:
             logging.error("Error in get_approval_detail: %s", str(e))
             return jsonify({'result': 'error', 'message': str(e)}), 500
-        finally:
-            conn.close()
 
     except Exception as ex:
         logging.error("Unexpected error in get_approval_detail: %s", str(ex))
@@ -544,15 +543,19 @@ def get_approval_detail(approval_id):
 @approval_bp.route('/approval/list', methods=['GET'])
 def get_approval_list():
     """결재 리스트 조회 API"""
+    try:
+        pagination = Pagination([
+            ("a.created_at", "created_at", "DESC"),
+            ("a.approval_id", "approval_id", "DESC"),
+        ], default_limit=10, limit_arg='per_page')
+    except ValueError as e:
+        return jsonify({'result': 'error', 'message': str(e)}), 400
+
     try:
         # 요청 파라미터 가져오기
         status = request.args.get('status')
         requester_id = request.args.get('requester_id')
         approver_id = request.args.get('approver_id')  # 결재자 ID 추가
-        page = int(request.args.get('page', 1))
-        per_page = int(request.args.get('per_page', 10))
-
-        offset = (page - 1) * per_page
 
         conn = get_db_connection()
         try:
@@ -587,12 +590,14 @@ def get_approval_list():
                     params.append(approver_id)
 
                 # 정렬 및 페이징 추가
-                sql += " ORDER BY a.created_at DESC LIMIT %s OFFSET %s"
-                params.extend([per_page, offset])
+                cursor_sql, cursor_params = pagination.where()
+                order_sql, order_params = pagination.order_limit()
+                sql += cursor_sql + order_sql
+                params.extend(cursor_params + order_params)
 
                 # 쿼리 실행
                 cursor.execute(sql, params)
-                approvals = cursor.fetchall()
+                approvals, page_info = pagination.result(cursor.fetchall())
 
                 # 총 항목 수 계산
                 count_sql = """
@@ -620,9 +625,11 @@ def get_approval_list():
                 'result': 'success',
                 'data': approvals,
                 'pagination': {
-                    'page': page,
-                    'per_page': per_page,
-                    'total': total
+                    'page': pagination.page,
+                    'per_page': pagination.limit,
+                    'total': total,
+                    'hasNext': page_info['hasNext'],
+                    'nextCursor': page_info['nextCursor']
                 }
             })
 
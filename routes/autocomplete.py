@@ -0,0 +1,45 @@
+from flask import Blueprint, request, jsonify
+from extensions import autocomplete
+from autocomplete.service import AUTOCOMPLETE_DEFAULT_LIMIT, AUTOCOMPLETE_MAX_LIMIT
+import logging
+
+# 📌 Blueprint 생성
+autocomplete_bp = Blueprint('autocomplete', __name__)
+
+from auth.decorators import require_token
+@autocomplete_bp.before_request
+@require_token
+def require_token_for_user_bp():
+    pass
+
+
+# 🔎 자동완성 API
+#  - GET /autocomplete/customers?q=잇신  → 고객명 / 사업자번호 앞글자
+#  - GET /autocomplete/products?q=ㅍㅇ   → 제품명 / 제조사 (초성만 입력하면 초성 검색)
+#  - GET /autocomplete/users?q=hong     → 이름 / 이메일
+#  - 필터: customers?customerType=, products?vendor=, users?roleCd=
+@autocomplete_bp.route('/autocomplete/<entity>', methods=['GET'])
+def get_autocomplete(entity):
+    if entity not in autocomplete.entities:
+        return jsonify({"error": f"지원하지 않는 자동완성 대상입니다: {entity}"}), 404
+
+    query = (request.args.get('q') or '').strip()
+    try:
+        limit = int(request.args.get('limit', AUTOCOMPLETE_DEFAULT_LIMIT))
+    except ValueError:
+        return jsonify({"error": "limit 는 숫자여야 합니다."}), 400
+    limit = max(1, min(limit, AUTOCOMPLETE_MAX_LIMIT))
+
+    if not query:
+        return jsonify([]), 200
+
+    try:
+        return jsonify(autocomplete.search(entity, query, limit, request.args.to_dict())), 200
+    except Exception as e:
+        logging.exception(f"자동완성 검색 실패: {entity} {query}")
+        return jsonify({"error": "자동완성 검색 중 오류 발생", "message": str(e)}), 500
+
+
+@autocomplete_bp.route('/autocomplete_metrics', methods=['GET'])
+def get_autocomplete_metrics():
+    return jsonify(autocomplete.metrics()), 200
@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify
 from models.database import get_db_connection
+from models.pagination import Pagination, set_pagination_headers
 import logging #로그 남기기
 
 
@@ -121,27 +122,45 @@ def list_contracts():
             where_clauses.append("c.contract_type = %s")
             params.append(task_type)
 
-        # 4) WHERE 절 동적 결합
-        if where_clauses:
-            sql += " WHERE " + " AND ".join(where_clauses)
-
-        # 5) 정렬(sort)
+        # 4) 정렬(sort) + 페이징
         #    기본값 contract_dt (DESC 정렬 예시) -- 필요에 맞게 ASC/DESC 조정
         #    만약 프런트에서 ASC/DESC를 같이 넘겨주려면 추가 파라미터 필요
-        valid_sort_fields = ["contract_dt", "amount", "customer_name"]  # 허용할 정렬 컬럼
-        if sort not in valid_sort_fields:
-            sort = "contract_dt"
-        sql += f" ORDER BY c.{sort} DESC"
+        #    keyset 커서가 안정적이도록 contract_id 를 보조 정렬키로 사용
+        valid_sort_fields = {  # 허용할 정렬 컬럼: (SQL 컬럼, 결과 키)
+            "contract_dt": ("c.contract_dt", "contract_date"),
+            "amount": ("c.amount", "amount"),
+            "customer_name": ("cust.customer_nm", "customer_name"),
+        }
+        sort_column, sort_key = valid_sort_fields.get(sort, valid_sort_fields["contract_dt"])
+        try:
+            pagination = Pagination([
+                (sort_column, sort_key, "DESC"),
+                ("c.contract_id", "contract_id", "DESC"),
+            ])
+        except ValueError as e:
+            return jsonify({"result": False, "error": str(e)}), 400
+
+        # 5) WHERE 절 동적 결합
+        cursor_sql, cursor_params = pagination.where()
+        sql += " WHERE 1=1"
+        if where_clauses:
+            sql += " AND " + " AND ".join(where_clauses)
+        sql += cursor_sql
+        params.extend(cursor_params)
+
+        order_sql, order_params = pagination.order_limit()
+        sql += order_sql
+        params.extend(order_params)
 
         # 6) SQL 실행
         with conn.cursor() as cursor:
             logging.info("최종 SQL: %s", sql)
             logging.info("params: %s", params)
             cursor.execute(sql, params)
-            rows = cursor.fetchall()
+            rows, page_info = pagination.result(cursor.fetchall())
 
-        # 7) JSON 응답
-        return jsonify(rows), 200
+        # 7) JSON 응답 (페이징 정보는 헤더로)
+        return set_pagination_headers(jsonify(rows), page_info), 200
     
     except Exception as e:
         logging.exception("Error in list_contracts")
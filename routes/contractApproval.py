@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify
 from models.database import get_db_connection
+from models.pagination import Pagination
 from auth.decorators import require_token
 from datetime import datetime
 import logging
@@ -328,6 +329,7 @@ def list_contract_approvals():
                 ca.contract_end_date,
                 ca.sales_amount,
                 DATE_FORMAT(ca.created_at, '%%Y/%%m/%%d') AS created_at,
+                ca.created_at AS created_at_raw,
                 c.customer_nm AS customer_company_name,
                 ec.customer_nm AS end_customer_name
             FROM contract_approval ca
@@ -351,17 +353,31 @@ def list_contract_approvals():
             query += " AND ec.customer_nm LIKE %s"
             params.append(f"%{end_customer}%")
 
-        # 정렬 추가
-        query += " ORDER BY ca.created_at DESC"
+        # 정렬 + 페이징 추가 (contract_approval_id 를 보조 정렬키로 사용)
+        pagination = Pagination([
+            ("ca.created_at", "created_at_raw", "DESC"),
+            ("ca.contract_approval_id", "contract_approval_id", "DESC"),
+        ])
+        cursor_sql, cursor_params = pagination.where()
+        query += cursor_sql
+        params.extend(cursor_params)
+
+        order_sql, order_params = pagination.order_limit()
+        query += order_sql
+        params.extend(order_params)
 
         # 쿼리 실행
         cursor.execute(query, params)
-        results = cursor.fetchall()
+        results, page_info = pagination.result(cursor.fetchall())
+        for row in results:
+            row.pop('created_at_raw', None)
 
         # camelCase 변환
         results = convert_keys_to_camel_case(results)
 
-        return jsonify({'status': 'success', 'data': results})
+        return jsonify({'status': 'success', 'data': results, 'pagination': page_info})
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
     except Exception as e:
         logging.error(f"[수주품의서 목록 조회 오류] {e}")
         return jsonify({'status': 'error', 'message': str(e)}), 500
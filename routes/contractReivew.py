@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify
 from models.database import get_db_connection
+from models.pagination import Pagination
 import logging #로그 남기기
 from datetime import datetime
 
@@ -56,6 +57,7 @@ def list_contract_reviews():
                 DATE_FORMAT(cr.execute_date, '%%Y/%%m/%%d') AS execute_date,
                 cr.contract_amount,
                 DATE_FORMAT(cr.created_at, '%%Y/%%m/%%d') AS created_at,
+                cr.created_at AS created_at_raw,
                 cr.updated_at,
                 cr.customer_company_id,
                 cr.end_customer_id,
@@ -94,8 +96,18 @@ def list_contract_reviews():
             query += " AND c2.customer_nm LIKE %s"
             params.append(f"%{end_customer}%")
 
-        # 정렬 추가
-        query += " ORDER BY cr.created_at DESC"
+        # 정렬 + 페이징 추가 (cr.id 를 보조 정렬키로 사용)
+        pagination = Pagination([
+            ("cr.created_at", "created_at_raw", "DESC"),
+            ("cr.id", "contract_review_id", "DESC"),
+        ])
+        cursor_sql, cursor_params = pagination.where()
+        query += cursor_sql
+        params.extend(cursor_params)
+
+        order_sql, order_params = pagination.order_limit()
+        query += order_sql
+        params.extend(order_params)
 
 
         logging.info(f"[최종 쿼리] {query}")
@@ -104,9 +116,13 @@ def list_contract_reviews():
 
         # 쿼리 실행
         cursor.execute(query, params)
-        results = cursor.fetchall()
+        results, page_info = pagination.result(cursor.fetchall())
+        for row in results:
+            row.pop('created_at_raw', None)
 
-        return jsonify({'status': 'success', 'data': results})
+        return jsonify({'status': 'success', 'data': results, 'pagination': page_info})
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
     except Exception as e:
         logging.error(f"[계약 검토서 목록 조회 오류] {e}")
         return jsonify({'status': 'error', 'message': str(e)})
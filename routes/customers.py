@@ -1,8 +1,15 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 import pymysql
-from models.database import get_db_connection
+from models.database import get_db_connection, get_db, get_multi_statement_connection, fetch_result_sets
+from models.pagination import Pagination, set_pagination_headers
+from models.streaming import get_stream_format, stream_query
+from models.cache import ReadThroughCache
+from extensions import autocomplete
+from models.search import (FulltextIndexes, search_tokens, strip_company_affixes, boolean_query, escape_like,
+                           NGRAM_TOKEN_SIZE, SEARCH_DEFAULT_LIMIT, SEARCH_MAX_LIMIT)
 import logging
 import json
+import re
 from decimal import Decimal
 from datetime import datetime
 from auth.decorators import require_token
@@ -13,6 +20,14 @@ logging.basicConfig(level=logging.DEBUG)
 # 🔹 Blueprint 생성
 customers_bp = Blueprint('customers', __name__)
 
+# 🔹 고객 상세 응답 캐시 (고객 ID → 직렬화된 JSON) - 고객 수정/삭제, 타임라인 추가 시 무효화
+customer_cache = ReadThroughCache("customer")
+
+# 🔹 고객 검색 인덱스 (ngram FULLTEXT, migrations/002_customer_search_indexes.sql) - 없으면 LIKE 검색으로 동작
+customer_search_indexes = FulltextIndexes("customer", [
+    "ft_customer_nm", "ft_customer_mng_nm", "ft_customer_search", "idx_customer_biz_num",
+], get_db_connection)
+
 @customers_bp.before_request
 @require_token
 def require_token_for_user_bp():
@@ -40,6 +55,178 @@ def custom_json_converter(obj):
     return str(obj)
 
 
+# 📌 하위 테이블(담당자 / 서브 장비 / 이슈) 일괄 저장
+INSERT_BATCH_SIZE = 500  # INSERT 한 문장에 넣는 최대 행 수
+
+SUB_DEVICE_COLUMNS = ("device_type", "model_name", "hostname", "device_ip", "login_id", "login_pw",
+                      "serial_no", "access_port", "access_host", "service_type")
+
+INSERT_MANAGER_SQL = """
+    INSERT INTO customer_manager (
+        customer_id, manager_id, manager_nm, tel_no, email, position, mng_yn, reg_id, reg_dt, upd_id, upd_dt
+    ) VALUES """
+INSERT_MANAGER_ROW = "(%s, %s, %s, %s, %s, %s, %s, %s, NOW(), %s, NOW())"
+
+INSERT_SUB_DEVICE_SQL = f"""
+    INSERT INTO sub_device (device_id, {", ".join(SUB_DEVICE_COLUMNS)}, created_at) VALUES """
+INSERT_SUB_DEVICE_ROW = "(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, NOW())"
+
+INSERT_ISSUE_SQL = """
+    INSERT INTO customer_issue (customer_id, issue_date, operator, detail, created_at) VALUES """
+INSERT_ISSUE_ROW = "(%s, %s, %s, %s, NOW())"
+
+
+def manager_values(manager):
+    return (manager.get("managerNm"), manager.get("telNo"), manager.get("email"),
+            manager.get("position"), manager.get("mngYn"))
+
+
+def sub_device_values(item):
+    # backup 장비: access_port / access_host / service_type, etc 장비: device_ip
+    return tuple(item.get(column) for column in SUB_DEVICE_COLUMNS)
+
+
+def issue_values(issue):
+    return (issue.get("issue_date"), issue.get("operator_id"), issue.get("detail"))
+
+
+def insert_rows(cursor, insert_sql, row_sql, rows):
+    """
+    여러 행을 INSERT ... VALUES (...), (...) 한 문장으로 저장 (INSERT_BATCH_SIZE 행씩)
+    - pymysql executemany 는 VALUES 에 NOW() 가 있으면 한 행씩 실행하므로 직접 묶음
+    """
+    for start in range(0, len(rows), INSERT_BATCH_SIZE):
+        batch = rows[start:start + INSERT_BATCH_SIZE]
+        cursor.execute(insert_sql + ", ".join([row_sql] * len(batch)), [value for row in batch for value in row])
+
+
+def _comparable(value):
+    if value is None or value == "":
+        return None
+    return str(value)
+
+
+def _row_key(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def diff_child_rows(existing, incoming):
+    """
+    저장된 하위 행과 요청 값을 비교해서 바뀐 행만 골라냄
+    - existing: {key: (값, ...)}, incoming: [(key, (값, ...)), ...] (key 가 없거나 모르는 key 면 새 행)
+    - 반환: (추가할 값 목록, [(값, key)] 수정 목록, 삭제할 key 목록) - 값이 같은 행은 건드리지 않음
+    """
+    inserts, updates, seen = [], [], set()
+    for key, values in incoming:
+        if key is None or key not in existing or key in seen:
+            inserts.append(values)
+            continue
+        seen.add(key)
+        if [_comparable(v) for v in values] != [_comparable(v) for v in existing[key]]:
+            updates.append((values, key))
+    deletes = [key for key in existing if key not in seen]
+    return inserts, updates, deletes
+
+
+def _placeholders(values):
+    return ", ".join(["%s"] * len(values))
+
+
+# 📌 고객 검색 조건
+def text_filter(column, text):
+    """
+    이름 검색 조건 (' AND ...', params)
+    - 기존처럼 검색어 전체를 포함하는 이름 (LIKE '%검색어%', 연속 공백은 하나로)
+    - 2글자 이상 토큰은 FULLTEXT(ngram) boolean 검색도 같이 → 인덱스로 후보를 좁힌 뒤 LIKE 로 확인
+      (1글자 토큰만 있으면 LIKE 만)
+    """
+    phrase = " ".join((text or "").split())
+    if not phrase:
+        return "", []
+    sql, params = "", []
+    long_tokens = [t for t in search_tokens(phrase) if len(t) >= NGRAM_TOKEN_SIZE]
+    if long_tokens and customer_search_indexes.available():
+        sql += f" AND MATCH({column}) AGAINST (%s IN BOOLEAN MODE)"
+        params.append(boolean_query(long_tokens))
+    sql += f" AND {column} LIKE %s"
+    params.append(f"%{escape_like(phrase)}%")
+    return sql, params
+
+
+def biz_num_prefixes(text):
+    """사업자등록번호 앞자리 → ['123-45-6%', '123456%'] (하이픈 있는/없는 저장 형식 모두)"""
+    digits = re.sub(r"\D", "", text or "")
+    if not digits:
+        return []
+    formatted = "-".join(part for part in (digits[:3], digits[3:5], digits[5:]) if part)
+    return list(dict.fromkeys([f"{formatted}%", f"{digits}%"]))
+
+
+def biz_num_filter(text):
+    """
+    목록 API 의 사업자등록번호 검색 - 기존처럼 포함 검색 (가운데 자리로도 찾음)
+    - 숫자만 비교하는 조건도 같이 → 하이픈 있는/없는 저장 형식 모두
+    - 앞자리 인덱스 검색은 /customers/search 에서만 (biz_num_prefixes)
+    """
+    sql, params = "biz_num LIKE %s", [f"%{escape_like(text)}%"]
+    digits = re.sub(r"\D", "", text or "")
+    if digits:
+        sql += " OR REPLACE(biz_num, '-', '') LIKE %s"
+        params.append(f"%{digits}%")
+    return f" AND ({sql})", params
+
+
+# 📌 고객 상세 조회 - 세미콜론으로 이어 붙여 한 번에 실행 (결과 순서: 고객, 담당자, 장비, 서브 장비, 서비스, 이슈)
+CUSTOMER_DETAIL_SQL = """
+    SELECT
+        c.*,
+        d.email AS sales_email,
+        e.email AS engineer_email
+    FROM customer c
+    LEFT JOIN user d ON c.sales_id = d.usr_id
+    LEFT JOIN user e ON c.engineer_id = e.usr_id
+    WHERE c.customer_id = %s;
+
+    SELECT * FROM customer_manager WHERE customer_id = %s;
+
+    SELECT DATE_FORMAT(t.termination_date, '%%Y-%%m-%%d') AS termination_date, t.* FROM device t WHERE t.customer_id = %s;
+
+    SELECT sd.* FROM sub_device sd JOIN device d ON sd.device_id = d.id WHERE d.customer_id = %s ORDER BY sd.id;
+
+    SELECT
+        DATE_FORMAT(t.installation_date, '%%Y-%%m-%%d') AS installation_date,
+        t.service_type,
+        t.report_yn,
+        t.asset_info,
+        t.service_scope,
+        t.license_type,
+        t.maintenance_level,
+        t.monitoring_level,
+        t.security_policy,
+        t.monitoring_registration,
+        t.special_note,
+        t.engineer_id,
+        t.installation_date,
+        e.email AS service_engineer_email,
+        e.usr_id AS service_engineer_id
+    FROM customer_service t
+    LEFT JOIN user e ON t.engineer_id = e.usr_id
+    WHERE t.customer_id = %s;
+
+    SELECT DATE_FORMAT(t.issue_date, '%%Y-%%m-%%dT%%H:%%i') AS issue_date
+         , t.id
+         , t.detail
+         , e.usr_id AS operator_id
+         , e.name AS operator
+      FROM customer_issue t
+        LEFT JOIN user e ON t.operator = e.usr_id
+     WHERE t.customer_id = %s ORDER BY t.issue_date DESC
+"""
+
+
 
 
 
@@ -71,85 +258,69 @@ def get_customer(customerId):
         "issues": [ ... ]
       }
     """
-    conn = get_db_connection()
-    cursor = conn.cursor(pymysql.cursors.DictCursor)
-
     try:
-        # 1) 고객 정보 조회
-        query = """
-        SELECT 
-            c.*, 
-            d.email AS sales_email,
-            e.email AS engineer_email
-        FROM customer c
-        LEFT JOIN user d ON c.sales_id = d.usr_id
-        LEFT JOIN user e ON c.engineer_id = e.usr_id
-        WHERE c.customer_id = %s
-        """
-        cursor.execute(query, (customerId,))
-        customer = cursor.fetchone()
+        body = customer_cache.get_or_load(customerId, lambda: load_customer_detail(customerId))
+    except Exception as e:
+        logging.error(f"Error fetching customer data: {str(e)}")
+        return jsonify({"error": "데이터 조회 중 오류 발생"}), 500
+
+    if body is None:
+        return jsonify({"error": "고객 정보를 찾을 수 없습니다."}), 404  # 고객이 없을 경우 404 반환
+    return current_app.response_class(body, mimetype="application/json"), 200
+
+
+# 📌 상세 캐시에 들어가는 사용자 정보(영업/엔지니어 이메일, 이슈 담당자 이름)를 참조하는 고객
+CUSTOMERS_OF_USER_SQL = """
+    SELECT customer_id FROM customer WHERE sales_id = %s OR engineer_id = %s
+    UNION SELECT customer_id FROM customer_service WHERE engineer_id = %s
+    UNION SELECT customer_id FROM customer_issue WHERE operator = %s
+"""
+
 
-        if not customer:
-            return jsonify({"error": "고객 정보를 찾을 수 없습니다."}), 404  # 고객이 없을 경우 404 반환
+def invalidate_customers_of_user(user_id):
+    """사용자 수정/삭제 커밋 후 호출 - 그 사용자가 들어간 고객 상세 캐시 무효화 (실패해도 요청은 성공 처리)"""
+    try:
+        conn = get_db_connection()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(CUSTOMERS_OF_USER_SQL, (user_id,) * 4)
+                customer_ids = [row["customer_id"] for row in cursor.fetchall()]
+        finally:
+            conn.close()
+        customer_cache.invalidate_many(customer_ids)
+    except Exception:
+        logging.exception(f"⚠️ 사용자 {user_id} 관련 고객 캐시 무효화 실패 - 최대 캐시 유효 시간 동안 옛 정보")
+
+
+def load_customer_detail(customer_id):
+    """고객 상세 응답 JSON 문자열 (고객이 없으면 None) - customer_cache 를 거치지 않는 원본 조회"""
+    conn = get_multi_statement_connection()
+    cursor = conn.cursor(pymysql.cursors.DictCursor)
 
-        # 2) 담당자 리스트 조회
-        cursor.execute("SELECT * FROM customer_manager WHERE customer_id = %s", (customerId,))
-        managers = cursor.fetchall()
+    try:
+        # 1) 고객 / 담당자 / 장비 / 서브 장비 / 서비스 / 이슈를 한 번의 왕복으로 조회
+        customers, managers, devices, sub_devices, services, issueList = fetch_result_sets(
+            cursor, CUSTOMER_DETAIL_SQL, (customer_id,) * 6)
 
-        # 3) 장비 정보 조회
-        cursor.execute("SELECT DATE_FORMAT(t.termination_date, '%%Y-%%m-%%d') AS termination_date, t.* FROM device t WHERE t.customer_id = %s", (customerId,))
-        device = cursor.fetchone()
+        if not customers:
+            return None
+        customer = customers[0]
+        device = devices[0] if devices else None
+        service = services[0] if services else None
 
+        # 2) 서브 장비는 장비 기준으로 backup / etc 분리
         backupList = []
         etcDeviceList = []
         if device:
-            # 서브 장비 리스트 조회
-            cursor.execute("SELECT * FROM sub_device WHERE device_type = 'backup' AND device_id = %s", (device['id'],))
-            backupList = cursor.fetchall()
-
-            cursor.execute("SELECT * FROM sub_device WHERE device_type = 'etc' AND device_id = %s", (device['id'],))
-            etcDeviceList = cursor.fetchall()
-
-        # 4) 서비스 정보 조회
-        sql = """
-        SELECT
-            DATE_FORMAT(t.installation_date, '%%Y-%%m-%%d') AS installation_date,
-            t.service_type,
-            t.report_yn,
-            t.asset_info,
-            t.service_scope,
-            t.license_type,
-            t.maintenance_level,
-            t.monitoring_level,
-            t.security_policy,
-            t.monitoring_registration,
-            t.special_note,
-            t.engineer_id,
-            t.installation_date,
-            e.email AS service_engineer_email,
-            e.usr_id AS service_engineer_id
-        FROM customer_service t
-        LEFT JOIN user e ON t.engineer_id = e.usr_id
-        WHERE t.customer_id = %s
-        """ 
-        cursor.execute(sql, (customerId,))
-        service = cursor.fetchone()
-
-        # 5) 이슈 정보 조회
-        sql = """
-        SELECT DATE_FORMAT(t.issue_date, '%%Y-%%m-%%dT%%H:%%i') AS issue_date
-             , t.id
-             , t.detail
-             , e.usr_id AS operator_id
-             , e.name AS operator
-          FROM customer_issue t
-            LEFT JOIN user e ON t.operator = e.usr_id
-         WHERE t.customer_id = %s ORDER BY t.issue_date DESC
-        """ 
-        cursor.execute(sql , (customerId,))
-        issueList = cursor.fetchall()
-
-        # 6) camelCase로 변환
+            for item in sub_devices:
+                if item["device_id"] != device["id"]:
+                    continue
+                if item["device_type"] == "backup":
+                    backupList.append(item)
+                elif item["device_type"] == "etc":
+                    etcDeviceList.append(item)
+
+        # 3) camelCase로 변환
         if service:
             for key in ['service_scope', 'license_type', 'security_policy', 'monitoring_registration']:
                 if service.get(key):
@@ -167,7 +338,7 @@ def get_customer(customerId):
         issueList = issueList
 
 
-        # 7) 응답 데이터 구성
+        # 4) 응답 데이터 구성
         response = {
             "customer": customer,
             "managers": managers,
@@ -178,11 +349,11 @@ def get_customer(customerId):
             "issueList": issueList
         }
 
-        return jsonify(response), 200
+        return current_app.json.dumps(response)
 
-    except Exception as e:
-        logging.error(f"Error fetching customer data: {str(e)}")
-        return jsonify({"error": "데이터 조회 중 오류 발생"}), 500
+    except Exception:
+        conn.invalidate()  # 읽지 못한 결과가 남아 있을 수 있으므로 풀에 돌려놓지 않음
+        raise
 
     finally:
         cursor.close()
@@ -203,41 +374,67 @@ def get_customers():
     mng_nm_query = request.args.get('mngNmQuery', '')
     customer_type_query = request.args.get('customerTypeQuery', '')
 
+    try:
+        pagination = Pagination([("c.customer_id", "customer_id", "DESC")])
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    # 담당자 수는 고객별 서브쿼리로 (전체 JOIN + GROUP BY 없이 조회된 행만 계산)
     query = """
         SELECT 
         c.*, 
-        COUNT(cm.manager_id) AS manager_count
+        (SELECT COUNT(*) FROM customer_manager cm WHERE cm.customer_id = c.customer_id) AS manager_count
         FROM customer c
-        LEFT JOIN customer_manager cm ON c.customer_id = cm.customer_id
         WHERE 1=1
     """
+    params = []
 
-    # 고객명 검색
+    # 고객명 검색 (ngram FULLTEXT)
     if search_query:
-        query += f" AND customer_nm LIKE '%{search_query}%'"
+        sql, sql_params = text_filter("customer_nm", strip_company_affixes(search_query))
+        query += sql
+        params.extend(sql_params)
 
-    # 사업자등록번호 검색
+    # 사업자등록번호 검색 (포함 검색, 하이픈 유무 무관)
     if biz_num_query:
-        query += f" AND biz_num LIKE '%{biz_num_query}%'"
+        sql, sql_params = biz_num_filter(biz_num_query)
+        query += sql
+        params.extend(sql_params)
 
-    # 대표자명 검색
+    # 대표자명 검색 (ngram FULLTEXT)
     if mng_nm_query:
-        query += f" AND mng_nm LIKE '%{mng_nm_query}%'"
+        sql, sql_params = text_filter("mng_nm", mng_nm_query)
+        query += sql
+        params.extend(sql_params)
 
     # 고객 유형 검색
     if customer_type_query:
-        query += f" AND customer_type = '{customer_type_query}'"
+        query += " AND customer_type = %s"
+        params.append(customer_type_query)
+
+    # 전체 덤프(BI 연동 등) - ?stream=ndjson|json 이면 페이징 없이 한 줄씩 전송
+    stream_format = get_stream_format()
+    if stream_format:
+        query += " ORDER BY c.customer_id DESC"
+        return stream_query(query, params, stream_format, transform=convert_keys_to_camel_case)
+
+    # 페이징
+    cursor_sql, cursor_params = pagination.where()
+    query += cursor_sql
+    params.extend(cursor_params)
 
-    query += " GROUP BY c.customer_id desc"
+    order_sql, order_params = pagination.order_limit()
+    query += order_sql
+    params.extend(order_params)
 
     # 데이터 조회
+    cursor = get_db().cursor()
     try:
         logging.info(query);
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute(query)
-        customers = cursor.fetchall()
-        return jsonify(convert_keys_to_camel_case(customers))
+        cursor.execute(query, params)
+        customers, page_info = pagination.result(cursor.fetchall())
+        response = jsonify(convert_keys_to_camel_case(customers))
+        return set_pagination_headers(response, page_info)
 
     except Exception as e:
         logging.error(f"Error fetching customers: {str(e)}")
@@ -245,7 +442,69 @@ def get_customers():
 
     finally:
         cursor.close()
-        conn.close()
+
+
+# 🔥 고객 검색 API (검색창 자동완성/빠른 검색)
+@customers_bp.route('/customers/search', methods=['GET'])
+def search_customers():
+    """
+    고객명 / 대표자명 / 사업자등록번호 통합 검색 - 관련도 순 상위 limit 건
+    - URL: /customers/search?q=검색어&limit=20&customerType=
+    - 숫자만 입력하면 사업자등록번호 앞자리 검색
+    - 그 외에는 ngram FULLTEXT 관련도 + 고객명 일치/앞글자 일치 가산점
+      (n-gram 단위로 비교하므로 한두 글자 틀린 검색어도 나머지 n-gram 이 맞으면 결과에 포함)
+    """
+    q = (request.args.get('q') or '').strip()
+    limit = min(max(request.args.get('limit', SEARCH_DEFAULT_LIMIT, type=int) or SEARCH_DEFAULT_LIMIT, 1),
+                SEARCH_MAX_LIMIT)
+    customer_type = request.args.get('customerType', '')
+    tokens = search_tokens(strip_company_affixes(q))
+    if not tokens:
+        return jsonify([]), 200
+
+    columns = "c.customer_id, c.customer_nm, c.customer_type, c.biz_num, c.mng_nm, c.tel_no"
+    type_sql = " AND c.customer_type = %s" if customer_type else ""
+    type_params = [customer_type] if customer_type else []
+    name = " ".join(tokens)
+    boost_sql = "CASE WHEN c.customer_nm = %s THEN 100 WHEN c.customer_nm LIKE %s THEN 50 ELSE 0 END"
+    boost_params = [name, f"{escape_like(name)}%"]
+
+    if re.fullmatch(r"[\d\-\s]+", q):
+        # 사업자등록번호
+        prefixes = biz_num_prefixes(q)
+        sql = f"""
+            SELECT {columns}, 1 AS score FROM customer c
+             WHERE ({" OR ".join(["c.biz_num LIKE %s"] * len(prefixes))}){type_sql}
+             ORDER BY c.biz_num LIMIT %s
+        """
+        params = [*prefixes, *type_params, limit]
+    elif customer_search_indexes.available() and len(name.replace(" ", "")) >= NGRAM_TOKEN_SIZE:
+        match_sql = "MATCH(c.customer_nm, c.mng_nm, c.biz_num) AGAINST (%s IN NATURAL LANGUAGE MODE)"
+        sql = f"""
+            SELECT {columns}, {match_sql} + {boost_sql} AS score FROM customer c
+             WHERE {match_sql}{type_sql}
+             ORDER BY score DESC, c.customer_id DESC LIMIT %s
+        """
+        params = [name, *boost_params, name, *type_params, limit]
+    else:
+        # 1글자 검색어 / 인덱스 없음 → 앞글자 일치 우선, 포함 검색
+        sql = f"""
+            SELECT {columns}, {boost_sql} AS score FROM customer c
+             WHERE (c.customer_nm LIKE %s OR c.mng_nm LIKE %s){type_sql}
+             ORDER BY score DESC, c.customer_nm LIMIT %s
+        """
+        contains = f"%{escape_like(name)}%"
+        params = [*boost_params, contains, contains, *type_params, limit]
+
+    cursor = get_db().cursor()
+    try:
+        cursor.execute(sql, params)
+        return jsonify(convert_keys_to_camel_case(cursor.fetchall())), 200
+    except Exception as e:
+        logging.error(f"Error searching customers: {str(e)}")
+        return jsonify({"error": "데이터 조회 중 오류 발생"}), 500
+    finally:
+        cursor.close()
 
 
 # 🔥 고객 정보 추가 API
@@ -275,7 +534,7 @@ def add_customer():
     issue_list = data.get("issueList", [])
     
 
-    conn = get_db_connection()
+    conn = get_db()
     cursor = conn.cursor()
 
     try:
@@ -295,18 +554,11 @@ def add_customer():
         ))
         new_customer_id = cursor.lastrowid
 
-        # 2) 담당자 리스트 저장
-        insert_manager_query = """
-        INSERT INTO customer_manager (
-            customer_id, manager_id, manager_nm, tel_no, email, position, mng_yn, reg_id, reg_dt, upd_id, upd_dt
-        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, NOW(), %s, NOW())
-        """
-        for idx, manager in enumerate(managers_data, start=1):  # manager_id는 1부터 시작
-            cursor.execute(insert_manager_query, (
-                new_customer_id, idx, manager.get("managerNm"), manager.get("telNo"),
-                manager.get("email"), manager.get("position"), manager.get("mngYn"),
-                customer_data.get("regId"), customer_data.get("updId")
-            ))
+        # 2) 담당자 리스트 저장 (한 문장)
+        insert_rows(cursor, INSERT_MANAGER_SQL, INSERT_MANAGER_ROW, [
+            (new_customer_id, idx, *manager_values(manager), customer_data.get("regId"), customer_data.get("updId"))
+            for idx, manager in enumerate(managers_data, start=1)  # manager_id는 1부터 시작
+        ])
 
         # 3) 장비 정보 저장
         insert_device_query = """
@@ -323,37 +575,10 @@ def add_customer():
         ))
         new_device_id = cursor.lastrowid
 
-        # 4) 서브 장비 리스트 저장
-        insert_sub_device_query = """
-        INSERT INTO sub_device (
-            device_id,
-            device_type,
-            model_name,
-            hostname,
-            device_ip,
-            login_id,
-            login_pw,
-            serial_no,
-            access_port,
-            access_host,
-            service_type,
-            created_at
-        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, NOW())
-        """
-        for item in sub_devices:
-            cursor.execute(insert_sub_device_query, (
-                new_device_id,                      # 상위 device 테이블의 ID
-                item.get("device_type"),            # backup / etc
-                item.get("model_name"),
-                item.get("hostname"),
-                item.get("device_ip"),              # etcDeviceList만 사용
-                item.get("login_id"),
-                item.get("login_pw"),
-                item.get("serial_no"),
-                item.get("access_port"),            # backup 장비일 경우 사용
-                item.get("access_host"),            # backup 장비일 경우 사용
-                item.get("service_type"),           # backup 장비일 경우 사용
-            ))
+        # 4) 서브 장비 리스트 저장 (한 문장)
+        insert_rows(cursor, INSERT_SUB_DEVICE_SQL, INSERT_SUB_DEVICE_ROW, [
+            (new_device_id, *sub_device_values(item)) for item in sub_devices  # 상위 device 테이블의 ID
+        ])
 
         # 5) 서비스 정보 저장
         if service_data:
@@ -375,26 +600,18 @@ def add_customer():
             ))
 
 
-        # 6) 이슈 정보 저장
-        if issue_list:
-            insert_issue_query = """
-            INSERT INTO customer_issue (
-                customer_id, issue_date, operator, detail, created_at
-            ) VALUES (%s, %s, %s, %s, NOW())
-            """
-            for issue in issue_list:
-                cursor.execute(insert_issue_query, (
-                    new_customer_id,
-                    issue.get("issue_date"),
-                    issue.get("operator_id"),
-                    issue.get("detail")
-                ))
+        # 6) 이슈 정보 저장 (한 문장)
+        insert_rows(cursor, INSERT_ISSUE_SQL, INSERT_ISSUE_ROW, [
+            (new_customer_id, *issue_values(issue)) for issue in issue_list
+        ])
 
 
     
         
 
         conn.commit()
+        customer_cache.invalidate(new_customer_id)
+        autocomplete.changed("customers", new_customer_id)  # 🔎 자동완성 색인 갱신
         return jsonify({"message": "고객 정보 저장 성공", "newCustomerId": new_customer_id}), 201
 
     except pymysql.MySQLError as e:
@@ -404,7 +621,6 @@ def add_customer():
 
     finally:
         cursor.close()
-        conn.close()
 
 
 # 🔥 고객 정보 수정 API
@@ -412,6 +628,7 @@ def add_customer():
 def update_customer(id):
     """
     고객 정보를 수정하는 API
+    - 담당자 / 서브 장비 / 이슈는 저장된 행과 비교해서 바뀐 행만 추가·수정·삭제
     - URL: /customers/<id>
     - 요청 JSON 예시:
       {
@@ -431,7 +648,7 @@ def update_customer(id):
     service_data = data.get("service")
     issue_list = data.get("issueList", [])
 
-    conn = get_db_connection()
+    conn = get_db()
     cursor = conn.cursor()
 
     try:
@@ -451,22 +668,34 @@ def update_customer(id):
             customer_data.get("updId"), customer_id
         ))
 
-        # 2) 기존 담당자 삭제
-        delete_manager_query = "DELETE FROM customer_manager WHERE customer_id = %s"
-        cursor.execute(delete_manager_query, (customer_id,))
-
-        # 3) 새로운 담당자 리스트 저장
-        insert_manager_query = """
-        INSERT INTO customer_manager (
-            customer_id, manager_id, manager_nm, tel_no, email, position, mng_yn, reg_id, reg_dt, upd_id, upd_dt
-        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, NOW(), %s, NOW())
-        """
-        for idx, manager in enumerate(managers_data, start=1):  # manager_id는 1부터 시작
-            cursor.execute(insert_manager_query, (
-                customer_id, idx, manager.get("managerNm"), manager.get("telNo"),
-                manager.get("email"), manager.get("position"), manager.get("mngYn"),
-                customer_data.get("regId"), customer_data.get("updId")
-            ))
+        # 2) 담당자 리스트 반영 - manager_id 는 목록 순서(1부터)이므로 같은 순번끼리 비교
+        cursor.execute("""
+            SELECT manager_id, manager_nm, tel_no, email, position, mng_yn
+              FROM customer_manager WHERE customer_id = %s FOR UPDATE
+        """, (customer_id,))
+        existing_managers = {
+            row["manager_id"]: (row["manager_nm"], row["tel_no"], row["email"], row["position"], row["mng_yn"])
+            for row in cursor.fetchall()
+        }
+        manager_inserts, manager_updates, manager_deletes = diff_child_rows(existing_managers, [
+            (idx, manager_values(manager)) for idx, manager in enumerate(managers_data, start=1)
+        ])
+        if manager_deletes:
+            cursor.execute(
+                f"DELETE FROM customer_manager WHERE customer_id = %s AND manager_id IN ({_placeholders(manager_deletes)})",
+                (customer_id, *manager_deletes),
+            )
+        if manager_updates:
+            cursor.executemany("""
+                UPDATE customer_manager SET
+                    manager_nm = %s, tel_no = %s, email = %s, position = %s, mng_yn = %s, upd_id = %s, upd_dt = NOW()
+                WHERE customer_id = %s AND manager_id = %s
+            """, [(*values, customer_data.get("updId"), customer_id, manager_id) for values, manager_id in manager_updates])
+        new_manager_ids = [idx for idx in range(1, len(managers_data) + 1) if idx not in existing_managers]
+        insert_rows(cursor, INSERT_MANAGER_SQL, INSERT_MANAGER_ROW, [
+            (customer_id, manager_id, *values, customer_data.get("regId"), customer_data.get("updId"))
+            for manager_id, values in zip(new_manager_ids, manager_inserts)
+        ])
 
         # 4) 장비 정보 수정 또는 추가
         if device_data:
@@ -507,45 +736,31 @@ def update_customer(id):
         else:
             device_id = None
 
-        # 5) 기존 서브 장비 삭제
-        delete_sub_device_query = "DELETE FROM sub_device WHERE device_id = %s"
-        if id:
-            cursor.execute(delete_sub_device_query, (device_id,))
-
-        # 6) 새로운 서브 장비 리스트 저장
-        insert_sub_device_query = """
-        INSERT INTO sub_device (
-            device_id,
-            device_type,
-            model_name,
-            hostname,
-            device_ip,
-            login_id,
-            login_pw,
-            serial_no,
-            access_port,
-            access_host,
-            service_type,
-            created_at
-        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, NOW())
-        """
-        for item in sub_devices:
-            cursor.execute(insert_sub_device_query, (
-                device_id,                      # 상위 device 테이블의 ID
-                item.get("device_type"),        # backup / etc
-                item.get("model_name"),
-                item.get("hostname"),
-                item.get("device_ip"),          # etcDeviceList만 사용
-                item.get("login_id"),
-                item.get("login_pw"),
-                item.get("serial_no"),
-                item.get("access_port"),        # backup 장비일 경우 사용
-                item.get("access_host"),        # backup 장비일 경우 사용
-                item.get("service_type"),       # backup 장비일 경우 사용
-            ))
-
-
-        # 7) 서비스 정보 수정
+        # 5) 서브 장비 리스트 반영 - 조회 때 내려준 id 로 기존 행과 비교 (id 없는 항목은 새 장비)
+        existing_sub_devices = {}
+        if device_id:
+            cursor.execute(f"""
+                SELECT id, {", ".join(SUB_DEVICE_COLUMNS)} FROM sub_device WHERE device_id = %s FOR UPDATE
+            """, (device_id,))
+            existing_sub_devices = {
+                row["id"]: tuple(row[column] for column in SUB_DEVICE_COLUMNS) for row in cursor.fetchall()
+            }
+        sub_inserts, sub_updates, sub_deletes = diff_child_rows(existing_sub_devices, [
+            (_row_key(item.get("id")), sub_device_values(item)) for item in sub_devices
+        ])
+        if sub_deletes:
+            cursor.execute(f"DELETE FROM sub_device WHERE id IN ({_placeholders(sub_deletes)})", sub_deletes)
+        if sub_updates:
+            cursor.executemany(f"""
+                UPDATE sub_device SET {", ".join(f"{column} = %s" for column in SUB_DEVICE_COLUMNS)}
+                WHERE id = %s
+            """, [(*values, sub_id) for values, sub_id in sub_updates])
+        insert_rows(cursor, INSERT_SUB_DEVICE_SQL, INSERT_SUB_DEVICE_ROW, [
+            (device_id, *values) for values in sub_inserts  # 상위 device 테이블의 ID
+        ])
+
+
+        # 6) 서비스 정보 수정
         if service_data:
             update_service_query = """
             UPDATE customer_service SET
@@ -585,25 +800,34 @@ def update_customer(id):
             ))
 
 
-        # 8) 기존 이슈 정보 삭제 및 새로 추가
-        delete_issue_query = "DELETE FROM customer_issue WHERE customer_id = %s"
-        cursor.execute(delete_issue_query, (customer_id,))
-
-        if issue_list:
-            insert_issue_query = """
-            INSERT INTO customer_issue (
-                customer_id, issue_date, operator, detail, created_at
-            ) VALUES (%s, %s, %s, %s, NOW())
-            """
-            for issue in issue_list:
-                cursor.execute(insert_issue_query, (
-                    customer_id,
-                    issue.get("issue_date"),
-                    issue.get("operator_id"),
-                    issue.get("detail")
-                ))
+        # 7) 이슈 정보 반영 - 일시는 조회 응답과 같은 형식으로 비교
+        cursor.execute("""
+            SELECT id, DATE_FORMAT(issue_date, '%%Y-%%m-%%dT%%H:%%i') AS issue_date, operator, detail
+              FROM customer_issue WHERE customer_id = %s FOR UPDATE
+        """, (customer_id,))
+        existing_issues = {
+            row["id"]: (row["issue_date"], row["operator"], row["detail"]) for row in cursor.fetchall()
+        }
+        issue_inserts, issue_updates, issue_deletes = diff_child_rows(existing_issues, [
+            (_row_key(issue.get("id")), issue_values(issue)) for issue in issue_list
+        ])
+        if issue_deletes:
+            cursor.execute(
+                f"DELETE FROM customer_issue WHERE customer_id = %s AND id IN ({_placeholders(issue_deletes)})",
+                (customer_id, *issue_deletes),
+            )
+        if issue_updates:
+            cursor.executemany("""
+                UPDATE customer_issue SET issue_date = %s, operator = %s, detail = %s
+                WHERE customer_id = %s AND id = %s
+            """, [(*values, customer_id, issue_id) for values, issue_id in issue_updates])
+        insert_rows(cursor, INSERT_ISSUE_SQL, INSERT_ISSUE_ROW, [
+            (customer_id, *values) for values in issue_inserts
+        ])
 
         conn.commit()
+        customer_cache.invalidate(customer_id)
+        autocomplete.changed("customers", customer_id)  # 🔎 자동완성 색인 갱신
         return jsonify({"message": "고객 정보 수정 성공"}), 200
 
     except pymysql.MySQLError as e:
@@ -613,7 +837,6 @@ def update_customer(id):
 
     finally:
         cursor.close()
-        conn.close()
 
 
 # 🔥 고객 정보 삭제 API
@@ -624,7 +847,7 @@ def delete_customer(customerId):
     """
     logging.info(f"고객 삭제 요청 - ID: {customerId}")
 
-    conn = get_db_connection()
+    conn = get_db()
     cursor = conn.cursor()
 
     try:
@@ -656,6 +879,8 @@ def delete_customer(customerId):
             return jsonify({"error": "해당 ID의 고객이 없습니다."}), 404
 
         conn.commit()
+        customer_cache.invalidate(customerId)
+        autocomplete.changed("customers", customerId)  # 🔎 자동완성 색인 갱신
         return jsonify({"message": "고객 및 관련 데이터가 삭제되었습니다.", "customerId": customerId}), 200
 
     except pymysql.MySQLError as e:
@@ -665,14 +890,19 @@ def delete_customer(customerId):
 
     finally:
         cursor.close()
-        conn.close()
 
 
 
 
+# 🔥 고객 상세 캐시 통계 (적중률 확인용)
+@customers_bp.route('/customer_cache_metrics', methods=['GET'])
+def get_customer_cache_metrics():
+    return jsonify(customer_cache.metrics()), 200
+
+
 @customers_bp.route('/customers/<int:customer_id>/managers', methods=['GET'])
 def get_customer_managers(customer_id):
-    conn = get_db_connection()
+    conn = get_db()
     try:
         with conn.cursor() as cursor:
             sql = """
@@ -694,5 +924,3 @@ def get_customer_managers(customer_id):
     except Exception as e:
         logging.error(f"담당자 목록 조회 중 오류 발생: {e}")
         return jsonify({"success": False, "error": str(e)}), 500
-    finally:
-        conn.close()
@@ -1,7 +1,10 @@
 from flask import Blueprint, request, jsonify, current_app
 from flask_mail import Message
 import logging #로그 남기기
-from extensions import mail  # ✅ 이렇게!
+from extensions import mail_queue  # ✅ 이렇게!
+from mailer.queue import MailQueueFullError
+from mailer.mime import StreamAttachment
+from models.database import get_db
 import pdb
 from datetime import datetime
 
@@ -22,8 +25,66 @@ def require_token_for_user_bp():
 
 PDF_OUTPUT_PATH = '/usr/local/flask/yeji/groupware-api/temp'
 
+# 📌 첨부파일 크기 제한
+MAX_ATTACHMENT_BYTES = 20 * 1024 * 1024      # 첨부파일 1개 최대 크기
+MAX_TOTAL_ATTACHMENT_BYTES = 25 * 1024 * 1024  # 메일 1통 첨부파일 합계 최대 크기
+
+
+def _size_text(size):
+    return f"{size / 1024 / 1024:.0f}MB"
+
+
+def collect_attachments(uploads, file_ids):
+    """
+    업로드 파일 + files 테이블의 file_id → StreamAttachment 목록
+    - 내용은 읽지 않고 크기만 확인 (제한 초과 시 ValueError)
+    - file_id 로 지정한 파일은 다시 업로드하지 않고 서버 디스크에서 바로 읽음
+    """
+    attachments = []
+    try:
+        for file in uploads:
+            if not file.filename:
+                continue
+            attachments.append(StreamAttachment.from_upload(file))
+            logging.info(f"사용자 업로드 첨부파일: {file.filename}")
+
+        if file_ids:
+            placeholders = ", ".join(["%s"] * len(file_ids))
+            cursor = get_db().cursor()
+            cursor.execute(f"""
+                SELECT file_id, file_name, file_path FROM files WHERE file_id IN ({placeholders})
+            """, file_ids)
+            rows = {row["file_id"]: row for row in cursor.fetchall()}
+            cursor.close()
+
+            for file_id in file_ids:
+                row = rows.get(file_id)
+                if row is None or not os.path.exists(row["file_path"]):
+                    raise FileNotFoundError(f"첨부할 파일을 찾을 수 없습니다: {file_id}")
+                attachments.append(StreamAttachment.from_path(
+                    row["file_name"], row["file_path"], os.path.getsize(row["file_path"])))
+                logging.info(f"저장된 파일 첨부: {row['file_name']} (file_id={file_id})")
+
+        total = 0
+        for attachment in attachments:
+            if attachment.size > MAX_ATTACHMENT_BYTES:
+                raise ValueError(f"첨부파일은 1개당 {_size_text(MAX_ATTACHMENT_BYTES)}를 넘을 수 없습니다: {attachment.filename}")
+            total += attachment.size
+        if total > MAX_TOTAL_ATTACHMENT_BYTES:
+            raise ValueError(f"첨부파일 합계는 {_size_text(MAX_TOTAL_ATTACHMENT_BYTES)}를 넘을 수 없습니다.")
+    except Exception:
+        for attachment in attachments:
+            attachment.close()
+        raise
+    return attachments
+
 @email_bp.route('/send_email', methods=['POST'])
 def send_email():
+    # ✅ 요청 전체 크기 먼저 확인 (첨부파일을 읽기 전에 거절)
+    if request.content_length and request.content_length > MAX_TOTAL_ATTACHMENT_BYTES + 1024 * 1024:
+        return jsonify({'error': f'첨부파일 합계는 {_size_text(MAX_TOTAL_ATTACHMENT_BYTES)}를 넘을 수 없습니다.'}), 413
+
+    attachments = []
     try:
         # 📌 요청 데이터
         to = request.form.get('to')
@@ -54,13 +115,18 @@ def send_email():
             file.filename for file in request.files.getlist('attachments')
         ] if 'attachments' in request.files else []
 
-        # 📎 1. 프론트에서 직접 업로드한 첨부파일 추가
-        if 'attachments' in request.files:
-            for file in request.files.getlist('attachments'):
-                file_content = file.read()
-                content_type = file.content_type or "application/octet-stream"
-                msg.attach(file.filename, content_type, file_content)
-                logging.info(f"사용자 업로드 첨부파일: {file.filename}")
+        # 📎 1. 프론트에서 직접 업로드한 첨부파일 + 이미 업로드된 파일(file_id) 추가
+        #       내용은 여기서 읽지 않고, 큐 등록 시 조금씩 읽어 인코딩 (큰 파일은 디스크에 보관)
+        file_ids = [
+            int(file_id) for value in request.form.getlist('fileIds')
+            for file_id in value.split(',') if file_id.strip().isdigit()
+        ]
+        try:
+            attachments = collect_attachments(request.files.getlist('attachments'), file_ids)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 413
+        except FileNotFoundError as e:
+            return jsonify({'error': str(e)}), 404
 
         # # 📎 2. 서버에서 PDF 자동 첨부 (중복되지 않은 경우만)
         # if doc_type and doc_id:
@@ -100,13 +166,19 @@ def send_email():
         #     else:
         #         logging.warning(f"Excel 파일 없음: {pattern_prefix}*.xlsx")
 
-        # ✅ 이메일 전송
-        logging.info("이메일 전송 중...")
-        mail.send(msg)
-        logging.info("이메일 전송 완료!")
+        # ✅ 이메일 발송 큐 등록 (SMTP 전송은 백그라운드에서)
+        message_id = mail_queue.send(msg, attachments)
+        logging.info(f"이메일 발송 큐 등록 완료: {message_id}")
 
-        return jsonify({'status': 'ok'}), 200
+        return jsonify({'status': 'ok', 'messageId': message_id}), 200
+
+    except MailQueueFullError as e:
+        return jsonify({'error': str(e)}), 503
 
     except Exception as e:
         logging.exception("이메일 전송 실패")
-        return jsonify({'error': str(e)}), 500
\ No newline at end of file
+        return jsonify({'error': str(e)}), 500
+
+    finally:
+        for attachment in attachments:
+            attachment.close()
\ No newline at end of file
@@ -1,6 +1,8 @@
 from flask import Blueprint, request, jsonify
 import pymysql
-from models.database import get_db_connection
+from models.database import get_db_connection, get_db
+from models.pagination import Pagination
+from models.streaming import get_stream_format, stream_query
 import logging
 import json
 from decimal import Decimal
@@ -207,15 +209,20 @@ def get_estimates():
     sales_nm = request.args.get('salesNmQuery', '')
     status = request.args.get('statusQuery', '')
 
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    try:
+        pagination = Pagination([("e.id", "id", "DESC")])
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+
+    stream_format = get_stream_format()
+    cursor = get_db().cursor()
 
     logging.info("=== [GET] /api/estimates 요청 수신 ===")
     try:
         # 견적서 목록 조회 쿼리
         sql = """
         SELECT 
-            DATE_FORMAT(e.valid_until, '%Y-%m-%d') AS valid_until,
+            DATE_FORMAT(e.valid_until, '%%Y-%%m-%%d') AS valid_until,
             e.*,
             c.customer_nm,
             u.name AS sales_nm
@@ -229,27 +236,46 @@ def get_estimates():
             WHERE quote_id = e.quote_id
         )
         """
+        params = []
         if customer_nm:
-            sql += f" AND c.customer_nm LIKE '%{customer_nm}%'"
+            sql += " AND c.customer_nm LIKE %s"
+            params.append(f"%{customer_nm}%")
         if quote_title:
-            sql += f" AND e.quote_title LIKE '%{quote_title}%'"
+            sql += " AND e.quote_title LIKE %s"
+            params.append(f"%{quote_title}%")
         if quote_id:
-            sql += f" AND e.quote_id LIKE '%{quote_id}%'"
+            sql += " AND e.quote_id LIKE %s"
+            params.append(f"%{quote_id}%")
         if sales_nm:
-            sql += f" AND u.name LIKE '%{sales_nm}%'"
+            sql += " AND u.name LIKE %s"
+            params.append(f"%{sales_nm}%")
         if status:
-            sql += f" AND e.remarks LIKE '%{status}%'"
+            sql += " AND e.remarks LIKE %s"
+            params.append(f"%{status}%")
 
-        sql += f" ORDER BY e.id DESC"
+        # 전체 덤프(BI 연동 등) - ?stream=ndjson|json 이면 페이징 없이 한 줄씩 전송
+        if stream_format:
+            return stream_query(sql + " ORDER BY e.id DESC", params, stream_format)
+
+        # 페이징
+        cursor_sql, cursor_params = pagination.where()
+        sql += cursor_sql
+        params.extend(cursor_params)
+
+        order_sql, order_params = pagination.order_limit()
+        sql += order_sql
+        params.extend(order_params)
 
         logging.info(sql);
-        cursor.execute(sql)
-        estimates = cursor.fetchall()
+        cursor.execute(sql, params)
+        estimates, page_info = pagination.result(cursor.fetchall())
 
-        return jsonify({"estimates": estimates})
+        return jsonify({"estimates": estimates, "pagination": page_info})
     except Exception as e:
         logging.error(f"DB Error (견적 조회): {e}")
         return jsonify({"success": False, "error": str(e)}), 500
+    finally:
+        cursor.close()
 
 
 
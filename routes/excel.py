@@ -1,14 +1,26 @@
-from flask import Blueprint, send_file
-from openpyxl import load_workbook
-from openpyxl.utils import range_boundaries
+from flask import Blueprint, send_file, request, jsonify
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill
 import io
-from datetime import datetime
-from models.database import get_db_connection
+from datetime import datetime, timedelta
+from models.database import get_db
+from excel.templates import WorkbookTemplate
+from excel.merged import MergedCellIndex
 import os
 from openpyxl.drawing.image import Image
 
 excel_bp = Blueprint('excel', __name__)
 
+# 📌 엑셀 템플릿 (한 번만 파싱, 요청마다 복사본 사용)
+EXCEL_TEMPLATE_DIR = os.path.join(os.getcwd(), "templates")
+estimate_template = WorkbookTemplate(os.path.join(EXCEL_TEMPLATE_DIR, "estimate_execl_template.xlsx"))
+excel_bp.record_once(lambda state: estimate_template.warm_up())
+
+# 📌 일괄 내보내기 설정
+BULK_EXPORT_MAX = 10000   # 한 번에 내보낼 수 있는 최대 견적서 수
+BULK_QUERY_CHUNK = 1000   # IN (...) 한 번에 넣는 id 수
+
 from auth.decorators import require_token
 
 # @excel_bp.before_request
@@ -30,25 +42,16 @@ def number_to_korean(num):
         i += 1
     return "일금" + result + "원정 (VAT포함)"
 
-# 병합 셀 안전하게 쓰기
-def write_to_merged_auto(ws, target_cell, value):
-    for merged_range in ws.merged_cells.ranges:
-        if target_cell in merged_range:
-            min_col, min_row, max_col, max_row = range_boundaries(str(merged_range))
-            ws.unmerge_cells(str(merged_range))
-            ws.cell(row=min_row, column=min_col, value=value)
-            ws.merge_cells(start_row=min_row, start_column=min_col, end_row=max_row, end_column=max_col)
-            return
-    ws[target_cell] = value
-
-def write_and_merge(ws, start_cell, end_cell, value):
-    ws.merge_cells(f"{start_cell}:{end_cell}")
-    ws[start_cell] = value
+# 병합 셀 안전하게 쓰기 (merged: MergedCellIndex)
+def write_to_merged_auto(merged, target_cell, value):
+    merged.write(target_cell, value)
+
+def write_and_merge(merged, start_cell, end_cell, value):
+    merged.merge(start_cell, end_cell, value)
 
 @excel_bp.route('/api/export_excel/<int:estimate_id>', methods=['GET'])
 def export_estimate_excel(estimate_id):
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    cursor = get_db().cursor()
 
     # 1. 견적서 및 고객, 담당자 정보 조회
     sql = """
@@ -64,6 +67,7 @@ def export_estimate_excel(estimate_id):
     cursor.execute(sql, (estimate_id,))
     estimate = cursor.fetchone()
     if not estimate:
+        cursor.close()
         return {'error': '견적서를 찾을 수 없습니다.'}, 404
 
     # 2. 제품 목록 조회
@@ -93,21 +97,19 @@ def export_estimate_excel(estimate_id):
     references = cursor.fetchall()
 
     cursor.close()
-    conn.close()
 
-    # 4. 엑셀 템플릿 불러오기
-    EXCEL_TEMPLATE_DIR = os.path.join(os.getcwd(), "templates")
-    template_path = os.path.join(EXCEL_TEMPLATE_DIR, "estimate_execl_template.xlsx")
-    wb = load_workbook(template_path)
+    # 4. 엑셀 템플릿 불러오기 (캐시된 원본의 복사본)
+    wb = estimate_template.clone()
     ws = wb.active
+    merged = MergedCellIndex(ws)  # 병합 셀 색인 (시트당 1회 생성)
 
     # 5. 상단 정보 입력
-    write_to_merged_auto(ws, "B6", "(주) " + estimate["customer_nm"])
-    write_to_merged_auto(ws, "H5", datetime.today().strftime("%Y년 %m월 %d일"))
+    write_to_merged_auto(merged, "B6", "(주) " + estimate["customer_nm"])
+    write_to_merged_auto(merged, "H5", datetime.today().strftime("%Y년 %m월 %d일"))
     reference_names = ", ".join([ref["manager_name"] for ref in references])
-    write_to_merged_auto(ws, "C7", reference_names + " 님")
-    write_to_merged_auto(ws, "C8", estimate["quote_title"])
-    write_to_merged_auto(ws, "B11", number_to_korean(int(estimate["total_price_with_vat"])))
+    write_to_merged_auto(merged, "C7", reference_names + " 님")
+    write_to_merged_auto(merged, "C8", estimate["quote_title"])
+    write_to_merged_auto(merged, "B11", number_to_korean(int(estimate["total_price_with_vat"])))
 
     # 6. 제품 리스트 입력 (최대 30줄)
     start_row = 13
@@ -125,43 +127,43 @@ def export_estimate_excel(estimate_id):
         ws.cell(row=row, column=8, value=item["total_price"])
 
     if actual_product_rows < max_product_rows:
-        ws.delete_rows(start_row + actual_product_rows, max_product_rows - actual_product_rows)
+        merged.delete_rows(start_row + actual_product_rows, max_product_rows - actual_product_rows)
 
     # 7. 합계 정보 삽입
     summary_start_row = start_row + len(products)
 
-    write_and_merge(ws, f"B{summary_start_row}", f"F{summary_start_row}", "합        계")
-    write_and_merge(ws, f"G{summary_start_row}", f"H{summary_start_row}", "₩" + str(estimate["total_price_before_vat"])) # 합        계
+    write_and_merge(merged, f"B{summary_start_row}", f"F{summary_start_row}", "합        계")
+    write_and_merge(merged, f"G{summary_start_row}", f"H{summary_start_row}", "₩" + str(estimate["total_price_before_vat"])) # 합        계
 
-    write_and_merge(ws, f"B{summary_start_row + 1}", f"F{summary_start_row + 1}", "부   가   세")
-    write_and_merge(ws, f"G{summary_start_row + 1}", f"H{summary_start_row + 1}", "₩" + str(estimate["vat"])) # 부   가   세
+    write_and_merge(merged, f"B{summary_start_row + 1}", f"F{summary_start_row + 1}", "부   가   세")
+    write_and_merge(merged, f"G{summary_start_row + 1}", f"H{summary_start_row + 1}", "₩" + str(estimate["vat"])) # 부   가   세
 
-    write_and_merge(ws, f"B{summary_start_row + 2}", f"F{summary_start_row + 2}", "총   합   계 (VAT포함)")
-    write_and_merge(ws, f"G{summary_start_row + 2}", f"H{summary_start_row + 2}", "₩" + str(estimate["total_price_with_vat"])) # 총   합   계 (VAT포함)
+    write_and_merge(merged, f"B{summary_start_row + 2}", f"F{summary_start_row + 2}", "총   합   계 (VAT포함)")
+    write_and_merge(merged, f"G{summary_start_row + 2}", f"H{summary_start_row + 2}", "₩" + str(estimate["total_price_with_vat"])) # 총   합   계 (VAT포함)
 
     # 하단 정보 입력
-    write_and_merge(ws, f"E{summary_start_row + 3}", f"H{summary_start_row + 3}", "구매자확인")
-    write_and_merge(ws, f"E{summary_start_row + 4}", f"H{summary_start_row + 4}", "당사는 이 견적서상의 가격 및 조건들을 수용하고 이 견적서를 발주서로 대신합니다.")
+    write_and_merge(merged, f"E{summary_start_row + 3}", f"H{summary_start_row + 3}", "구매자확인")
+    write_and_merge(merged, f"E{summary_start_row + 4}", f"H{summary_start_row + 4}", "당사는 이 견적서상의 가격 및 조건들을 수용하고 이 견적서를 발주서로 대신합니다.")
     
-    write_and_merge(ws, f"E{summary_start_row + 5}", f"F{summary_start_row + 5}", "회사명")
-    write_and_merge(ws, f"G{summary_start_row + 5}", f"H{summary_start_row + 5}", "")
+    write_and_merge(merged, f"E{summary_start_row + 5}", f"F{summary_start_row + 5}", "회사명")
+    write_and_merge(merged, f"G{summary_start_row + 5}", f"H{summary_start_row + 5}", "")
 
-    write_and_merge(ws, f"E{summary_start_row + 6}", f"F{summary_start_row + 6}", "발주담당자")
-    write_and_merge(ws, f"G{summary_start_row + 6}", f"H{summary_start_row + 6}", "")
+    write_and_merge(merged, f"E{summary_start_row + 6}", f"F{summary_start_row + 6}", "발주담당자")
+    write_and_merge(merged, f"G{summary_start_row + 6}", f"H{summary_start_row + 6}", "")
 
-    write_and_merge(ws, f"E{summary_start_row + 7}", f"F{summary_start_row + 7}", "배송주소지")
-    write_and_merge(ws, f"G{summary_start_row + 7}", f"H{summary_start_row + 7}", "")
-    write_and_merge(ws, f"E{summary_start_row + 8}", f"F{summary_start_row + 8}", "대표 / 신청인")
-    write_and_merge(ws, f"G{summary_start_row + 8}", f"H{summary_start_row + 8}", "                /                 (인)")
+    write_and_merge(merged, f"E{summary_start_row + 7}", f"F{summary_start_row + 7}", "배송주소지")
+    write_and_merge(merged, f"G{summary_start_row + 7}", f"H{summary_start_row + 7}", "")
+    write_and_merge(merged, f"E{summary_start_row + 8}", f"F{summary_start_row + 8}", "대표 / 신청인")
+    write_and_merge(merged, f"G{summary_start_row + 8}", f"H{summary_start_row + 8}", "                /                 (인)")
 
 
 
-    write_and_merge(ws, f"C{summary_start_row + 3}", f"D{summary_start_row + 3}", estimate["valid_until"]) # 견적유효기간
-    write_and_merge(ws, f"C{summary_start_row + 4}", f"D{summary_start_row + 4}", estimate["delivery_condition"]) # 납기
-    write_and_merge(ws, f"C{summary_start_row + 5}", f"D{summary_start_row + 5}", estimate["payment_condition"]) # 결제조건
-    write_and_merge(ws, f"C{summary_start_row + 6}", f"D{summary_start_row + 6}", estimate["payment_condition"]) # 하자보증기간
-    write_and_merge(ws, f"C{summary_start_row + 7}", f"D{summary_start_row + 7}", f"{estimate['name']} / {estimate['position']} / {estimate['phone']} / {estimate['email']}") # 영업담당
-    write_and_merge(ws, f"C{summary_start_row + 8}", f"D{summary_start_row + 8}", estimate["remarks"]) # 특이사항
+    write_and_merge(merged, f"C{summary_start_row + 3}", f"D{summary_start_row + 3}", estimate["valid_until"]) # 견적유효기간
+    write_and_merge(merged, f"C{summary_start_row + 4}", f"D{summary_start_row + 4}", estimate["delivery_condition"]) # 납기
+    write_and_merge(merged, f"C{summary_start_row + 5}", f"D{summary_start_row + 5}", estimate["payment_condition"]) # 결제조건
+    write_and_merge(merged, f"C{summary_start_row + 6}", f"D{summary_start_row + 6}", estimate["payment_condition"]) # 하자보증기간
+    write_and_merge(merged, f"C{summary_start_row + 7}", f"D{summary_start_row + 7}", f"{estimate['name']} / {estimate['position']} / {estimate['phone']} / {estimate['email']}") # 영업담당
+    write_and_merge(merged, f"C{summary_start_row + 8}", f"D{summary_start_row + 8}", estimate["remarks"]) # 특이사항
 
 
 
@@ -174,21 +176,189 @@ def export_estimate_excel(estimate_id):
     ws.print_area = f"A1:H{print_end_row}"
 
 
-    # 8. 메모리에 저장 후 반환
-    # output = io.BytesIO()
-    # wb.save(output)
-    # output.seek(0)
-
-    # 🔥 실제 파일 경로로 저장
-    filename = f"estimate_{estimate['quote_id']}_{datetime.today().strftime('%Y%m%d_%H%M%S')}.xlsx"
-    file_path = os.path.join("/usr/local/flask/yeji/groupware-api/temp", filename)
-    wb.save(file_path)
+    # 8. 메모리에 저장 후 반환 (임시 파일 없음)
+    output = io.BytesIO()
+    wb.save(output)
+    output.seek(0)
 
     return send_file(
-        #output,
-        file_path,
+        output,
         as_attachment=True,
         download_name = f"견적서_{estimate['quote_id']}_{datetime.today().strftime('%Y%m%d_%H%M%S')}.xlsx",
         mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
     )
 
+
+def _chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _header_row(ws, titles):
+    # write-only 시트는 셀 스타일을 WriteOnlyCell 로만 지정 가능
+    font = Font(bold=True)
+    fill = PatternFill("solid", fgColor="DDEBF7")
+    row = []
+    for title in titles:
+        cell = WriteOnlyCell(ws, value=title)
+        cell.font = font
+        cell.fill = fill
+        row.append(cell)
+    return row
+
+
+@excel_bp.route('/api/export_excel/bulk', methods=['POST'])
+@require_token  # 🔥 블루프린트 전체 인증은 꺼져 있음 → 일괄 내보내기는 토큰 필수
+def export_estimates_bulk():
+    """
+    견적서 일괄 엑셀 내보내기
+    - 요청 JSON 예시:
+      {"ids": [1, 2, 3]}
+      또는 {"startDate": "2025-05-01", "endDate": "2025-05-31", "salesId": "yeji", "customerId": 12}
+    - 조회: 견적서 1번 + 제품/참조자는 IN (...) 으로 묶어서 (BULK_QUERY_CHUNK 건씩)
+    - 결과: '견적 목록'(견적서 1건 = 1행) + '제품 상세'(제품 1개 = 1행) 시트, write-only 모드로 작성
+    """
+    data = request.get_json() or {}
+    ids = data.get('ids') or []
+
+    sql = """
+    SELECT 
+        e.id, e.quote_id, e.version, e.quote_title,
+        DATE_FORMAT(e.created_at, '%%Y-%%m-%%d') AS created_at,
+        DATE_FORMAT(e.valid_until, '%%Y-%%m-%%d') AS valid_until,
+        c.customer_nm, u.name AS sales_nm,
+        e.total_price_before_vat, e.vat, e.total_price_with_vat,
+        e.delivery_condition, e.payment_condition, e.warranty_period, e.remarks
+    FROM estimate e
+    LEFT JOIN customer c ON e.customer_id = c.customer_id
+    LEFT JOIN user u ON e.sales_id = u.usr_id
+    WHERE 1=1
+    """
+    params = []
+
+    if ids:
+        if not isinstance(ids, list) or not all(str(i).isdigit() for i in ids):
+            return jsonify({'error': 'ids 는 견적서 id 목록이어야 합니다.'}), 400
+        if len(ids) > BULK_EXPORT_MAX:
+            return jsonify({'error': f'한 번에 최대 {BULK_EXPORT_MAX}건까지 내보낼 수 있습니다.'}), 400
+        sql += f" AND e.id IN ({', '.join(['%s'] * len(ids))})"
+        params.extend(int(i) for i in ids)
+    else:
+        # 필터 조회는 목록 화면과 같이 견적별 최신 버전만
+        sql += """
+        AND e.version = (
+            SELECT MAX(version) 
+            FROM estimate 
+            WHERE quote_id = e.quote_id
+        )
+        """
+        try:
+            if data.get('startDate'):
+                sql += " AND e.created_at >= %s"
+                params.append(datetime.strptime(data['startDate'], '%Y-%m-%d'))
+            if data.get('endDate'):
+                sql += " AND e.created_at < %s"
+                params.append(datetime.strptime(data['endDate'], '%Y-%m-%d') + timedelta(days=1))
+        except (TypeError, ValueError):
+            return jsonify({'error': '날짜는 YYYY-MM-DD 형식이어야 합니다.'}), 400
+        if data.get('salesId'):
+            sql += " AND e.sales_id = %s"
+            params.append(data['salesId'])
+        if data.get('customerId'):
+            sql += " AND e.customer_id = %s"
+            params.append(data['customerId'])
+
+    sql += " ORDER BY e.id LIMIT %s"
+    params.append(BULK_EXPORT_MAX + 1)
+
+    cursor = get_db().cursor()
+    try:
+        # 1. 견적서 조회
+        cursor.execute(sql, params)
+        estimates = cursor.fetchall()
+        if not estimates:
+            return jsonify({'error': '조건에 맞는 견적서가 없습니다.'}), 404
+        if len(estimates) > BULK_EXPORT_MAX:
+            return jsonify({'error': f'조회 결과가 {BULK_EXPORT_MAX}건을 넘습니다. 조건을 좁혀주세요.'}), 400
+
+        estimate_ids = [row['id'] for row in estimates]
+
+        # 2. 참조자 / 제품 목록 일괄 조회
+        references = {}
+        products = []
+        for chunk in _chunks(estimate_ids, BULK_QUERY_CHUNK):
+            placeholders = ', '.join(['%s'] * len(chunk))
+            cursor.execute(
+                f"SELECT estimate_id, manager_name FROM estimate_reference WHERE estimate_id IN ({placeholders})",
+                chunk,
+            )
+            for row in cursor.fetchall():
+                references.setdefault(row['estimate_id'], []).append(row['manager_name'])
+
+            cursor.execute(f"""
+            SELECT 
+                ep.estimate_id,
+                p.p_name,
+                p.p_description,
+                ep.quantity,
+                p.p_price,
+                ep.unit_price,
+                ep.total_price
+            FROM t_estimate_product ep
+            JOIN t_product_add p ON ep.product_id = p.id
+            WHERE ep.estimate_id IN ({placeholders})
+            ORDER BY ep.estimate_id, ep.id
+            """, chunk)
+            products.extend(cursor.fetchall())
+    finally:
+        cursor.close()
+
+    # 3. 엑셀 작성 (write-only: 행을 바로 기록하고 셀 객체를 메모리에 들고 있지 않음)
+    wb = Workbook(write_only=True)
+
+    ws_summary = wb.create_sheet("견적 목록")
+    for column, width in zip("ABCDEFGHIJKLMNOP", (8, 20, 6, 36, 12, 12, 24, 10, 24, 16, 14, 16, 16, 16, 16, 30)):
+        ws_summary.column_dimensions[column].width = width
+    ws_summary.freeze_panes = "A2"
+    ws_summary.append(_header_row(ws_summary, [
+        "ID", "견적번호", "버전", "견적명", "작성일", "유효기간", "고객사", "영업담당", "참조자",
+        "공급가액", "부가세", "합계(VAT포함)", "납기", "결제조건", "하자보증기간", "비고",
+    ]))
+    quote_ids = {}
+    for e in estimates:
+        quote_ids[e['id']] = e['quote_id']
+        ws_summary.append([
+            e['id'], e['quote_id'], e['version'], e['quote_title'], e['created_at'], e['valid_until'],
+            e['customer_nm'], e['sales_nm'], ", ".join(references.get(e['id'], [])),
+            e['total_price_before_vat'], e['vat'], e['total_price_with_vat'],
+            e['delivery_condition'], e['payment_condition'], e['warranty_period'], e['remarks'],
+        ])
+
+    ws_items = wb.create_sheet("제품 상세")
+    for column, width in zip("ABCDEFGHI", (8, 20, 6, 30, 40, 8, 14, 14, 16)):
+        ws_items.column_dimensions[column].width = width
+    ws_items.freeze_panes = "A2"
+    ws_items.append(_header_row(ws_items, [
+        "견적 ID", "견적번호", "No", "제품명", "설명", "수량", "정가", "단가", "금액",
+    ]))
+    line_no = 0
+    previous_id = None
+    for item in products:
+        line_no = line_no + 1 if item['estimate_id'] == previous_id else 1
+        previous_id = item['estimate_id']
+        ws_items.append([
+            item['estimate_id'], quote_ids.get(item['estimate_id']), line_no,
+            item['p_name'], item['p_description'], item['quantity'],
+            item['p_price'], item['unit_price'], item['total_price'],
+        ])
+
+    output = io.BytesIO()
+    wb.save(output)
+    output.seek(0)
+
+    return send_file(
+        output,
+        as_attachment=True,
+        download_name=f"견적서_일괄_{len(estimates)}건_{datetime.today().strftime('%Y%m%d_%H%M%S')}.xlsx",
+        mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    )
@@ -1,12 +1,19 @@
 import os
 import logging
 import re  # 🔥 정규 표현식 모듈 추가
-from flask import Blueprint, request, jsonify, send_from_directory
+from flask import Blueprint, request, jsonify, send_from_directory, send_file, Response
 from werkzeug.utils import secure_filename
-from models.database import get_db_connection
+from models.database import get_db_connection, get_db
 import pdb  # Python Debugger
+import io
+import time
 import uuid
+import zipfile
+import mimetypes
 from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor
+from storage.uploads import ChunkedUploads, UploadError, CHUNK_SIZE
+from storage.blobs import BlobStore
 
 # 📌 Blueprint 생성
 files_bp = Blueprint('files', __name__)
@@ -25,6 +32,25 @@ UPLOAD_FOLDER = os.path.join(BASE_DIR, 'uploads')
 if not os.path.exists(UPLOAD_FOLDER):
     os.makedirs(UPLOAD_FOLDER)
 
+# 📌 업로드 파일 디스크 저장용 스레드 풀 (여러 파일을 동시에 기록)
+UPLOAD_SAVE_WORKERS = 4
+upload_executor = ThreadPoolExecutor(max_workers=UPLOAD_SAVE_WORKERS, thread_name_prefix='upload-save')
+
+# 📌 다운로드 설정
+FILES_CACHE_MAX_AGE = 24 * 60 * 60  # 브라우저 캐시 시간(초) - 지나면 ETag 로 재검증 (변경 없으면 304)
+# 브라우저에서 바로 열어도(inline) 되는 형식 - html/svg 등 스크립트가 실행될 수 있는 형식은 항상 다운로드
+FILES_INLINE_MIMETYPES = {"application/pdf", "image/png", "image/jpeg", "image/gif", "image/webp", "image/bmp"}
+# nginx 의 internal location 을 쓰면 파일 전송을 nginx 에 넘김 (예: '/protected-uploads/')
+#   location /protected-uploads/ { internal; alias <UPLOAD_FOLDER>/; }
+# Apache/lighttpd 는 app.config['USE_X_SENDFILE'] = True 로 send_file 이 X-Sendfile 사용
+FILES_ACCEL_REDIRECT = None
+
+# 📌 분할(이어받기) 업로드 스테이징 - 완료 시 하드링크로 blob 에 넣도록 업로드 폴더 안에 둠
+chunked_uploads = ChunkedUploads(os.path.join(UPLOAD_FOLDER, '.staging'))
+
+# 📌 첨부파일 저장소 - 내용(sha256) 기준으로 한 번만 저장, files 행 수만큼 참조
+blob_store = BlobStore(UPLOAD_FOLDER, get_db_connection, temp_dir=chunked_uploads.staging_dir)
+
 # 📌 한글 파일명을 유지하는 secure_filename 함수
 def custom_secure_filename(filename):
     filename = filename.strip().replace(" ", "_")  # 공백을 _로 변환
@@ -40,78 +66,246 @@ def custom_secure_filename(filename):
 # 파일 업로드
 @files_bp.route('/upload', methods=['POST'])
 def upload_file():
+    """
+    파일 업로드 (여러 개)
+    - 임시 파일 저장(+ sha256 계산)은 스레드 풀에서 병렬로
+    - 같은 내용의 파일이 이미 있으면 새로 저장하지 않고 참조만 추가 (blob_store)
+    - file_seq 는 트랜잭션 안에서 잠금(FOR UPDATE) 후 한 번에 할당 → 동시 업로드에도 중복 없음
+    - files 행은 executemany 한 번으로 저장
+    """
     logging.info("🔥 파일 업로드 요청 도착!")
 
     files = request.files.getlist('file')
     untyFileNo = request.form.get("untyFileNo")  # FormData에서 가져오기
 
     logging.info("받아온 통합첨부파일 == " + str(untyFileNo))
-    max_file_seq = 1
-    isNew = False
-    unty_file_no = None
 
     if not untyFileNo or untyFileNo == "null":
         logging.info("📌 새로운 untyFileNo 생성")
         unty_file_no = str(uuid.uuid4())
-        isNew = True
     else:
         unty_file_no = untyFileNo
-        isNew = False
 
     if not files or len(files) == 0:
         logging.error("🚨 업로드된 파일이 없습니다.")
         return jsonify({"error": "No files uploaded"}), 400
 
-    for file in files:
-        if file.filename == '':
-            logging.error("🚨 선택된 파일의 이름이 없습니다.")
-            return jsonify({"error": "Invalid file name"}), 400
+    if any(file.filename == '' for file in files):
+        logging.error("🚨 선택된 파일의 이름이 없습니다.")
+        return jsonify({"error": "Invalid file name"}), 400
 
-        # 🔥 원본 파일명 저장용 (한글 포함됨)
-        original_name = file.filename
+    # 1) 임시 파일로 저장 (병렬) - 저장하면서 sha256 계산 (🔥 원본 파일명은 DB 에, 디스크에는 내용 해시로)
+    futures = [upload_executor.submit(blob_store.write_temp, file.stream) for file in files]
+    temps, errors = [], []
+    for future in futures:
+        try:
+            temps.append(future.result())
+        except Exception as e:
+            errors.append(e)
+    if errors:
+        logging.error(f"🚨 파일 저장 중 오류 발생: {errors[0]}")
+        _remove_files(tmp_path for tmp_path, _, _ in temps)
+        return jsonify({"error": "File save failed", "details": str(errors[0])}), 500
+    logging.info(f"📁 임시 저장 완료: {len(temps)}개")
+
+    # 2) blob 등록 + DB에 파일 정보 저장 (한 트랜잭션)
+    conn = get_db()
+    cursor = conn.cursor()
+    try:
+        rows = []
+        for file, (tmp_path, sha256, size) in zip(files, temps):
+            storage_name = blob_store.put(cursor, tmp_path, sha256, size)
+            rows.append((file.filename, storage_name, blob_store.path(storage_name)))
+        insert_file_rows(cursor, unty_file_no, rows)
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        logging.exception("🚨 파일 정보 저장 중 오류 발생")
+        return jsonify({"error": "File save failed", "details": str(e)}), 500
+    finally:
+        cursor.close()
+        _remove_files(tmp_path for tmp_path, _, _ in temps)
 
-        # 🔧 확장자 추출
-        _, ext = os.path.splitext(original_name)
-        if not ext:
-            logging.warning("❗ 확장자 없는 파일")
-            ext = ""  # 확장자 없는 파일도 허용
+    return jsonify({"message": "Files uploaded successfully", "untyFileNo": unty_file_no})
 
-        # ✅ 안전한 UUID 기반 파일명 생성 (확장자 유지)
-        unique_filename = f"{str(uuid.uuid4())}{ext}"
-        file_path = os.path.join(UPLOAD_FOLDER, unique_filename)
 
-        # 업로드 폴더 없으면 생성
-        os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+def insert_file_rows(cursor, unty_file_no, rows):
+    """
+    files 행 일괄 저장 (rows: [(file_name, unique_file_name, file_path), ...])
+    - 번호는 file_groups 의 그룹별 마지막 번호 행에서 할당 (migrations/003_file_groups.sql)
+      INSERT ... ON DUPLICATE KEY UPDATE 로 그 행 하나만 잠금 → 커밋까지 같은 그룹의 다른 업로드는 대기
+      (빈 그룹에 SELECT ... FOR UPDATE 를 하면 gap lock 이 잡혀 처음 올리는 업로드끼리 교착될 수 있음)
+    - 반환: 첫 번째 행의 file_id
+    """
+    cursor.execute("""
+        INSERT INTO file_groups (unty_file_no, last_seq) VALUES (%s, %s)
+        ON DUPLICATE KEY UPDATE last_seq = last_seq + VALUES(last_seq)
+    """, (unty_file_no, len(rows)))
+    cursor.execute("SELECT last_seq FROM file_groups WHERE unty_file_no = %s", (unty_file_no,))
+    next_seq = cursor.fetchone()["last_seq"] - len(rows) + 1
+
+    cursor.executemany("""
+        INSERT INTO files (file_name, unique_file_name, file_path, unty_file_no, file_seq)
+        VALUES (%s, %s, %s, %s, %s)
+    """, [
+        (file_name, unique_file_name, file_path, unty_file_no, next_seq + i)
+        for i, (file_name, unique_file_name, file_path) in enumerate(rows)
+    ])
+    return cursor.lastrowid
+
+
+def send_stored_file(file_path, download_name, as_attachment=True):
+    """
+    저장된 파일 전송
+    - 강한 ETag(저장 파일명-크기-수정시각) + Last-Modified → If-None-Match / If-Modified-Since 면 304
+    - Range 요청은 206 부분 응답 (PDF 미리보기, 이어받기)
+    - FILES_ACCEL_REDIRECT 설정 시 본문 전송은 nginx 가 처리 (파이썬 워커는 헤더만)
+    - inline 은 FILES_INLINE_MIMETYPES(pdf/이미지)만, 나머지는 attachment 로 전송 + nosniff
+      (업로드한 사람이 정한 파일명으로 형식을 추측하므로 .html/.svg 가 API 도메인에서 열리지 않도록)
+    """
+    st = os.stat(file_path)
+    etag = f"{os.path.basename(file_path)}-{st.st_size:x}-{st.st_mtime_ns:x}"
+    mimetype = "application/octet-stream"
+    if not as_attachment:
+        guessed = mimetypes.guess_type(download_name)[0]
+        if guessed in FILES_INLINE_MIMETYPES:
+            mimetype = guessed
+        else:
+            as_attachment = True
+
+    if FILES_ACCEL_REDIRECT:
+        relative_path = os.path.relpath(file_path, UPLOAD_FOLDER)
+        response = Response(mimetype=mimetype)
+        response.headers["X-Accel-Redirect"] = FILES_ACCEL_REDIRECT + quote(relative_path)
+        response.set_etag(etag)
+        response.last_modified = st.st_mtime
+        response.make_conditional(request)
+    else:
+        response = send_file(
+            file_path,
+            mimetype=mimetype,
+            conditional=True,  # Range / If-None-Match / If-Modified-Since 처리
+            etag=etag,
+            last_modified=st.st_mtime,
+            max_age=FILES_CACHE_MAX_AGE,
+        )
 
-        # 실제 파일 저장
+    # 로그인한 사용자 전용 파일이므로 공유 캐시(프록시)에는 저장하지 않음
+    response.headers["Cache-Control"] = f"private, max-age={FILES_CACHE_MAX_AGE}"
+    response.headers["X-Content-Type-Options"] = "nosniff"  # 브라우저가 내용을 보고 형식을 바꾸지 않도록
+
+    # ❌ filename="..." 생략하고
+    # ✅ filename*=UTF-8''만 사용
+    disposition = "attachment" if as_attachment else "inline"
+    response.headers["Content-Disposition"] = f"{disposition}; filename*=UTF-8''{quote(download_name)}"
+    return response
+
+
+def _remove_files(paths):
+    for path in paths:
         try:
-            file.save(file_path)
-            logging.info(f"📁 저장 완료: {file_path}")
-        except Exception as e:
-            logging.error(f"🚨 파일 저장 중 오류 발생: {e}")
-            return jsonify({"error": "File save failed", "details": str(e)}), 500
-
-        # DB에 파일 정보 저장
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        if isNew:
-            cursor.execute("""
-                INSERT INTO files (file_name, unique_file_name, file_path, unty_file_no, file_seq)
-                VALUES (%s, %s, %s, %s, %s)
-            """, (original_name, unique_filename, file_path, unty_file_no, max_file_seq))
-        else:
-            cursor.execute("SELECT COALESCE(MAX(file_seq), 1) FROM files WHERE unty_file_no = %s", (unty_file_no,))
-            max_file_seq = cursor.fetchone()["COALESCE(MAX(file_seq), 1)"]
-            cursor.execute("""
-                INSERT INTO files (file_name, unique_file_name, file_path, unty_file_no, file_seq)
-                VALUES (%s, %s, %s, %s, %s)
-            """, (original_name, unique_filename, file_path, unty_file_no, max_file_seq))
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _upload_state_response(state):
+    return {
+        "uploadId": state["uploadId"],
+        "fileName": state["fileName"],
+        "fileSize": state["fileSize"],
+        "offset": state["offset"],
+        "untyFileNo": state.get("untyFileNo"),
+    }
+
+
+def _upload_error(e):
+    return jsonify({"error": str(e), **e.extra}), e.status
+
+
+# 📌 분할(이어받기) 업로드
+#  1) POST   /upload/chunked                       {fileName, fileSize, untyFileNo?, checksum?(sha256)}
+#  2) PUT    /upload/chunked/<uploadId>?offset=N   본문 = 조각 바이트, X-Chunk-Checksum: 조각 sha256 (선택)
+#     GET    /upload/chunked/<uploadId>            끊긴 뒤 받은 offset 확인
+#  3) POST   /upload/chunked/<uploadId>/complete   검증 후 files 에 저장
+#     DELETE /upload/chunked/<uploadId>            취소
+@files_bp.route('/upload/chunked', methods=['POST'])
+def init_chunked_upload():
+    data = request.get_json() or {}
+    unty_file_no = data.get("untyFileNo")
+    if unty_file_no == "null":
+        unty_file_no = None
+
+    try:
+        state = chunked_uploads.init(data.get("fileName"), data.get("fileSize"), unty_file_no, data.get("checksum"))
+    except UploadError as e:
+        return _upload_error(e)
+
+    logging.info(f"📦 분할 업로드 시작: {state['uploadId']} {state['fileName']} ({state['fileSize']} bytes)")
+    return jsonify({**_upload_state_response(state), "chunkSize": CHUNK_SIZE}), 201
+
+
+@files_bp.route('/upload/chunked/<upload_id>', methods=['GET'])
+def get_chunked_upload(upload_id):
+    state = chunked_uploads.get(upload_id)
+    if state is None:
+        return jsonify({"error": "Upload not found"}), 404
+    return jsonify(_upload_state_response(state))
+
 
+@files_bp.route('/upload/chunked/<upload_id>', methods=['PUT'])
+def upload_chunk(upload_id):
+    offset = request.args.get('offset', type=int)
+    if offset is None or offset < 0:
+        return jsonify({"error": "offset 이 필요합니다."}), 400
+
+    try:
+        state = chunked_uploads.write_chunk(
+            upload_id, offset, request.stream, request.content_length,
+            checksum=request.headers.get('X-Chunk-Checksum'),
+        )
+    except UploadError as e:
+        return _upload_error(e)
+    return jsonify(_upload_state_response(state))
+
+
+@files_bp.route('/upload/chunked/<upload_id>/complete', methods=['POST'])
+def complete_chunked_upload(upload_id):
+    try:
+        state = chunked_uploads.verify(upload_id)
+    except UploadError as e:
+        return _upload_error(e)
+
+    unty_file_no = state.get("untyFileNo")
+    if not unty_file_no:
+        unty_file_no = str(uuid.uuid4())
+
+    conn = get_db()
+    cursor = conn.cursor()
+    try:
+        # 받은 파일은 blob 으로 링크만 걸고 그대로 둠 → 실패해도 다시 complete 할 수 있음
+        storage_name = blob_store.put(cursor, chunked_uploads.part_path(upload_id), state.get("checksum"), state["fileSize"])
+        file_path = blob_store.path(storage_name)
+        file_id = insert_file_rows(cursor, unty_file_no, [(state["fileName"], storage_name, file_path)])
         conn.commit()
-        conn.close()
-        max_file_seq += 1
+    except Exception as e:
+        conn.rollback()
+        logging.exception("🚨 분할 업로드 완료 처리 중 오류 발생")
+        return jsonify({"error": "File save failed", "details": str(e)}), 500
+    finally:
+        cursor.close()
+    chunked_uploads.abort(upload_id)  # 스테이징 상태 정리
 
-    return jsonify({"message": "Files uploaded successfully", "untyFileNo": unty_file_no})
+    logging.info(f"📁 분할 업로드 완료: {file_path}")
+    return jsonify({"message": "File uploaded successfully", "untyFileNo": unty_file_no, "fileId": file_id})
+
+
+@files_bp.route('/upload/chunked/<upload_id>', methods=['DELETE'])
+def abort_chunked_upload(upload_id):
+    if chunked_uploads.get(upload_id) is None:
+        return jsonify({"error": "Upload not found"}), 404
+    chunked_uploads.abort(upload_id)
+    return jsonify({"message": "Upload aborted"})
 
 
 
@@ -124,13 +318,12 @@ def upload_file():
 
 @files_bp.route('/files/<untyfileno>', methods=['GET'])
 def get_files(untyfileno):
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    cursor = get_db().cursor()
     cursor.execute("""
         SELECT file_id, file_name, unique_file_name FROM files WHERE unty_file_no = %s
     """, (untyfileno,))
     files = cursor.fetchall()
-    conn.close()
+    cursor.close()
 
     file_list = [
         {
@@ -153,11 +346,10 @@ def download_files(untyFileNo):
     logging.info(f"📥 파일 다운로드 요청 - 통합첨부파일번호: {untyFileNo}")
 
     # 📌 DB에서 해당 `untyFileNo`에 해당하는 파일 목록 조회
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    cursor = get_db().cursor()
     cursor.execute("SELECT file_id FROM files WHERE unty_file_no = %s", (untyFileNo,))
     files = cursor.fetchall()
-    conn.close()
+    cursor.close()
 
     if not files:
         logging.warning(f"⚠️ 해당 통합첨부파일번호({untyFileNo})에 대한 파일이 없습니다.")
@@ -169,18 +361,107 @@ def download_files(untyFileNo):
 
 
 
+class _ZipStream(io.RawIOBase):
+    """ZipFile 이 쓴 바이트를 모아뒀다가 응답 조각으로 넘겨주는 버퍼 (seek 불가 → ZipFile 이 data descriptor 사용)"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self._chunks.append(bytes(b))
+        return len(b)
+
+    def pop(self):
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+ZIP_READ_CHUNK = 256 * 1024
+
+
+def _unique_arcname(name, used):
+    """ZIP 안 파일명 중복 시 '이름 (2).확장자' 형태로"""
+    base, ext = os.path.splitext(name)
+    candidate = name
+    n = 2
+    while candidate in used:
+        candidate = f"{base} ({n}){ext}"
+        n += 1
+    used.add(candidate)
+    return candidate
+
+
+def generate_zip(entries):
+    """
+    [(ZIP 안 파일명, 실제 경로), ...] → ZIP 바이트를 조각으로 생성
+    - 파일을 ZIP_READ_CHUNK 씩 읽어 바로 내보내므로 압축 파일 전체를 메모리/디스크에 만들지 않음
+    - 첨부파일은 대부분 이미 압축된 형식(PDF, xlsx, 이미지)이라 무압축(STORED)으로 저장
+    """
+    stream = _ZipStream()
+    with zipfile.ZipFile(stream, mode="w", compression=zipfile.ZIP_STORED) as zf:
+        for arcname, path in entries:
+            try:
+                st = os.stat(path)
+                src = open(path, "rb")
+            except OSError:
+                logging.warning(f"⚠️ ZIP 생성 중 파일 없음, 건너뜀: {path}")
+                continue
+            with src:
+                info = zipfile.ZipInfo(arcname, date_time=time.localtime(st.st_mtime)[:6])
+                info.compress_type = zipfile.ZIP_STORED
+                info.file_size = st.st_size
+                with zf.open(info, mode="w") as dest:
+                    for block in iter(lambda: src.read(ZIP_READ_CHUNK), b""):
+                        dest.write(block)
+                        yield stream.pop()
+            yield stream.pop()
+    yield stream.pop()  # central directory
+
+
+# 📌 통합첨부파일번호(`untyFileNo`)의 모든 파일을 ZIP 하나로 다운로드
+@files_bp.route('/download/<untyFileNo>/zip', methods=['GET'])
+def download_files_zip(untyFileNo):
+    logging.info(f"📦 ZIP 다운로드 요청 - 통합첨부파일번호: {untyFileNo}")
+
+    cursor = get_db().cursor()
+    cursor.execute("""
+        SELECT file_name, unique_file_name FROM files WHERE unty_file_no = %s ORDER BY file_seq, file_id
+    """, (untyFileNo,))
+    files = cursor.fetchall()
+    cursor.close()
+
+    if not files:
+        logging.warning(f"⚠️ 해당 통합첨부파일번호({untyFileNo})에 대한 파일이 없습니다.")
+        return jsonify({"error": "No files found for this untyFileNo"}), 404
+
+    used = set()
+    entries = [
+        (_unique_arcname(file["file_name"] or file["unique_file_name"], used),
+         os.path.join(UPLOAD_FOLDER, file["unique_file_name"]))
+        for file in files
+    ]
+
+    response = Response(generate_zip(entries), mimetype="application/zip")
+    response.headers["Content-Disposition"] = f"attachment; filename*=UTF-8''{quote(f'attachments_{untyFileNo}.zip')}"
+    response.headers["X-Accel-Buffering"] = "no"  # nginx 가 응답을 모아두지 않고 바로 전달
+    return response
+
+
 @files_bp.route('/download/file/<int:fileId>', methods=['GET'])
 def download_file(fileId):
     logging.info(f"📥 개별 파일 다운로드 요청: {fileId}")
 
-    # DB 조회
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    # DB 조회 (요청 커넥션 재사용)
+    cursor = get_db().cursor()
     cursor.execute("""
         SELECT file_name, unique_file_name FROM files WHERE file_id = %s
     """, (fileId,))
     file = cursor.fetchone()
-    conn.close()
+    cursor.close()
 
     logging.info(f"📥 DB 조회 결과: {file}")
 
@@ -196,18 +477,9 @@ def download_file(fileId):
             return jsonify({"error": "Physical file not found"}), 404
 
         original_name = file["file_name"] or "downloaded_file.xls"
-        response = send_from_directory(
-            UPLOAD_FOLDER,
-            file["unique_file_name"],
-            as_attachment=True,
-            mimetype="application/octet-stream"
-        )
-
-        # ❌ filename="..." 생략하고
-        # ✅ filename*=UTF-8''만 사용
-        cd_value = f"attachment; filename*=UTF-8''{quote(original_name)}"
-        response.headers["Content-Disposition"] = cd_value
-        return response
+        # ?inline=true 면 브라우저에서 바로 열기 (PDF 미리보기 등)
+        inline = request.args.get('inline', 'false') == 'true'
+        return send_stored_file(file_path, original_name, as_attachment=not inline)
 
     except Exception as e:
         logging.exception("❌ 파일 다운로드 처리 중 예외 발생")
@@ -225,30 +497,28 @@ def download_file(fileId):
 def delete_file(fileId):
     logging.info(f"파일 삭제 요청: {fileId}")
 
-    conn = get_db_connection()
+    conn = get_db()
     cursor = conn.cursor()
     cursor.execute("SELECT unique_file_name FROM files WHERE file_id = %s", (fileId,))
     file = cursor.fetchone()
 
     if not file:
-        conn.close()
+        cursor.close()
         return jsonify({"error": "File not found"}), 404
 
-    unique_file_name = file["unique_file_name"]
-    file_path = os.path.join(UPLOAD_FOLDER, unique_file_name)
-
-    # 실제 파일 삭제
-    if os.path.exists(file_path):
-        try:
-            os.remove(file_path)
-        except Exception as e:
-            logging.error(f"🚨 파일 삭제 중 오류 발생: {e}")
-            return jsonify({"error": "File deletion failed", "details": str(e)}), 500
-
-    # DB에서 삭제
-    cursor.execute("DELETE FROM files WHERE file_id = %s", (fileId,))
-    conn.commit()
-    conn.close()
+    # DB에서 삭제 + 참조 수 감소 (다른 견적에서도 쓰는 파일이면 실제 파일은 남김)
+    try:
+        cursor.execute("DELETE FROM files WHERE file_id = %s", (fileId,))
+        unreferenced = blob_store.release(cursor, file["unique_file_name"])
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        logging.error(f"🚨 파일 삭제 중 오류 발생: {e}")
+        return jsonify({"error": "File deletion failed", "details": str(e)}), 500
+    finally:
+        cursor.close()
+    blob_store.discard(unreferenced)  # 커밋된 뒤에만 실제 파일 삭제
+    logging.info(f"🗑️ 파일 삭제 완료: {fileId} (실제 파일 삭제: {bool(unreferenced)})")
 
     return jsonify({"message": f"{fileId} deleted successfully!"})
 
@@ -281,10 +551,11 @@ def copy_files(untyFileNo):
     """
     통합 첨부 파일 번호(untyFileNo)에 해당하는 파일들을 복사하고,
     새로운 통합 첨부 파일 번호를 생성하여 반환하는 API
+    - 실제 파일은 복사하지 않고 같은 blob 을 가리키는 files 행만 추가 (참조 수 증가)
     """
     logging.info(f"📋 파일 복사 요청 - 통합첨부파일번호: {untyFileNo}")
 
-    conn = get_db_connection()
+    conn = get_db()
     cursor = conn.cursor()
 
     try:
@@ -293,6 +564,7 @@ def copy_files(untyFileNo):
             SELECT file_name, unique_file_name, file_path
             FROM files
             WHERE unty_file_no = %s
+            ORDER BY file_seq, file_id
         """, (untyFileNo,))
         files = cursor.fetchall()
 
@@ -304,32 +576,17 @@ def copy_files(untyFileNo):
         new_unty_file_no = str(uuid.uuid4())
         logging.info(f"📌 새로운 통합첨부파일번호 생성: {new_unty_file_no}")
 
-        # 3) 파일 복사 및 DB에 새로운 파일 정보 저장
-        for file in files:
-            original_name = file["file_name"]
-            unique_file_name = file["unique_file_name"]
-            original_file_path = file["file_path"]
+        # 3) 참조 수 증가 + DB에 새로운 파일 정보 저장 (파일 복사 없음)
+        missing = [file["unique_file_name"] for file in files if not os.path.exists(blob_store.path(file["unique_file_name"]))]
+        if missing:
+            logging.error(f"🚨 복사할 파일이 서버에 없음: {missing}")
+            return jsonify({"error": "File copy failed", "details": f"Physical file not found: {missing[0]}"}), 500
 
-            # 새로운 파일명 생성
-            _, ext = os.path.splitext(unique_file_name)
-            new_unique_file_name = f"{str(uuid.uuid4())}{ext}"
-            new_file_path = os.path.join(UPLOAD_FOLDER, new_unique_file_name)
-
-            # 파일 복사
-            try:
-                with open(original_file_path, 'rb') as src_file:
-                    with open(new_file_path, 'wb') as dest_file:
-                        dest_file.write(src_file.read())
-                logging.info(f"📁 파일 복사 완료: {original_file_path} -> {new_file_path}")
-            except Exception as e:
-                logging.error(f"🚨 파일 복사 중 오류 발생: {e}")
-                return jsonify({"error": "File copy failed", "details": str(e)}), 500
-
-            # DB에 새로운 파일 정보 저장
-            cursor.execute("""
-                INSERT INTO files (file_name, unique_file_name, file_path, unty_file_no, file_seq)
-                VALUES (%s, %s, %s, %s, %s)
-            """, (original_name, new_unique_file_name, new_file_path, new_unty_file_no, 1))  # file_seq는 1로 초기화
+        blob_store.add_refs(cursor, [file["unique_file_name"] for file in files])
+        insert_file_rows(cursor, new_unty_file_no, [
+            (file["file_name"], file["unique_file_name"], file["file_path"]) for file in files
+        ])
+        logging.info(f"📁 파일 {len(files)}개 참조 복사 완료: {untyFileNo} -> {new_unty_file_no}")
 
         # DB 커밋
         conn.commit()
@@ -343,4 +600,4 @@ def copy_files(untyFileNo):
         return jsonify({"error": "Internal server error", "details": str(e)}), 500
 
     finally:
-        conn.close()
+        cursor.close()
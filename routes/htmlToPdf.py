@@ -1,19 +1,23 @@
 import os
 import logging
-from flask import Blueprint, request, jsonify, send_file
-from jinja2 import Environment, FileSystemLoader
-import pdfkit
-from models.database import get_db_connection
+import uuid
+import shutil
+import zipfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from flask import Blueprint, request, jsonify, send_file, current_app
+from models.database import get_db
+from pdf.jobs import JobQueue, JobFailed, QueueFullError, QUEUED, RUNNING, DONE
+from pdf.cache import PdfCache
+from pdf.renderer import get_renderer, RENDERER_WORKERS
+from pdf.templates import TemplateRegistry
+from pdf.assets import AssetCache
 from datetime import datetime
 
 from flask import send_from_directory
 
-from flask import render_template
-
 import os
 
-config = pdfkit.configuration(wkhtmltopdf='/usr/local/bin/wkhtmltopdf')  # 실제 경로 확인 필요
-
 htmlToPdf_bp = Blueprint('htmlToPdf', __name__)
 
 from auth.decorators import require_token
@@ -23,182 +27,474 @@ from auth.decorators import require_token
 #     pass
 
 TEMPLATE_PATH = os.path.join(os.getcwd(), 'templates')  # 템플릿 폴더
+STATIC_PATH = os.path.join(os.getcwd(), 'static')  # 로고/직인 이미지 폴더
 PDF_OUTPUT_PATH = os.path.join(os.getcwd(), 'temp')
 os.makedirs(PDF_OUTPUT_PATH, exist_ok=True)
 
 
+# 📌 PDF 렌더링 작업 큐 (wkhtmltopdf 는 요청 워커가 아니라 백그라운드 워커에서 실행)
+pdf_jobs = JobQueue(os.path.join(PDF_OUTPUT_PATH, 'jobs'), name='pdf')
+
+# 📌 문서 템플릿 (컴파일 결과를 메모리/디스크에 유지, 블루프린트 등록 시 미리 컴파일)
+document_templates = TemplateRegistry(TEMPLATE_PATH, os.path.join(PDF_OUTPUT_PATH, 'jinja_cache'))
+htmlToPdf_bp.record_once(lambda state: document_templates.warm_up())
+
+# 📌 로고/직인 이미지 (data URI 로 메모리에 보관, 파일이 바뀌면 다시 읽음)
+branding_assets = AssetCache({
+    'logo': os.path.join(STATIC_PATH, 'logo.png'),
+    'sign': os.path.join(STATIC_PATH, 'sign.png'),
+})
+htmlToPdf_bp.record_once(lambda state: branding_assets.warm_up())
+
+# 📌 렌더링 결과 캐시 (데이터/옵션/템플릿이 같으면 다시 렌더링하지 않음)
+pdf_cache = PdfCache(os.path.join(PDF_OUTPUT_PATH, 'pdf_cache'))
+
+DOC_TYPES = ('estimate', 'contract')
+BATCH_MAX_DOCUMENTS = 500  # 일괄 생성 1회 최대 문서 수
+
+
+# `quote_amount`를 한글로 변환
+def convert_to_korean_currency(amount):
+    if not amount or amount <= 0:
+        return "영원"
+
+    units = ["", "십", "백", "천"]
+    large_units = ["", "만", "억", "조"]
+    nums = ["영", "일", "이", "삼", "사", "오", "육", "칠", "팔", "구"]
+
+    result = []
+    num_str = str(int(amount))
+    length = len(num_str)
+
+    for i, digit in enumerate(num_str):
+        if digit != "0":
+            unit_idx = (length - i - 1) % 4  # 천, 백, 십, 일 단위
+            large_unit_idx = (length - i - 1) // 4  # 만, 억, 조 단위
+            result.append(nums[int(digit)] + units[unit_idx])
+            if unit_idx == 0:  # 일의 자리에서 큰 단위 추가
+                result.append(large_units[large_unit_idx])
+
+    return "".join(result) + "원"
+
+
+def fetch_documents(cursor, doc_type, doc_ids):
+    """
+    문서 렌더링에 필요한 데이터를 여러 건 한 번에 조회 (IN (...) 쿼리)
+    - 반환: {doc_id: (template_name, data)} / 없는 문서는 빠짐
+    """
+    doc_ids = list(dict.fromkeys(doc_ids))  # 중복 제거 (순서 유지)
+    if not doc_ids:
+        return {}
+    placeholders = ", ".join(["%s"] * len(doc_ids))
+
+    if doc_type == 'estimate':
+        # 견적서 기본 정보 및 고객/영업 정보 조회
+        sql_estimate = f"""
+        SELECT 
+            e.id AS estimate_id,
+            e.quote_id,
+            e.quote_title,
+            e.customer_id,
+            c.customer_nm,
+            c.tel_no AS customer_tel,
+            c.address1 AS customer_address1,
+            c.address2 AS customer_address2,
+            c.address3 AS customer_address3,
+            e.sales_id,
+            u.name ,
+            u.email ,
+            u.phone ,
+            u.position , 
+            e.total_price_before_vat,
+            e.vat,
+            e.total_price_with_vat,
+            DATE_FORMAT(e.valid_until, '%%Y년 %%m월 %%d일') AS valid_until,
+            e.delivery_condition,
+            e.payment_condition,
+            e.warranty_period,
+            e.remarks,
+            e.opinion,
+            e.memo,
+            e.unty_file_no,
+            e.quote_amount
+        FROM estimate e
+        LEFT JOIN customer c ON e.customer_id = c.customer_id
+        LEFT JOIN user u ON e.sales_id = u.usr_id
+        WHERE e.id IN ({placeholders})
+        """
+        cursor.execute(sql_estimate, doc_ids)
+        estimates = {row["estimate_id"]: row for row in cursor.fetchall()}
+        if not estimates:
+            return {}
+
+        found_ids = list(estimates)
+        found_placeholders = ", ".join(["%s"] * len(found_ids))
+
+        # 제품 목록 조회
+        sql_products = f"""
+        SELECT 
+            ep.estimate_id,
+            p.id,
+            p.p_name,
+            p.p_description,
+            p.p_price,
+            ep.quantity,
+            ep.unit_price,
+            ep.total_price,
+            ep.final_price 
+        FROM t_estimate_product ep
+        JOIN t_product_add p ON ep.product_id = p.id
+        WHERE ep.estimate_id IN ({found_placeholders})
+        """
+        cursor.execute(sql_products, found_ids)
+        products = {estimate_id: [] for estimate_id in found_ids}
+        for row in cursor.fetchall():
+            products[row.pop("estimate_id")].append(row)
+
+        # 참조자 정보 조회
+        sql_references = f"""
+        SELECT 
+            er.estimate_id,
+            er.manager_id,
+            er.manager_name,
+            er.manager_email,
+            er.tel_no,
+            er.position
+        FROM estimate_reference er
+        WHERE er.estimate_id IN ({found_placeholders})
+        """
+        cursor.execute(sql_references, found_ids)
+        references = {estimate_id: [] for estimate_id in found_ids}
+        for row in cursor.fetchall():
+            references[row.pop("estimate_id")].append(row)
+
+        today = datetime.today()
+        formatted = today.strftime("%Y년 %m월 %d일")
+
+        # 템플릿에 전달할 데이터 구성
+        documents = {}
+        for estimate_id, estimate in estimates.items():
+            documents[estimate_id] = ('estimate_template.html', {
+                "estimate": estimate,
+                "items": products[estimate_id],
+                "total_price_korean": convert_to_korean_currency(estimate["total_price_with_vat"]),
+                "date" : formatted,
+                "references": references[estimate_id],
+            })
+        return documents
+
+    if doc_type == 'contract':
+        cursor.execute(f"SELECT * FROM contract WHERE contract_id IN ({placeholders})", doc_ids)
+        return {row["contract_id"]: ('contract_template.html', row) for row in cursor.fetchall()}
+
+    return {}
+
+
+def fetch_document(cursor, doc_type, doc_id):
+    """
+    문서 1건 조회
+    - 반환: (template_name, data) / 문서가 없으면 None
+    """
+    return fetch_documents(cursor, doc_type, [doc_id]).get(doc_id)
+
+
+def make_cache_key(template_name, data, include_logo, include_signature):
+    """PDF 캐시 키 - 데이터/옵션/템플릿/로고·직인 이미지가 같으면 같은 키"""
+    return pdf_cache.make_key(
+        data, template_name, document_templates.version(template_name),
+        include_logo=include_logo, include_signature=include_signature,
+        assets=branding_assets.version(),
+    )
+
+
+def render_pdf(template_name, data, include_logo, include_signature, output_path):
+    """HTML 템플릿 렌더링 → wkhtmltopdf 로 PDF 생성 (앱 컨텍스트 필요)"""
+    # 1. Jinja2 HTML 템플릿 렌더링 (이미지는 data URI 로 HTML 에 직접 삽입)
+    logo_path = branding_assets.get('logo') if include_logo else None
+    sign_path = branding_assets.get('sign') if include_signature else None
+    rendered = document_templates.render(
+        template_name,
+        **data,
+        include_logo=include_logo,
+        include_signature=include_signature,
+        logo_path=logo_path,
+        sign_path=sign_path
+    )
+
+    # 2. PDF 생성 (임시 파일에 쓴 뒤 교체 → 미리보기가 반쯤 만든 파일을 읽지 않도록)
+    #    렌더러는 pdf.renderer 설정에 따라 상주 프로세스 풀 또는 매번 새 프로세스
+    tmp_path = f"{output_path}.{os.getpid()}.{threading.get_ident()}.tmp.pdf"
+    get_renderer().render(
+        rendered,
+        tmp_path,
+        options={
+            'enable-local-file-access': None,  # 로컬 파일 접근 허용 (템플릿의 로컬 리소스용)
+            'encoding': 'UTF-8'  # 한글 깨짐 방지
+        }
+    )
+    os.replace(tmp_path, output_path)
+
+
+def _render_job(app, template_name, data, include_logo, include_signature, pdf_filename, cache_key, progress):
+    """백그라운드 워커에서 실행되는 PDF 렌더링 작업"""
+    output_path = os.path.join(PDF_OUTPUT_PATH, pdf_filename)
+    with app.app_context():
+        progress(20)
+        render_pdf(template_name, data, include_logo, include_signature, output_path)
+    progress(90)
+    pdf_cache.put(cache_key, output_path)
+    logging.info(f"PDF 생성 완료: {pdf_filename}")
+    return {'fileName': pdf_filename}
+
+
+def _render_batch_job(app, documents, include_logo, include_signature, zip_path, progress):
+    """
+    일괄 PDF 렌더링 작업 - 렌더러 프로세스 수만큼 병렬로 렌더링 후 ZIP 으로 묶음
+    documents: [(doc_type, doc_id, template_name, data, cache_key), ...]
+    - PDF 는 이 작업 전용 폴더에 렌더링 (temp/{type}_{id}.pdf 는 단건 생성/미리보기 파일이라 건드리지 않음)
+    - 전부 실패하면 빈 ZIP 대신 작업 실패(FAILED) + 문서별 오류
+    """
+    work_dir = f"{zip_path}.parts"
+    os.makedirs(work_dir, exist_ok=True)
+
+    def render_one(doc_type, doc_id, template_name, data, cache_key):
+        output_path = os.path.join(work_dir, f'{doc_type}_{doc_id}.pdf')
+        if not pdf_cache.restore(cache_key, output_path):
+            with app.app_context():
+                render_pdf(template_name, data, include_logo, include_signature, output_path)
+            pdf_cache.put(cache_key, output_path)
+        return output_path
+
+    rendered = []
+    failed = []
+    try:
+        with ThreadPoolExecutor(max_workers=RENDERER_WORKERS, thread_name_prefix='pdf-batch') as executor:
+            futures = {executor.submit(render_one, *doc): doc for doc in documents}
+            for done_count, future in enumerate(as_completed(futures), start=1):
+                doc_type, doc_id = futures[future][:2]
+                try:
+                    rendered.append(future.result())
+                except Exception as e:
+                    logging.exception(f"일괄 PDF 렌더링 실패: {doc_type}_{doc_id}")
+                    failed.append({'docType': doc_type, 'docId': doc_id, 'error': str(e)})
+                progress(int(10 + 80 * done_count / len(documents)))
+
+        if not rendered:
+            raise JobFailed(f'문서 {len(failed)}건 모두 PDF 생성에 실패했습니다.', rendered=0, failed=failed)
+
+        # PDF 는 이미 압축된 형식이라 ZIP 은 무압축(STORED)으로 빠르게 묶음
+        tmp_path = f"{zip_path}.tmp"
+        with zipfile.ZipFile(tmp_path, 'w', compression=zipfile.ZIP_STORED) as zf:
+            for path in sorted(rendered):
+                zf.write(path, arcname=os.path.basename(path))
+        os.replace(tmp_path, zip_path)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    logging.info(f"일괄 PDF 생성 완료: 성공 {len(rendered)}건, 실패 {len(failed)}건")
+    return {'zipFile': os.path.basename(zip_path), 'rendered': len(rendered), 'failed': failed}
+
+
+def _job_response(job):
+    return {
+        'jobId': job['jobId'],
+        'status': job['status'],
+        'progress': job['progress'],
+        'docType': job.get('docType'),
+        'docId': job.get('docId'),
+        'error': job.get('error'),
+        **({'rendered': job.get('rendered'), 'failed': job.get('failed')} if job.get('docType') == 'batch' else {}),
+    }
+
+
 @htmlToPdf_bp.route('/generate_pdf/<doc_type>/<int:doc_id>', methods=['GET'])
 def generate_pdf(doc_type, doc_id):
+    """
+    PDF 생성 요청 API
+    - 데이터 조회만 요청 안에서 하고, 렌더링은 작업 큐에 넣은 뒤 바로 jobId 반환 (202)
+    - 진행 상황: GET /pdf_jobs/<jobId>, 완료 후 /preview_pdf, /download_pdf 로 조회
+    """
     logging.info("PDF 생성 요청 수신")
 
     include_logo = request.args.get('includeLogo', 'true') == 'true'
     include_signature = request.args.get('includeSignature', 'true') == 'true'
 
+    if doc_type not in DOC_TYPES:
+        return jsonify({'error': '지원되지 않는 문서 유형입니다.'}), 400
+
     try:
-        # 1. DB 연결 + 데이터 조회
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
-        if doc_type == 'estimate':
-            # 견적서 기본 정보 및 고객/영업 정보 조회
-            sql_estimate = """
-            SELECT 
-                e.id AS estimate_id,
-                e.quote_id,
-                e.quote_title,
-                e.customer_id,
-                c.customer_nm,
-                c.tel_no AS customer_tel,
-                c.address1 AS customer_address1,
-                c.address2 AS customer_address2,
-                c.address3 AS customer_address3,
-                e.sales_id,
-                u.name ,
-                u.email ,
-                u.phone ,
-                u.position , 
-                e.total_price_before_vat,
-                e.vat,
-                e.total_price_with_vat,
-                DATE_FORMAT(e.valid_until, '%%Y년 %%m월 %%d일') AS valid_until,
-                e.delivery_condition,
-                e.payment_condition,
-                e.warranty_period,
-                e.remarks,
-                e.opinion,
-                e.memo,
-                e.unty_file_no,
-                e.quote_amount
-            FROM estimate e
-            LEFT JOIN customer c ON e.customer_id = c.customer_id
-            LEFT JOIN user u ON e.sales_id = u.usr_id
-            WHERE e.id = %s
-            """
-            cursor.execute(sql_estimate, (doc_id,))
-            estimate = cursor.fetchone()
-
-            if not estimate:
+        # 1. DB 데이터 조회
+        cursor = get_db().cursor()
+        document = fetch_document(cursor, doc_type, doc_id)
+        cursor.close()
+
+        if document is None:
+            if doc_type == 'estimate':
                 return jsonify({'error': '견적서를 찾을 수 없습니다.'}), 404
+            return jsonify({'error': '계약서를 찾을 수 없습니다.'}), 404
+
+        template_name, data = document
+        pdf_filename = f'{doc_type}_{doc_id}.pdf'
+
+        # 2. 캐시 확인 - 데이터/옵션/템플릿이 그대로면 렌더링 생략
+        cache_key = make_cache_key(template_name, data, include_logo, include_signature)
+        if _pending_job(doc_type, doc_id) is None and \
+                pdf_cache.restore(cache_key, os.path.join(PDF_OUTPUT_PATH, pdf_filename)):
+            logging.info(f"PDF 캐시 적중: {pdf_filename}")
+            return jsonify({'status': 'done', 'jobId': None, 'cached': True}), 200
+
+        # 3. 렌더링 작업 등록
+        job = pdf_jobs.submit(
+            _render_job,
+            current_app._get_current_object(), template_name, data,
+            include_logo, include_signature, pdf_filename, cache_key,
+            meta={'docType': doc_type, 'docId': doc_id},
+        )
+        pdf_jobs.set_latest(f'{doc_type}_{doc_id}', job['jobId'])
 
-            # 제품 목록 조회
-            sql_products = """
-            SELECT 
-                p.id,
-                p.p_name,
-                p.p_description,
-                p.p_price,
-                ep.quantity,
-                ep.unit_price,
-                ep.total_price,
-                ep.final_price 
-            FROM t_estimate_product ep
-            JOIN t_product_add p ON ep.product_id = p.id
-            WHERE ep.estimate_id = %s
-            """
-            cursor.execute(sql_products, (doc_id,))
-            products = cursor.fetchall()
-
-            # 참조자 정보 조회
-            sql_references = """
-            SELECT 
-                er.manager_id,
-                er.manager_name,
-                er.manager_email,
-                er.tel_no,
-                er.position
-            FROM estimate_reference er
-            WHERE er.estimate_id = %s
-            """
-            cursor.execute(sql_references, (doc_id,))
-            references = cursor.fetchall()
-
-            # `quote_amount`를 한글로 변환
-            def convert_to_korean_currency(amount):
-                if not amount or amount <= 0:
-                    return "영원"
-                
-                units = ["", "십", "백", "천"]
-                large_units = ["", "만", "억", "조"]
-                nums = ["영", "일", "이", "삼", "사", "오", "육", "칠", "팔", "구"]
-
-                result = []
-                num_str = str(int(amount))
-                length = len(num_str)
-
-                for i, digit in enumerate(num_str):
-                    if digit != "0":
-                        unit_idx = (length - i - 1) % 4  # 천, 백, 십, 일 단위
-                        large_unit_idx = (length - i - 1) // 4  # 만, 억, 조 단위
-                        result.append(nums[int(digit)] + units[unit_idx])
-                        if unit_idx == 0:  # 일의 자리에서 큰 단위 추가
-                            result.append(large_units[large_unit_idx])
-
-                return "".join(result) + "원"
-
-            total_price_korean = convert_to_korean_currency(estimate["total_price_with_vat"])
-
-            today = datetime.today()
-            formatted = today.strftime("%Y년 %m월 %d일")
-
-            # 템플릿에 전달할 데이터 구성
-            data = {
-                "estimate": estimate,
-                "items": products,
-                "total_price_korean": total_price_korean,
-                "date" : formatted,
-                "references": references,
-            }
+        logging.info(f"PDF 생성 작업 등록: {job['jobId']}")
+        return jsonify({'status': 'queued', 'jobId': job['jobId']}), 202
 
-            template_name = 'estimate_template.html'
-            pdf_filename = f'estimate_{doc_id}.pdf'
+    except QueueFullError as e:
+        return jsonify({'error': str(e)}), 503
 
-        elif doc_type == 'contract':
-            cursor.execute("SELECT * FROM contract WHERE contract_id = %s", (doc_id,))
-            data = cursor.fetchone()
-            if not data:
-                return jsonify({'error': '계약서를 찾을 수 없습니다.'}), 404
+    except Exception as e:
+        logging.exception("PDF 생성 실패")
+        return jsonify({'error': str(e)}), 500
 
-            template_name = 'contract_template.html'
-            pdf_filename = f'contract_{doc_id}.pdf'
 
-        else:
-            return jsonify({'error': '지원되지 않는 문서 유형입니다.'}), 400
+@htmlToPdf_bp.route('/generate_pdf/batch', methods=['POST'])
+def generate_pdf_batch():
+    """
+    PDF 일괄 생성 API
+    - 요청 JSON 예시:
+      {
+        "documents": [{"docType": "estimate", "docId": 1}, {"docType": "contract", "docId": 3}],
+        "includeLogo": true,
+        "includeSignature": true,
+        "mode": "zip"   # zip: 작업 1개로 전체를 ZIP 생성 / jobs: 문서별 작업 id 반환
+      }
+    - 데이터는 문서 유형별로 IN (...) 쿼리 한 번씩만 조회
+    """
+    data = request.get_json() or {}
+    documents = data.get('documents') or []
+    include_logo = data.get('includeLogo', True) is not False
+    include_signature = data.get('includeSignature', True) is not False
+    mode = data.get('mode', 'zip')
+
+    if mode not in ('zip', 'jobs'):
+        return jsonify({'error': 'mode 는 zip 또는 jobs 만 가능합니다.'}), 400
+    if not documents:
+        return jsonify({'error': '생성할 문서가 없습니다.'}), 400
+    if len(documents) > BATCH_MAX_DOCUMENTS:
+        return jsonify({'error': f'한 번에 최대 {BATCH_MAX_DOCUMENTS}건까지 생성할 수 있습니다.'}), 400
+
+    ids_by_type = {}
+    for doc in documents:
+        doc_type = doc.get('docType')
+        doc_id = doc.get('docId')
+        if doc_type not in DOC_TYPES or not str(doc_id).isdigit():
+            return jsonify({'error': f'잘못된 문서 정보입니다: {doc}'}), 400
+        ids_by_type.setdefault(doc_type, []).append(int(doc_id))
 
+    try:
+        # 1. 문서 유형별 일괄 조회
+        cursor = get_db().cursor()
+        fetched = {doc_type: fetch_documents(cursor, doc_type, doc_ids) for doc_type, doc_ids in ids_by_type.items()}
         cursor.close()
-        conn.close()
-
-        # 2. Jinja2 HTML 템플릿 렌더링
-        env = Environment(loader=FileSystemLoader(TEMPLATE_PATH))
-        logo_path = "file:///usr/local/flask/yeji/groupware-api/static/logo.png"
-        sign_path = "file:///usr/local/flask/yeji/groupware-api/static/sign.png"
-        rendered = render_template(
-            template_name,
-            **data,
-            include_logo=include_logo,
-            include_signature=include_signature,
-            logo_path=logo_path,
-            sign_path=sign_path
-        )
-
-        # 3. PDF 생성
-        output_path = os.path.join(PDF_OUTPUT_PATH, pdf_filename)
-        pdfkit.from_string(
-            rendered,
-            output_path,
-            configuration=config,
-            options={
-                'enable-local-file-access': None,  # 로컬 파일 접근 허용 (이미지 경로용)
-                'encoding': 'UTF-8'  # 한글 깨짐 방지
-            }
-        )
 
-        logging.info("PDF 생성 완료")
-        return jsonify({'status': 'success'})
+        targets = []
+        not_found = []
+        for doc_type, doc_ids in ids_by_type.items():
+            for doc_id in dict.fromkeys(doc_ids):
+                if doc_id not in fetched[doc_type]:
+                    not_found.append({'docType': doc_type, 'docId': doc_id})
+                    continue
+                template_name, doc_data = fetched[doc_type][doc_id]
+                cache_key = make_cache_key(template_name, doc_data, include_logo, include_signature)
+                targets.append((doc_type, doc_id, template_name, doc_data, cache_key))
+
+        if not targets:
+            return jsonify({'error': '문서를 찾을 수 없습니다.', 'notFound': not_found}), 404
+
+        # 2-a. ZIP 모드 - 작업 1개로 병렬 렌더링 후 압축
+        if mode == 'zip':
+            zip_path = os.path.join(pdf_jobs.state_dir, f'batch_{uuid.uuid4().hex}.zip')
+            job = pdf_jobs.submit(
+                _render_batch_job,
+                current_app._get_current_object(), targets, include_logo, include_signature, zip_path,
+                meta={'docType': 'batch', 'docId': None, 'count': len(targets)},
+            )
+            return jsonify({'status': 'queued', 'jobId': job['jobId'], 'notFound': not_found}), 202
+
+        # 2-b. 문서별 작업 모드
+        app = current_app._get_current_object()
+        results = []
+        for doc_type, doc_id, template_name, doc_data, cache_key in targets:
+            pdf_filename = f'{doc_type}_{doc_id}.pdf'
+            if _pending_job(doc_type, doc_id) is None and \
+                    pdf_cache.restore(cache_key, os.path.join(PDF_OUTPUT_PATH, pdf_filename)):
+                results.append({'docType': doc_type, 'docId': doc_id, 'status': 'done', 'jobId': None, 'cached': True})
+                continue
+            try:
+                job = pdf_jobs.submit(
+                    _render_job,
+                    app, template_name, doc_data, include_logo, include_signature, pdf_filename, cache_key,
+                    meta={'docType': doc_type, 'docId': doc_id},
+                )
+            except QueueFullError as e:
+                results.append({'docType': doc_type, 'docId': doc_id, 'status': 'rejected', 'error': str(e)})
+                continue
+            pdf_jobs.set_latest(f'{doc_type}_{doc_id}', job['jobId'])
+            results.append({'docType': doc_type, 'docId': doc_id, 'status': 'queued', 'jobId': job['jobId']})
+
+        return jsonify({'documents': results, 'notFound': not_found}), 202
+
+    except QueueFullError as e:
+        return jsonify({'error': str(e)}), 503
 
     except Exception as e:
-        logging.exception("PDF 생성 실패")
+        logging.exception("PDF 일괄 생성 실패")
         return jsonify({'error': str(e)}), 500
-    
+
+
+@htmlToPdf_bp.route('/pdf_jobs/<job_id>/download', methods=['GET'])
+def download_pdf_batch(job_id):
+    """일괄 생성(ZIP) 결과 다운로드 API"""
+    job = pdf_jobs.get(job_id)
+    if job is None or not job.get('zipFile'):
+        return jsonify({'error': '작업을 찾을 수 없습니다.'}), 404
+    if job['status'] != DONE:
+        return jsonify(_job_response(job)), 202
+
+    zip_path = os.path.join(pdf_jobs.state_dir, job['zipFile'])
+    if not os.path.exists(zip_path):
+        return jsonify({'error': '파일을 찾을 수 없습니다.'}), 404
+    return send_file(zip_path, as_attachment=True, download_name=f'documents_{job_id[:8]}.zip',
+                     mimetype='application/zip')
+
+
+@htmlToPdf_bp.route('/pdf_jobs/<job_id>', methods=['GET'])
+def get_pdf_job(job_id):
+    """PDF 생성 작업 상태 조회 API (queued → running → done / failed)"""
+    job = pdf_jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': '작업을 찾을 수 없습니다.'}), 404
+    return jsonify(_job_response(job)), 200
+
+
+@htmlToPdf_bp.route('/pdf_metrics', methods=['GET'])
+def get_pdf_metrics():
+    """PDF 렌더링 지표 (이 워커 프로세스 기준: 작업 대기열, 렌더러 대기열/지연 시간)"""
+    return jsonify({'jobs': pdf_jobs.metrics(), 'renderer': get_renderer().metrics()}), 200
+
+
+def _pending_job(doc_type, doc_id):
+    """아직 끝나지 않은 생성 작업이 있으면 반환"""
+    job = pdf_jobs.get_latest(f'{doc_type}_{doc_id}')
+    if job and job['status'] in (QUEUED, RUNNING):
+        return job
+    return None
 
 
 
@@ -210,6 +506,13 @@ def generate_pdf(doc_type, doc_id):
 @htmlToPdf_bp.route('/preview_pdf/<doc_type>/<int:doc_id>', methods=['GET'])
 def preview_pdf(doc_type, doc_id):
     logging.info("emfdjdha???????????????????????");
+    if doc_type not in DOC_TYPES:
+        return jsonify({'error': '지원되지 않는 문서 유형입니다.'}), 400
+
+    pending = _pending_job(doc_type, doc_id)
+    if pending:
+        return jsonify(_job_response(pending)), 202
+
     filename = f"{doc_type}_{doc_id}.pdf"
     filepath = os.path.join(PDF_OUTPUT_PATH, filename)
 
@@ -230,6 +533,12 @@ def download_pdf():
     doc_id = request.args.get('doc_id')
     if not doc_type or not doc_id:
         return 'Missing parameters', 400
+    if doc_type not in DOC_TYPES or not doc_id.isdigit():
+        return 'Invalid parameters', 400
+
+    pending = _pending_job(doc_type, doc_id)
+    if pending:
+        return jsonify(_job_response(pending)), 202
 
     # 파일 이름 구성 (generate_pdf랑 동일하게!)
     pdf_filename = f'{doc_type}_{doc_id}.pdf'
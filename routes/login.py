@@ -9,7 +9,7 @@ from flask import Flask, request, jsonify
 from flask_mail import Mail, Message
 import random
 import string
-from extensions import mail  # ✅ 이렇게!
+from extensions import mail_queue, autocomplete  # ✅ 이렇게!
 # Flask에서 Redis 연결
 import redis
 
@@ -104,6 +104,7 @@ def create_user():
             (email, name, email, phone, hashed_pw, salt.decode(), role_cd, depart_cd, position, reg_id),
         )
         conn.commit()
+        autocomplete.changed("users", cursor.lastrowid)  # 🔎 자동완성 색인 갱신
         return jsonify({"message": "회원가입 성공!"}), 201
     except Exception as e:
         logging.error(f"회원가입 오류: {e}")
@@ -160,11 +161,11 @@ def send_verification():
     try:
         msg = Message("회원가입 인증 코드", sender=current_app.config['MAIL_DEFAULT_SENDER'], recipients=[email])
         msg.body = f"[ITSIN] 인증 코드는 {code} 입니다. 5분 내 입력해주세요."
-        mail.send(msg)
+        message_id = mail_queue.send(msg)
     except Exception as e:
         return jsonify({"error": f"이메일 전송 실패: {str(e)}"}), 500
 
-    return jsonify({"message": "이메일 전송 완료!"}), 200
+    return jsonify({"message": "이메일 전송 완료!", "messageId": message_id}), 200
 
 # 인증 코드 확인 API
 @login_bp.route('/verify_code', methods=['POST'])
@@ -1,5 +1,5 @@
 from flask import Blueprint, request, jsonify
-from models.database import get_db_connection
+from models.database import get_db
 import logging
 
 permissions_bp = Blueprint('permissions', __name__)
@@ -13,8 +13,7 @@ def get_screen_permissions():
     if not role:
         return jsonify({"error": "역할(role) 파라미터가 필요합니다."}), 400
 
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    cursor = get_db().cursor()
     try:
         # role로 화면 권한 조회
         cursor.execute("""
@@ -35,7 +34,6 @@ def get_screen_permissions():
         return jsonify({"error": f"DB 조회 중 오류: {str(e)}"}), 500
     finally:
         cursor.close()
-        conn.close()
 
 
         
@@ -1,4 +1,6 @@
-from models.database import get_db_connection
+from models.database import get_db_connection, get_db
+from models.pagination import Pagination
+from extensions import autocomplete
 from flask import Blueprint, request, jsonify
 import os
 import logging
@@ -79,6 +81,7 @@ def create_product():
         cursor.execute(sql, (product_name, vendor, web_path, price, fw_throughput, ips_throughput))
         conn.commit()
         logging.info("DB INSERT 성공")
+        autocomplete.changed("products", cursor.lastrowid)  # 🔎 자동완성 색인 갱신
     except Exception as e:
         logging.error(f"DB Error: {e}")
         return jsonify({"success": False, "error": str(e)}), 500
@@ -133,18 +136,17 @@ def update_product(product_id):
                 return jsonify({"success": False, "error": "Failed to save image"}), 500
         else:
             # 이미지가 업로드되지 않은 경우 기존 경로 유지
-            conn = get_db_connection()
-            cursor = conn.cursor()
+            cursor = get_db().cursor()
             cursor.execute("SELECT p_imgpath FROM t_product_add WHERE id = %s", (product_id,))
             existing_image = cursor.fetchone()
             if existing_image:
-                web_path = existing_image[0]
+                web_path = existing_image["p_imgpath"]
             else:
                 logging.warning("기존 이미지를 찾을 수 없음")
                 web_path = None
 
         # 2) 데이터베이스 업데이트
-        conn = get_db_connection()
+        conn = get_db()
         cursor = conn.cursor()
         sql = """
         UPDATE t_product_add
@@ -170,28 +172,28 @@ def update_product(product_id):
         ))
         conn.commit()
         logging.info("DB UPDATE 성공")
+        autocomplete.changed("products", product_id)  # 🔎 자동완성 색인 갱신
         return jsonify({"success": True, "message": "제품이 성공적으로 수정되었습니다."}), 200
 
     except Exception as e:
         logging.error(f"Error updating product: {e}")
         return jsonify({"success": False, "error": str(e)}), 500
 
-    finally:
-        conn.close()
-
 
 @products_bp.route('/api/products', methods=['GET'])
 def get_products():
     """
     제품 목록 조회 API
     """
+    try:
+        pagination = Pagination([("id", "id", "DESC")], default_limit=12)
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+
     try:
         # 검색 조건 처리
         search_query = request.args.get('searchQuery', '')
         vendor = request.args.get('vendor', None)
-        page = request.args.get('page', 1, type=int)
-        limit = 12
-        offset = (page - 1) * limit
 
         # 기본 쿼리
         sql = """
@@ -211,14 +213,16 @@ def get_products():
             params.append(vendor)
 
         # 정렬 및 페이징
-        sql += " ORDER BY id DESC LIMIT %s OFFSET %s"
-        params.extend([limit, offset])
+        cursor_sql, cursor_params = pagination.where()
+        order_sql, order_params = pagination.order_limit()
+        sql += cursor_sql + order_sql
+        params.extend(cursor_params + order_params)
 
         logging.info(f"Executing SQL: {sql} with params: {params}")
         conn = get_db_connection()
         cursor = conn.cursor()
         cursor.execute(sql, params)
-        products = cursor.fetchall()
+        products, page_info = pagination.result(cursor.fetchall())
         logging.info(f"여기 넘어감?????")
 
         if not products:
@@ -249,7 +253,7 @@ def get_products():
             total_count = total_count['COUNT(*)']  # 딕셔너리 키를 사용해 접근
             logging.info(f"ㄴㄴㄴ????")
 
-        return jsonify({"success": True, "products": products, "totalCount": total_count}), 200
+        return jsonify({"success": True, "products": products, "totalCount": total_count, "pagination": page_info}), 200
 
     except Exception as e:
         logging.error(f"Error fetching products: {e}")
@@ -1,5 +1,6 @@
-from models.database import get_db_connection
+from models.database import get_db
 from flask import Blueprint, request, jsonify
+from routes.customers import customer_cache
 
 # 📌 Blueprint 생성
 timeline_bp = Blueprint('timeline', __name__)
@@ -13,8 +14,7 @@ def require_token_for_user_bp():
 # 📌 특정 고객의 타임라인 조회 API (GET)
 @timeline_bp.route('/timeline/<int:customer_id>', methods=['GET'])
 def get_timeline(customer_id):
-    connection = get_db_connection()
-    with connection.cursor() as cursor:
+    with get_db().cursor() as cursor:
         sql = """
         SELECT 
             t.timeline_id, 
@@ -31,8 +31,7 @@ def get_timeline(customer_id):
         """
         cursor.execute(sql, (customer_id,))
         timeline_data = cursor.fetchall()
-    
-    connection.close()
+
     return jsonify(timeline_data), 200
 
 # 📌 새로운 타임라인 데이터 추가 API (POST)
@@ -45,7 +44,7 @@ def add_timeline_entry():
     if not all(field in data for field in required_fields):
         return jsonify({'error': '필수 입력 값이 누락되었습니다!'}), 400
 
-    connection = get_db_connection()
+    connection = get_db()
     with connection.cursor() as cursor:
         sql = """
         INSERT INTO timeline (cust_id, category, event_date, description, person, amount)
@@ -60,6 +59,7 @@ def add_timeline_entry():
             data.get('amount')  # NULL 허용
         ))
         connection.commit()
+        customer_cache.invalidate(data['customer_id'])  # 고객 상세 캐시 무효화
 
         # 새로 추가된 데이터 가져오기
         cursor.execute("SELECT LAST_INSERT_ID() AS last_id")
@@ -72,7 +72,6 @@ def add_timeline_entry():
             WHERE t.timeline_id = %s
         """, (last_id,))
         new_entry = cursor.fetchone()
-    
-    connection.close()
+
     return jsonify(new_entry), 201
 
@@ -1,4 +1,7 @@
 from models.database import get_db_connection
+from models.pagination import Pagination
+from extensions import autocomplete
+from routes.customers import invalidate_customers_of_user
 from flask import Blueprint, request, jsonify
 import logging
 import bcrypt
@@ -46,6 +49,7 @@ def create_user():
     user_id = cursor.lastrowid
     cursor.close()
     conn.close()
+    autocomplete.changed("users", user_id)  # 🔎 자동완성 색인 갱신
 
     return jsonify({'message': 'User created successfully', 'user_id': user_id}), 201
 
@@ -137,6 +141,8 @@ def update_user(user_id):
     conn.commit()
     cursor.close()
     conn.close()
+    autocomplete.changed("users", user_id)  # 🔎 자동완성 색인 갱신
+    invalidate_customers_of_user(user_id)  # 고객 상세 캐시의 이메일/이름
 
     return jsonify({'message': 'User updated successfully'}), 200
 
@@ -150,24 +156,31 @@ def delete_user(user_id):
     conn.commit()
     cursor.close()
     conn.close()
+    autocomplete.changed("users", user_id)  # 🔎 자동완성 색인 갱신
+    invalidate_customers_of_user(user_id)  # 고객 상세 캐시의 이메일/이름
 
     return jsonify({'message': 'User deleted successfully'}), 200
 
 
 @users_bp.route('/users', methods=['GET'])
 def get_users():
+    try:
+        pagination = Pagination([("usr_id", "usr_id", "ASC")])
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+
     conn = get_db_connection()
     cursor = conn.cursor()
 
-    cursor.execute("SELECT * FROM user;", ())
-    user = cursor.fetchall()
+    cursor_sql, params = pagination.where()
+    order_sql, order_params = pagination.order_limit()
+    cursor.execute("SELECT * FROM user WHERE 1=1" + cursor_sql + order_sql, params + order_params)
+    user, page_info = pagination.result(cursor.fetchall())
     cursor.close()
     conn.close()
 
-    if user:
-        return jsonify({'result': 'success', "data" : user}), 200
-    else:
-        return jsonify({'message': 'User not found'}), 404
+    # 빈 페이지도 정상 응답 (마지막 페이지 다음 등)
+    return jsonify({'result': 'success', "data" : user, "pagination": page_info}), 200
     
 
 
@@ -267,6 +280,8 @@ def update_my_info():
     try:
         cursor.execute(query, tuple(values))
         conn.commit()
+        autocomplete.changed("users", usr_id)  # 🔎 자동완성 색인 갱신
+        invalidate_customers_of_user(usr_id)  # 고객 상세 캐시의 이메일/이름
 
         # 수정된 결과 다시 조회해서 반환
         cursor.execute("SELECT usr_id, login_id, name, role_cd, depart_cd, email, phone, position FROM user WHERE usr_id = %s", (usr_id,))
@@ -367,6 +382,7 @@ def update_user_role():
         """, (role_id, user_id))
 
         conn.commit()
+        autocomplete.changed("users", user_id)  # 🔎 자동완성 색인 갱신
         return jsonify({"result": "success"}), 200
 
     except Exception as e:
@@ -0,0 +1,159 @@
+import os
+import uuid
+import shutil
+import hashlib
+import logging
+
+# 📌 내용 주소(content-addressed) 첨부파일 저장소 설정
+BLOB_DIR = 'blobs'        # UPLOAD_FOLDER 아래 blob 폴더 → blobs/ab/<sha256>
+_HASH_BUFFER = 1024 * 1024
+
+# 📌 blob 참조 수 테이블: file_blobs (배포 시 migrations/001_file_blobs.sql 로 생성)
+#   - storage_name: files.unique_file_name 과 같은 값 (UPLOAD_FOLDER 기준 상대 경로)
+#   - ref_count: 이 blob 을 가리키는 files 행 수
+#   - 예전 방식(UUID 파일명)으로 저장된 파일은 행이 없음 → 참조 1개로 취급, 복사될 때 등록
+
+
+class BlobStore:
+    """
+    같은 내용의 파일은 한 번만 저장하는 첨부파일 저장소
+    - 파일명 = 내용 sha256 → 같은 데이터시트를 여러 견적에 올려도 디스크에는 하나
+    - files 행이 늘고 줄 때 file_blobs.ref_count 를 같이 올리고 내림 (같은 트랜잭션)
+    - ref_count 가 0 이 된 blob 은 커밋이 끝난 뒤 discard() 로 실제 파일 삭제
+    - 같은 blob 에 대한 변경은 file_blobs 행 잠금으로 순서가 정해짐 → 삭제와 업로드가 겹쳐도 파일이 사라지지 않음
+    """
+
+    def __init__(self, root, connect, temp_dir=None):
+        self.root = root
+        self.temp_dir = temp_dir or os.path.join(root, '.staging')
+        self._connect = connect
+        os.makedirs(os.path.join(root, BLOB_DIR), exist_ok=True)
+        os.makedirs(self.temp_dir, exist_ok=True)
+
+    def path(self, storage_name):
+        return os.path.join(self.root, storage_name)
+
+    # ✅ 저장
+    def write_temp(self, stream):
+        """
+        업로드 스트림 → 임시 파일 (읽으면서 sha256 계산, 파일을 다시 읽지 않음)
+        - 반환: (임시 경로, sha256, 크기) - 임시 파일은 호출한 쪽에서 삭제
+        """
+        tmp_path = os.path.join(self.temp_dir, f'{uuid.uuid4().hex}.upload')
+        digest = hashlib.sha256()
+        size = 0
+        with open(tmp_path, 'wb') as f:
+            for block in iter(lambda: stream.read(_HASH_BUFFER), b''):
+                f.write(block)
+                digest.update(block)
+                size += len(block)
+        return tmp_path, digest.hexdigest(), size
+
+    @staticmethod
+    def hash_file(path):
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(_HASH_BUFFER), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def put(self, cursor, src_path, sha256=None, size=None):
+        """
+        src_path 내용을 blob 으로 등록하고 참조 +1 → storage_name 반환
+        - 이미 같은 내용이 있으면 참조만 늘리고 파일은 그대로
+        - 없으면 하드링크(같은 파일시스템)로 넣음 → src_path 는 그대로 남으므로 호출한 쪽에서 정리
+        - 커밋 전에 실패하면 blob 파일만 남을 수 있는데, 다음에 같은 내용이 올라오면 그대로 다시 사용됨
+        """
+        sha256 = sha256 or self.hash_file(src_path)
+        size = os.path.getsize(src_path) if size is None else size
+        storage_name = f'{BLOB_DIR}/{sha256[:2]}/{sha256}'
+
+        # 행 잠금을 잡은 상태에서 파일 확인 → 같은 blob 을 지우는 요청과 겹치지 않음
+        cursor.execute("""
+            INSERT INTO file_blobs (storage_name, size, ref_count) VALUES (%s, %s, 1)
+            ON DUPLICATE KEY UPDATE ref_count = ref_count + 1
+        """, (storage_name, size))
+
+        blob_path = self.path(storage_name)
+        if not os.path.exists(blob_path):
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            tmp_path = f'{blob_path}.{uuid.uuid4().hex}.tmp'
+            try:
+                os.link(src_path, tmp_path)
+            except OSError:
+                shutil.copyfile(src_path, tmp_path)  # 다른 파일시스템이면 복사
+            os.replace(tmp_path, blob_path)
+            logging.info(f"📁 새 blob 저장: {storage_name} ({size} bytes)")
+        else:
+            logging.info(f"📁 중복 파일 - 기존 blob 재사용: {storage_name}")
+        return storage_name
+
+    # ✅ 참조 관리
+    def add_refs(self, cursor, storage_names):
+        """
+        기존 blob 을 가리키는 files 행을 새로 만들 때 (복사) - 파일은 건드리지 않고 참조 수만 증가
+        - 예전 방식으로 저장된 파일은 현재 files 행 수를 참조 수로 해서 처음 등록
+        """
+        counts = {}
+        for storage_name in storage_names:
+            counts[storage_name] = counts.get(storage_name, 0) + 1
+
+        for storage_name, count in counts.items():
+            cursor.execute("""
+                SELECT ref_count FROM file_blobs WHERE storage_name = %s FOR UPDATE
+            """, (storage_name,))
+            if cursor.fetchone() is None:
+                cursor.execute("""
+                    INSERT INTO file_blobs (storage_name, size, ref_count)
+                    SELECT %s, %s, COUNT(*) FROM files WHERE unique_file_name = %s
+                """, (storage_name, os.path.getsize(self.path(storage_name)), storage_name))
+        cursor.executemany("""
+            UPDATE file_blobs SET ref_count = ref_count + %s WHERE storage_name = %s
+        """, [(count, storage_name) for storage_name, count in counts.items()])
+
+    def release(self, cursor, storage_name):
+        """
+        files 행 하나를 지울 때 참조 -1
+        - 반환: 참조가 0 이 된 blob 이름 목록 → 호출한 쪽이 커밋한 뒤 discard() 로 파일 삭제
+          (커밋 전에 지우면 롤백됐을 때 files 행만 남고 파일이 없어짐)
+        """
+        cursor.execute("""
+            SELECT ref_count FROM file_blobs WHERE storage_name = %s FOR UPDATE
+        """, (storage_name,))
+        row = cursor.fetchone()
+        if row is not None and row["ref_count"] > 1:
+            cursor.execute("""
+                UPDATE file_blobs SET ref_count = ref_count - 1 WHERE storage_name = %s
+            """, (storage_name,))
+            return []
+
+        if row is not None:
+            cursor.execute("DELETE FROM file_blobs WHERE storage_name = %s", (storage_name,))
+        return [storage_name]
+
+    def discard(self, storage_names):
+        """
+        release() 가 돌려준 blob 파일 삭제 (커밋 후 호출)
+        - 별도 트랜잭션에서 행을 다시 잠그고 확인 → 그 사이 같은 내용이 다시 올라왔으면(put) 파일 유지
+        - 실패해도 참조 없는 파일이 남을 뿐이므로 로그만 남김
+        """
+        if not storage_names:
+            return
+        conn = self._connect()
+        try:
+            with conn.cursor() as cursor:
+                for storage_name in storage_names:
+                    cursor.execute("""
+                        SELECT ref_count FROM file_blobs WHERE storage_name = %s FOR UPDATE
+                    """, (storage_name,))
+                    if cursor.fetchone() is None:
+                        try:
+                            os.remove(self.path(storage_name))
+                        except FileNotFoundError:
+                            pass
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            logging.exception(f"⚠️ blob 파일 삭제 실패 (파일만 남음): {storage_names}")
+        finally:
+            conn.close()
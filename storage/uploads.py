@@ -0,0 +1,188 @@
+import os
+import json
+import time
+import uuid
+import fcntl
+import hashlib
+import logging
+
+# 📌 분할(이어받기) 업로드 설정
+CHUNK_SIZE = 4 * 1024 * 1024                # 클라이언트에 권장하는 조각 크기
+CHUNK_MAX_BYTES = 16 * 1024 * 1024          # 조각 1개 최대 크기
+CHUNKED_UPLOAD_MAX_BYTES = 2 * 1024 ** 3    # 파일 1개 최대 크기
+CHUNKED_UPLOAD_TTL = 24 * 60 * 60           # 완료되지 않은 업로드 보관 시간(초)
+_COPY_BUFFER = 64 * 1024
+
+
+class UploadError(Exception):
+    """분할 업로드 요청 오류 - status 는 응답 HTTP 코드"""
+
+    def __init__(self, message, status=400, **extra):
+        super().__init__(message)
+        self.status = status
+        self.extra = extra
+
+
+class ChunkedUploads:
+    """
+    분할 업로드 스테이징 저장소
+    - init → 조각(offset 지정) 업로드 반복 → complete 순서
+    - 받은 데이터는 staging_dir/<uploadId>.part 에 이어 붙이고, 상태는 <uploadId>.json 에 저장
+      → 같은 서버의 어느 워커로 요청이 가도 이어서 받을 수 있음
+    - 연결이 끊겨도 GET 상태 조회로 받은 offset 을 확인해서 그 뒤부터 다시 보내면 됨
+    """
+
+    def __init__(self, staging_dir, ttl=CHUNKED_UPLOAD_TTL):
+        self.staging_dir = staging_dir
+        self.ttl = ttl
+        os.makedirs(staging_dir, exist_ok=True)
+
+    def _state_path(self, upload_id):
+        return os.path.join(self.staging_dir, f'{upload_id}.json')
+
+    def part_path(self, upload_id):
+        return os.path.join(self.staging_dir, f'{upload_id}.part')
+
+    def _write_state(self, state):
+        tmp_path = self._state_path(state['uploadId']) + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp_path, self._state_path(state['uploadId']))
+
+    def get(self, upload_id):
+        """업로드 상태 (없으면 None) - offset 은 실제로 받은 바이트 수"""
+        try:
+            uuid.UUID(hex=upload_id)
+        except ValueError:
+            return None
+        try:
+            with open(self._state_path(upload_id), encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        try:
+            state['offset'] = os.path.getsize(self.part_path(upload_id))
+        except OSError:
+            state['offset'] = 0
+        return state
+
+    def init(self, file_name, file_size, unty_file_no=None, checksum=None):
+        if not file_name:
+            raise UploadError('파일명이 없습니다.')
+        if not isinstance(file_size, int) or file_size < 0:
+            raise UploadError('파일 크기가 올바르지 않습니다.')
+        if file_size > CHUNKED_UPLOAD_MAX_BYTES:
+            raise UploadError(f'파일은 최대 {CHUNKED_UPLOAD_MAX_BYTES // 1024 ** 2}MB 까지 업로드할 수 있습니다.', 413)
+
+        self._cleanup()
+        upload_id = uuid.uuid4().hex
+        open(self.part_path(upload_id), 'wb').close()
+        state = {
+            'uploadId': upload_id,
+            'fileName': file_name,
+            'fileSize': file_size,
+            'untyFileNo': unty_file_no,
+            'checksum': checksum.lower() if checksum else None,  # 파일 전체 sha256 (선택)
+            'createdAt': time.time(),
+        }
+        self._write_state(state)
+        state['offset'] = 0
+        return state
+
+    def write_chunk(self, upload_id, offset, stream, length, checksum=None):
+        """
+        offset 위치에 조각 기록
+        - offset 은 지금까지 받은 크기 이하여야 함 (건너뛰기는 409)
+        - 이미 받은 구간과 겹치는 재전송은 저장된 바이트와 비교만 하고 건너뜀 → 뒤에 받은 조각은 그대로
+          (겹치는 구간 내용이 다르면 409)
+        - checksum(조각 sha256) 이 맞지 않거나 덜 받으면 이번에 새로 붙인 부분만 버림 (422 / 400)
+        """
+        state = self.get(upload_id)
+        if state is None:
+            raise UploadError('업로드를 찾을 수 없습니다.', 404)
+        if length is None or length > CHUNK_MAX_BYTES:
+            raise UploadError(f'조각은 최대 {CHUNK_MAX_BYTES // 1024 ** 2}MB 까지 보낼 수 있습니다.', 413)
+        if offset + length > state['fileSize']:
+            raise UploadError('파일 크기를 넘는 조각입니다.', 416)
+
+        with open(self.part_path(upload_id), 'r+b') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)  # 같은 업로드에 조각이 동시에 들어와도 순서대로
+            try:
+                current = os.fstat(f.fileno()).st_size
+                if offset > current:
+                    raise UploadError('이전 조각이 아직 도착하지 않았습니다.', 409, offset=current)
+
+                digest = hashlib.sha256()
+                received = 0
+                f.seek(offset)
+                while received < length:
+                    data = stream.read(min(_COPY_BUFFER, length - received))
+                    if not data:
+                        break
+                    position = offset + received
+                    if position < current:
+                        # 🔎 이미 받은 구간 → 저장된 내용과 같은지만 확인
+                        overlap = data[:current - position]
+                        if f.read(len(overlap)) != overlap:
+                            f.truncate(current)  # 겹치는 구간 뒤에 붙인 바이트가 있으면 되돌림
+                            raise UploadError('이미 받은 구간과 내용이 다른 조각입니다.', 409, offset=current)
+                        f.write(data[len(overlap):])
+                    else:
+                        f.write(data)
+                    digest.update(data)
+                    received += len(data)
+
+                if received != length:
+                    f.truncate(current)
+                    raise UploadError('조각이 끝까지 전송되지 않았습니다.', 400, offset=current)
+                if checksum and digest.hexdigest() != checksum.lower():
+                    f.truncate(current)
+                    raise UploadError('조각 checksum 이 일치하지 않습니다.', 422, offset=current)
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+        os.utime(self._state_path(upload_id))  # 진행 중인 업로드는 TTL 정리 대상에서 제외
+        state['offset'] = max(current, offset + length)
+        return state
+
+    def verify(self, upload_id):
+        """
+        완료 전 검증 - 모든 조각을 받았는지, 파일 전체 sha256 이 맞는지
+        - 반환: 업로드 상태 (fileName, untyFileNo ...)
+        """
+        state = self.get(upload_id)
+        if state is None:
+            raise UploadError('업로드를 찾을 수 없습니다.', 404)
+        if state['offset'] != state['fileSize']:
+            raise UploadError('아직 모든 조각을 받지 못했습니다.', 409, offset=state['offset'])
+
+        part_path = self.part_path(upload_id)
+        if state.get('checksum'):
+            digest = hashlib.sha256()
+            with open(part_path, 'rb') as f:
+                for block in iter(lambda: f.read(1024 * 1024), b''):
+                    digest.update(block)
+            if digest.hexdigest() != state['checksum']:
+                raise UploadError('파일 checksum 이 일치하지 않습니다.', 422)
+        return state
+
+    def abort(self, upload_id):
+        for path in (self.part_path(upload_id), self._state_path(upload_id)):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _cleanup(self):
+        """TTL 지난 미완료 업로드 정리"""
+        expire_before = time.time() - self.ttl
+        try:
+            for entry in os.scandir(self.staging_dir):
+                if entry.is_file() and entry.stat().st_mtime < expire_before:
+                    try:
+                        os.remove(entry.path)
+                    except OSError:
+                        pass
+        except OSError:
+            logging.exception("분할 업로드 스테이징 정리 실패")
@@ -0,0 +1,98 @@
+"""
+테스트용 로컬 SMTP 서버 (표준 라이브러리만 사용 - 별도 패키지 없이 항상 실행)
+- EHLO/HELO, MAIL, RCPT, DATA, RSET, NOOP, QUIT 만 지원
+- rcpt_responses / data_responses: 앞에서부터 하나씩 꺼내 응답 (비면 250)
+  '451 ...' 같은 실패 응답을 넣으면 그만큼 실패 후 성공
+"""
+import time
+import threading
+import socketserver
+
+
+class SmtpStub:
+    def __init__(self, rcpt_responses=(), data_responses=()):
+        self.rcpt_responses = list(rcpt_responses)
+        self.data_responses = list(data_responses)
+        self.attempts = []   # DATA 끝(또는 RCPT 거부)까지 온 발송 시도 시각
+        self.delivered = []  # (연결 번호, 원문)
+        self.connections = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                stub._session(self.rfile, self.wfile)
+
+        self._server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _next(self, responses):
+        with self._lock:
+            return responses.pop(0) if responses else '250 OK'
+
+    def _session(self, rfile, wfile):
+        with self._lock:
+            self.connections += 1
+            connection = self.connections
+
+        def reply(line):
+            wfile.write(line.encode() + b'\r\n')
+            wfile.flush()
+
+        reply('220 stub ESMTP')
+        accepted = 0
+        while True:
+            line = rfile.readline()
+            if not line:
+                return
+            command = line.decode(errors='replace').strip().upper()
+            if command.startswith('EHLO'):
+                reply('250-stub')
+                reply('250 8BITMIME')
+            elif command.startswith('HELO') or command.startswith('NOOP'):
+                reply('250 OK')
+            elif command.startswith('MAIL'):
+                accepted = 0
+                reply('250 OK')
+            elif command.startswith('RCPT'):
+                response = self._next(self.rcpt_responses)
+                if response.startswith('250'):
+                    accepted += 1
+                else:
+                    with self._lock:
+                        self.attempts.append(time.monotonic())
+                reply(response)
+            elif command.startswith('RSET'):
+                accepted = 0
+                reply('250 OK')
+            elif command.startswith('DATA'):
+                if not accepted:
+                    reply('503 no valid recipients')
+                    continue
+                reply('354 End data with <CR><LF>.<CR><LF>')
+                lines = []
+                while True:
+                    data = rfile.readline()
+                    if not data or data == b'.\r\n':
+                        break
+                    lines.append(data[1:] if data.startswith(b'..') else data)
+                response = self._next(self.data_responses)
+                with self._lock:
+                    self.attempts.append(time.monotonic())
+                    if response.startswith('250'):
+                        self.delivered.append((connection, b''.join(lines)))
+                reply(response)
+            elif command.startswith('QUIT'):
+                reply('221 Bye')
+                return
+            else:
+                reply('502 Command not implemented')
@@ -0,0 +1,70 @@
+"""
+autocomplete.index 테스트
+- 초성 변환 / 검색 키 (중간 단어부터도 검색)
+- PrefixIndex 앞글자 검색, 초성 검색, 정렬, upsert/remove
+"""
+from autocomplete.index import PrefixIndex, to_choseong, is_choseong_query, prefix_keys
+
+
+def _index():
+    index = PrefixIndex()
+    index.replace([
+        (1, {"id": 1, "name": "잇신정보"}, [(0, "잇신정보")]),
+        (2, {"id": 2, "name": "잇신 정보통신"}, [(0, "잇신 정보통신")]),
+        (3, {"id": 3, "name": "Alpha Corp"}, [(0, "Alpha Corp"), (1, "정보팀")]),
+        (4, {"id": 4, "name": "잇신"}, [(0, "잇신")]),
+    ])
+    return index
+
+
+def _ids(records):
+    return [record["id"] for record in records]
+
+
+def test_to_choseong():
+    assert to_choseong("잇신정보 A1") == "ㅇㅅㅈㅂ A1"
+    assert is_choseong_query("ㅇㅅ")
+    assert not is_choseong_query("ㅇ신")
+
+
+def test_prefix_keys_include_later_words():
+    assert prefix_keys("잇신 정보통신") == ["잇신정보통신", "정보통신"]
+    assert prefix_keys("(주) Alpha-Corp") == ["(주)alpha-corp", "alphacorp", "corp"]
+    assert prefix_keys("  ") == []
+
+
+def test_prefix_search_ranks_exact_match_then_priority_then_length():
+    assert _ids(_index().search("잇신", 10)) == [4, 1, 2]
+    assert _ids(_index().search("정보", 10)) == [2, 3]
+
+
+def test_search_ignores_case_and_spaces():
+    assert _ids(_index().search("alpha c", 10)) == [3]
+    assert _ids(_index().search("CORP", 10)) == [3]
+
+
+def test_choseong_search():
+    index = _index()
+
+    assert _ids(index.search("ㅇㅅ", 10)) == [4, 1, 2]
+    assert _ids(index.search("ㅈㅂㅌ", 10)) == [3, 2]  # 정보팀(키 전체 일치) → 정보통신
+
+
+def test_limit_and_accept_filter():
+    index = _index()
+
+    assert _ids(index.search("잇신", 2)) == [4, 1]
+    assert _ids(index.search("잇신", 10, accept=lambda record: record["id"] != 4)) == [1, 2]
+
+
+def test_upsert_replaces_keys_and_remove_drops_record():
+    index = _index()
+
+    index.upsert(1, {"id": 1, "name": "베타"}, [(0, "베타")])
+    assert _ids(index.search("잇신", 10)) == [4, 2]
+    assert _ids(index.search("ㅂㅌ", 10)) == [1]
+
+    index.remove(4)
+    assert _ids(index.search("잇신", 10)) == [2]
+    assert len(index) == 3
+    assert index.search("", 10) == []
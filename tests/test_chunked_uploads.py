@@ -0,0 +1,125 @@
+"""
+storage.uploads.ChunkedUploads 테스트
+- 순서대로 받은 조각 이어 붙이기
+- 이미 받은 조각 재전송 → 뒤에 받은 데이터는 그대로 (멱등)
+- 건너뛴 offset / 겹치는 구간 내용이 다름 → 409
+- 조각 checksum 불일치 → 422, 덜 받은 조각 → 400 (새로 붙인 부분만 버림)
+"""
+import io
+import hashlib
+
+import pytest
+
+from storage.uploads import ChunkedUploads, UploadError
+
+DATA = bytes(range(256)) * 4  # 1024 bytes
+
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _write(uploads, upload_id, offset, data, checksum=None, length=None):
+    return uploads.write_chunk(
+        upload_id, offset, io.BytesIO(data), len(data) if length is None else length, checksum=checksum,
+    )
+
+
+def _stored(uploads, upload_id):
+    with open(uploads.part_path(upload_id), 'rb') as f:
+        return f.read()
+
+
+@pytest.fixture
+def uploads(tmp_path):
+    return ChunkedUploads(str(tmp_path))
+
+
+@pytest.fixture
+def upload_id(uploads):
+    return uploads.init('a.bin', len(DATA), checksum=_sha256(DATA))['uploadId']
+
+
+def test_chunks_in_order_complete(uploads, upload_id):
+    for offset in range(0, len(DATA), 256):
+        state = _write(uploads, upload_id, offset, DATA[offset:offset + 256], checksum=_sha256(DATA[offset:offset + 256]))
+        assert state['offset'] == offset + 256
+
+    assert uploads.verify(upload_id)['fileName'] == 'a.bin'
+    assert _stored(uploads, upload_id) == DATA
+
+
+def test_resend_of_earlier_chunk_keeps_later_data(uploads, upload_id):
+    _write(uploads, upload_id, 0, DATA[:512])
+    _write(uploads, upload_id, 512, DATA[512:768])
+
+    state = _write(uploads, upload_id, 256, DATA[256:512])
+
+    assert state['offset'] == 768
+    assert uploads.get(upload_id)['offset'] == 768
+    assert _stored(uploads, upload_id) == DATA[:768]
+
+
+def test_resend_overlapping_the_tail_appends_the_rest(uploads, upload_id):
+    _write(uploads, upload_id, 0, DATA[:300])
+
+    state = _write(uploads, upload_id, 256, DATA[256:512])
+
+    assert state['offset'] == 512
+    assert _stored(uploads, upload_id) == DATA[:512]
+
+
+def test_skipped_offset_is_conflict(uploads, upload_id):
+    _write(uploads, upload_id, 0, DATA[:256])
+
+    with pytest.raises(UploadError) as e:
+        _write(uploads, upload_id, 512, DATA[512:768])
+
+    assert e.value.status == 409
+    assert e.value.extra == {'offset': 256}
+    assert _stored(uploads, upload_id) == DATA[:256]
+
+
+def test_resend_with_different_content_is_conflict(uploads, upload_id):
+    _write(uploads, upload_id, 0, DATA[:512])
+
+    with pytest.raises(UploadError) as e:
+        _write(uploads, upload_id, 256, b'\x00' * 512)
+
+    assert e.value.status == 409
+    assert _stored(uploads, upload_id) == DATA[:512]
+
+
+def test_checksum_mismatch_discards_only_new_bytes(uploads, upload_id):
+    _write(uploads, upload_id, 0, DATA[:512])
+
+    with pytest.raises(UploadError) as e:
+        _write(uploads, upload_id, 256, DATA[256:768], checksum=_sha256(b'other'))
+
+    assert e.value.status == 422
+    assert e.value.extra == {'offset': 512}
+    assert _stored(uploads, upload_id) == DATA[:512]
+
+
+def test_short_chunk_is_rolled_back(uploads, upload_id):
+    _write(uploads, upload_id, 0, DATA[:256])
+
+    with pytest.raises(UploadError) as e:
+        _write(uploads, upload_id, 256, DATA[256:300], length=256)
+
+    assert e.value.status == 400
+    assert _stored(uploads, upload_id) == DATA[:256]
+
+
+def test_verify_requires_all_chunks_and_file_checksum(uploads, tmp_path):
+    upload_id = uploads.init('b.bin', 512, checksum=_sha256(b'\x01' * 512))['uploadId']
+    _write(uploads, upload_id, 0, DATA[:256])
+
+    with pytest.raises(UploadError) as e:
+        uploads.verify(upload_id)
+    assert e.value.status == 409
+
+    _write(uploads, upload_id, 256, DATA[256:512])
+    with pytest.raises(UploadError) as e:
+        uploads.verify(upload_id)
+    assert e.value.status == 422
@@ -0,0 +1,62 @@
+"""
+routes.customers 검색 조건 테스트
+- text_filter: 검색어 전체 포함(LIKE) + 2글자 이상 토큰은 FULLTEXT 로 후보 좁히기
+- biz_num_prefixes / biz_num_filter: 하이픈 있는/없는 사업자등록번호
+"""
+import pytest
+
+import routes.customers as customers
+from routes.customers import text_filter, biz_num_prefixes, biz_num_filter
+
+
+@pytest.fixture
+def fulltext(monkeypatch):
+    def set_available(available):
+        monkeypatch.setattr(customers.customer_search_indexes, 'available', lambda: available)
+    return set_available
+
+
+def test_empty_text_adds_no_condition(fulltext):
+    fulltext(True)
+    assert text_filter("customer_nm", "   ") == ("", [])
+
+
+def test_single_character_is_substring_match(fulltext):
+    fulltext(True)
+    assert text_filter("customer_nm", "x") == (" AND customer_nm LIKE %s", ["%x%"])
+
+
+def test_long_tokens_use_fulltext_and_keep_literal_phrase(fulltext):
+    fulltext(True)
+    sql, params = text_filter("customer_nm", "잇신  정보 a")
+
+    assert sql == " AND MATCH(customer_nm) AGAINST (%s IN BOOLEAN MODE) AND customer_nm LIKE %s"
+    assert params == ['+"잇신" +"정보"', "%잇신 정보 a%"]
+
+
+def test_without_index_falls_back_to_like(fulltext):
+    fulltext(False)
+    assert text_filter("mng_nm", "홍길동") == (" AND mng_nm LIKE %s", ["%홍길동%"])
+
+
+def test_like_wildcards_are_escaped(fulltext):
+    fulltext(False)
+    assert text_filter("customer_nm", "100%_a") == (" AND customer_nm LIKE %s", ["%100\\%\\_a%"])
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("123", ["123%"]),
+    ("12345", ["123-45%", "12345%"]),
+    ("123-45-67", ["123-45-67%", "1234567%"]),
+    ("abc", []),
+    (None, []),
+])
+def test_biz_num_prefixes(text, expected):
+    assert biz_num_prefixes(text) == expected
+
+
+def test_biz_num_filter_matches_digits_regardless_of_hyphens():
+    sql, params = biz_num_filter("45-67")
+
+    assert sql == " AND (biz_num LIKE %s OR REPLACE(biz_num, '-', '') LIKE %s)"
+    assert params == ["%45-67%", "%4567%"]
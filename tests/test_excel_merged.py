@@ -0,0 +1,82 @@
+"""
+excel.merged.MergedCellIndex 테스트
+- 병합 범위 안의 셀에 쓰면 왼쪽 위 셀에 기록
+- delete_rows: 아래쪽 병합 범위 이동 / 걸친 범위 축소 / 삭제 구간 안의 범위 제거
+"""
+from openpyxl import Workbook
+
+from excel.merged import MergedCellIndex
+
+
+def _sheet(*ranges):
+    ws = Workbook().active
+    for merged_range in ranges:
+        ws.merge_cells(merged_range)
+    return ws
+
+
+def _merged(ws):
+    return sorted(r.coord for r in ws.merged_cells.ranges)
+
+
+def test_existing_ranges_are_indexed():
+    merged = MergedCellIndex(_sheet("B2:D3"))
+
+    assert merged.find("C3").coord == "B2:D3"
+    assert merged.find("E3") is None
+
+
+def test_write_into_merged_range_goes_to_top_left():
+    ws = _sheet("B2:D3")
+    merged = MergedCellIndex(ws)
+
+    merged.write("C3", "값")
+    merged.write("A1", "밖")
+
+    assert ws["B2"].value == "값"
+    assert ws["A1"].value == "밖"
+
+
+def test_merge_registers_range_once():
+    ws = _sheet()
+    merged = MergedCellIndex(ws)
+
+    merged.merge("A1", "C1", "제목")
+    merged.merge("A1", "C1", "제목2")
+
+    assert _merged(ws) == ["A1:C1"]
+    assert ws["A1"].value == "제목2"
+    assert merged.find("B1").coord == "A1:C1"
+
+
+def test_delete_rows_moves_ranges_below():
+    ws = _sheet("A1:B1", "A5:C6")
+    merged = MergedCellIndex(ws)
+
+    merged.delete_rows(2, 2)
+
+    assert _merged(ws) == ["A1:B1", "A3:C4"]
+    assert merged.find("B3").coord == "A3:C4"
+    assert merged.find("B5") is None
+
+
+def test_delete_rows_shrinks_overlapping_range():
+    ws = _sheet("A2:B6")
+    merged = MergedCellIndex(ws)
+
+    merged.delete_rows(3, 2)
+
+    assert _merged(ws) == ["A2:B4"]
+    assert merged.find("B4").coord == "A2:B4"
+    assert merged.find("A5") is None
+
+
+def test_delete_rows_drops_ranges_inside_or_reduced_to_one_cell():
+    ws = _sheet("A3:C4", "D2:D3", "E1:F1")
+    merged = MergedCellIndex(ws)
+
+    merged.delete_rows(3, 2)
+
+    assert _merged(ws) == ["E1:F1"]
+    assert merged.find("B3") is None
+    assert merged.find("D2") is None
@@ -0,0 +1,55 @@
+"""
+routes.files ZIP 스트리밍 테스트
+- _ZipStream: 쓴 바이트를 모아뒀다가 pop() 으로 넘겨줌
+- generate_zip: 조각으로 생성한 바이트가 올바른 ZIP 인지, 없는 파일은 건너뛰는지, 조각 크기가 제한되는지
+"""
+import io
+import os
+import zipfile
+
+import routes.files as files
+from routes.files import _ZipStream, _unique_arcname, generate_zip
+
+
+def test_zip_stream_pop_returns_written_bytes_once():
+    stream = _ZipStream()
+
+    assert stream.writable()
+    assert stream.write(b"ab") == 2
+    stream.write(memoryview(b"cd"))
+
+    assert stream.pop() == b"abcd"
+    assert stream.pop() == b""
+
+
+def test_unique_arcname():
+    used = set()
+
+    assert [_unique_arcname(name, used) for name in ("a.pdf", "a.pdf", "a.pdf", "b")] == \
+        ["a.pdf", "a (2).pdf", "a (3).pdf", "b"]
+
+
+def test_generate_zip_streams_valid_archive(tmp_path, monkeypatch):
+    monkeypatch.setattr(files, "ZIP_READ_CHUNK", 1024)
+    big = os.urandom(10 * 1024)
+    (tmp_path / "big.bin").write_bytes(big)
+    (tmp_path / "small.txt").write_bytes("견적서".encode())
+
+    chunks = list(generate_zip([
+        ("큰 파일.bin", str(tmp_path / "big.bin")),
+        ("없는 파일.txt", str(tmp_path / "missing.txt")),
+        ("small.txt", str(tmp_path / "small.txt")),
+    ]))
+
+    assert max(len(chunk) for chunk in chunks) < 2 * 1024  # 파일 전체가 아니라 읽은 조각 단위로 내보냄
+    with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as zf:
+        assert zf.testzip() is None
+        assert zf.namelist() == ["큰 파일.bin", "small.txt"]
+        assert zf.read("큰 파일.bin") == big
+        assert zf.read("small.txt") == "견적서".encode()
+        assert all(info.compress_type == zipfile.ZIP_STORED for info in zf.infolist())
+
+
+def test_generate_zip_without_files_is_empty_archive():
+    with zipfile.ZipFile(io.BytesIO(b"".join(generate_zip([])))) as zf:
+        assert zf.namelist() == []
@@ -0,0 +1,158 @@
+"""
+mailer.queue.MailQueue 테스트 - 로컬 SMTP 서버(tests/smtp_stub.py)로 실제 발송
+- 같은 SMTP 연결로 여러 메일 발송
+- 일시적 오류(4xx) 재시도 + 지수 백오프
+- 수신자 일시 거부(4xx, 그레이리스팅 등)도 재시도
+- 영구 오류(5xx) / 재시도 초과 → dead letter
+"""
+import os
+import json
+import time
+
+import pytest
+from flask import Flask
+from flask_mail import Mail, Message
+
+import mailer.queue as mail_queue_module
+from mailer.queue import MailQueue
+from smtp_stub import SmtpStub
+
+
+def _wait_for(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+@pytest.fixture
+def smtp_server():
+    servers = []
+
+    def start(**responses):
+        server = SmtpStub(**responses).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+@pytest.fixture
+def make_queue(tmp_path, monkeypatch):
+    # 발송 스레드 1개 → 모든 메일이 같은 연결을 쓰는지 확인 가능 / 재시도 대기는 짧게
+    monkeypatch.setattr(mail_queue_module, 'MAIL_WORKERS', 1)
+    monkeypatch.setattr(mail_queue_module, 'MAIL_RETRY_BASE', 0.1)
+    monkeypatch.setattr(mail_queue_module, 'MAIL_MAX_RETRIES', 3)
+
+    def make(server):
+        app = Flask(__name__)
+        app.config.update(MAIL_SERVER='127.0.0.1', MAIL_PORT=server.port, MAIL_USE_SSL=False,
+                          MAIL_USE_TLS=False, MAIL_SUPPRESS_SEND=False)
+        Mail(app)  # 원문(MIME) 생성에 flask_mail 설정 사용 - app.py 와 같은 구성
+        mail_queue = MailQueue(app, spool_dir=str(tmp_path / 'mail'))
+        return app, mail_queue
+
+    return make
+
+
+def _message(i=0):
+    return Message(subject=f'테스트 {i}', sender='sender@example.com', recipients=['to@example.com'],
+                   body=f'본문 {i}')
+
+
+def _dead_letters(mail_queue):
+    path = os.path.join(mail_queue.spool_dir, 'dead_letter.jsonl')
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_sends_batch_over_one_connection(smtp_server, make_queue):
+    server = smtp_server()
+    app, mail_queue = make_queue(server)
+
+    with app.app_context():
+        message_ids = [mail_queue.send(_message(i)) for i in range(5)]
+
+    assert _wait_for(lambda: len(server.delivered) == 5)
+    assert len(set(message_ids)) == 5
+    assert server.connections == 1  # SMTP 연결 1개로 5건 모두 발송
+    assert mail_queue.metrics() == {'queued': 0, 'inFlight': 0, 'retrying': 0}
+
+
+def test_retries_temporary_failure_with_backoff(smtp_server, make_queue):
+    server = smtp_server(data_responses=['451 Try again later', '451 Try again later'])
+    app, mail_queue = make_queue(server)
+
+    with app.app_context():
+        mail_queue.send(_message())
+
+    assert _wait_for(lambda: len(server.delivered) == 1)
+    assert len(server.attempts) == 3
+    first_wait = server.attempts[1] - server.attempts[0]
+    second_wait = server.attempts[2] - server.attempts[1]
+    assert first_wait >= 0.1   # MAIL_RETRY_BASE
+    assert second_wait >= 0.2  # MAIL_RETRY_BASE * 2
+    assert _dead_letters(mail_queue) == []
+
+
+def test_permanent_failure_goes_to_dead_letter(smtp_server, make_queue):
+    server = smtp_server(data_responses=['550 Mailbox unavailable'])
+    app, mail_queue = make_queue(server)
+
+    with app.app_context():
+        message_id = mail_queue.send(_message())
+
+    assert _wait_for(lambda: _dead_letters(mail_queue))
+    record, = _dead_letters(mail_queue)
+    assert record['messageId'] == message_id
+    assert record['attempts'] == 1  # 영구 오류는 재시도하지 않음
+    assert record['to'] == ['to@example.com']
+    assert os.path.exists(os.path.join(mail_queue.spool_dir, 'dead_letter', f'{message_id}.eml'))
+    assert server.delivered == []
+
+
+def test_gives_up_after_max_retries(smtp_server, make_queue):
+    server = smtp_server(data_responses=['451 Try again later'] * 10)
+    app, mail_queue = make_queue(server)
+
+    with app.app_context():
+        message_id = mail_queue.send(_message())
+
+    assert _wait_for(lambda: _dead_letters(mail_queue))
+    record, = _dead_letters(mail_queue)
+    assert record['messageId'] == message_id
+    assert record['attempts'] == 3  # MAIL_MAX_RETRIES
+    assert len(server.attempts) == 3
+    assert mail_queue.metrics()['retrying'] == 0
+
+
+def test_retries_temporary_recipient_refusal(smtp_server, make_queue):
+    server = smtp_server(rcpt_responses=['450 Greylisted, try again later'])
+    app, mail_queue = make_queue(server)
+
+    with app.app_context():
+        mail_queue.send(_message())
+
+    assert _wait_for(lambda: len(server.delivered) == 1)
+    assert len(server.attempts) == 2  # 거부 1번 + 재시도 성공
+    assert _dead_letters(mail_queue) == []
+
+
+def test_permanent_recipient_refusal_goes_to_dead_letter(smtp_server, make_queue):
+    server = smtp_server(rcpt_responses=['550 No such user'])
+    app, mail_queue = make_queue(server)
+
+    with app.app_context():
+        message_id = mail_queue.send(_message())
+
+    assert _wait_for(lambda: _dead_letters(mail_queue))
+    record, = _dead_letters(mail_queue)
+    assert record['messageId'] == message_id
+    assert record['attempts'] == 1
+    assert server.delivered == []
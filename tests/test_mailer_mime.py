@@ -0,0 +1,59 @@
+"""
+mailer.mime.write_message 테스트
+- 첨부파일 없으면 flask_mail 원문 그대로
+- 첨부파일은 multipart/mixed 파트로 덧붙이고, 조각 단위로 인코딩해도 원본과 같은지
+"""
+import io
+import os
+import email
+from email import policy
+
+from flask import Flask
+from flask_mail import Mail, Message
+
+import mailer.mime as mime
+from mailer.mime import StreamAttachment, write_message
+
+app = Flask(__name__)
+app.config["MAIL_DEFAULT_SENDER"] = "sender@example.com"
+Mail(app)
+
+
+def _message():
+    return Message("견적서 송부", recipients=["to@example.com"], body="본문입니다.")
+
+
+def _render(attachments):
+    out = io.BytesIO()
+    with app.app_context():
+        write_message(_message(), attachments, out)
+    return email.message_from_bytes(out.getvalue(), policy=policy.default)
+
+
+def test_without_attachments_keeps_flask_mail_message():
+    parsed = _render([])
+
+    assert parsed["Subject"] == "견적서 송부"
+    assert parsed["To"] == "to@example.com"
+    assert parsed.get_body().get_content().strip() == "본문입니다."
+
+
+def test_attachments_are_streamed_as_parts(monkeypatch):
+    monkeypatch.setattr(mime, "ENCODE_CHUNK", 57 * 3)  # 여러 조각 + 57 배수가 아닌 나머지까지
+    data = os.urandom(1000)
+    attachments = [
+        StreamAttachment("견적서.pdf", io.BytesIO(data), len(data)),
+        StreamAttachment("memo.txt", io.BytesIO(b"hello"), 5, "text/plain"),
+    ]
+
+    parsed = _render(attachments)
+
+    assert parsed.get_content_type() == "multipart/mixed"
+    assert parsed["Subject"] == "견적서 송부"
+    assert parsed.get_body().get_content().strip() == "본문입니다."
+    parts = list(parsed.iter_attachments())
+    assert [part.get_filename() for part in parts] == ["견적서.pdf", "memo.txt"]
+    assert parts[0].get_content_type() == "application/pdf"
+    assert parts[0].get_content() == data
+    assert parts[1].get_payload(decode=True) == b"hello"
+    assert all(len(line) <= 76 for line in parts[0].get_payload().splitlines())
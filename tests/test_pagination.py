@@ -0,0 +1,90 @@
+"""
+models.pagination 테스트
+- 커서 토큰 인코딩/디코딩 (datetime/Decimal 포함)
+- page/limit, cursor 파라미터 해석과 keyset 조건
+- result() → 다음 페이지 커서로 이어서 조회
+"""
+from decimal import Decimal
+from datetime import date, datetime
+
+import pytest
+from flask import Flask
+
+from models.pagination import (Pagination, encode_cursor, decode_cursor, set_pagination_headers,
+                               DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+
+ORDER_BY = [("c.reg_dt", "regDt", "DESC"), ("c.customer_id", "customerId", "DESC")]
+
+app = Flask(__name__)
+
+
+def _pagination(query_string="", order_by=ORDER_BY, **kwargs):
+    with app.test_request_context("/list" + query_string):
+        return Pagination(order_by, **kwargs)
+
+
+def test_cursor_round_trip():
+    values = [datetime(2024, 1, 2, 3, 4, 5, 6), date(2024, 1, 2), Decimal("12.50"), "고객", 7, None]
+
+    token = encode_cursor(values)
+
+    assert "=" not in token
+    assert decode_cursor(token) == ["2024-01-02 03:04:05.000006", "2024-01-02", "12.50", "고객", 7, None]
+
+
+def test_limit_defaults_and_is_capped():
+    assert _pagination().limit == DEFAULT_PAGE_SIZE
+    assert _pagination("?limit=0").limit == DEFAULT_PAGE_SIZE
+    assert _pagination(f"?limit={MAX_PAGE_SIZE + 1}").limit == MAX_PAGE_SIZE
+    assert _pagination("?limit=-5").limit == 1
+
+
+def test_page_offset():
+    pagination = _pagination("?page=3&limit=10")
+
+    assert pagination.where() == ("", [])
+    assert pagination.order_limit() == (" ORDER BY c.reg_dt DESC, c.customer_id DESC LIMIT %s OFFSET %s", [11, 20])
+
+
+@pytest.mark.parametrize("token", ["not-base64!", encode_cursor([1]), encode_cursor({"a": 1})])
+def test_invalid_cursor(token):
+    with pytest.raises(ValueError):
+        _pagination(f"?cursor={token}")
+
+
+def test_next_cursor_continues_after_last_row():
+    rows = [{"regDt": f"2024-01-0{day}", "customerId": day} for day in (5, 4, 3)]
+    first_page, meta = _pagination("?limit=2").result(rows)
+
+    assert first_page == rows[:2]
+    assert meta == {"page": 1, "limit": 2, "hasNext": True, "nextCursor": encode_cursor(["2024-01-04", 4])}
+
+    pagination = _pagination(f"?limit=2&cursor={meta['nextCursor']}")
+    sql, params = pagination.where()
+    assert sql == " AND (((c.reg_dt < %s OR c.reg_dt IS NULL)) OR (c.reg_dt = %s AND (c.customer_id < %s OR c.customer_id IS NULL)))"
+    assert params == ["2024-01-04", "2024-01-04", 4]
+    assert pagination.order_limit()[1] == [3, 0]
+
+
+def test_last_page_has_no_cursor():
+    rows, meta = _pagination("?limit=5").result([{"regDt": "2024-01-01", "customerId": 1}])
+
+    assert meta["hasNext"] is False
+    assert meta["nextCursor"] is None
+
+
+def test_null_cursor_values():
+    order_by = [("c.upd_dt", "updDt", "ASC"), ("c.customer_id", "customerId", "ASC")]
+    sql, params = _pagination(f"?cursor={encode_cursor([None, 3])}", order_by=order_by).where()
+
+    assert sql == " AND ((c.upd_dt IS NOT NULL) OR (c.upd_dt IS NULL AND c.customer_id > %s))"
+    assert params == [3]
+
+
+def test_pagination_headers():
+    response = app.response_class()
+    set_pagination_headers(response, {"limit": 2, "hasNext": True, "nextCursor": "abc"})
+
+    assert response.headers["X-Page-Limit"] == "2"
+    assert response.headers["X-Has-Next"] == "true"
+    assert response.headers["X-Next-Cursor"] == "abc"
@@ -0,0 +1,61 @@
+"""
+pdf.cache.PdfCache 테스트
+- make_key: 데이터/옵션/템플릿 버전이 같으면 같은 키, 하나라도 다르면 다른 키
+- put/restore, 용량 초과 시 오래 안 쓴 파일부터 삭제
+"""
+import os
+from decimal import Decimal
+from datetime import datetime
+
+from pdf.cache import PdfCache
+
+DATA = {"estimate": {"id": 1, "total": Decimal("1000.50"), "regDt": datetime(2024, 1, 2, 3, 4)},
+        "products": [{"name": "A", "qty": 2}]}
+
+
+def test_make_key_is_stable_for_equal_input():
+    reordered = {"products": [{"qty": 2, "name": "A"}], "estimate": dict(reversed(list(DATA["estimate"].items())))}
+
+    key = PdfCache.make_key(DATA, "estimate.html", "v1", showStamp=True, landscape=False)
+
+    assert key == PdfCache.make_key(reordered, "estimate.html", "v1", landscape=False, showStamp=True)
+    assert len(key) == 64
+
+
+def test_make_key_changes_with_data_options_and_template():
+    key = PdfCache.make_key(DATA, "estimate.html", "v1", showStamp=True)
+    changed_data = {**DATA, "products": [{"name": "A", "qty": 3}]}
+
+    assert key != PdfCache.make_key(changed_data, "estimate.html", "v1", showStamp=True)
+    assert key != PdfCache.make_key(DATA, "estimate.html", "v1", showStamp=False)
+    assert key != PdfCache.make_key(DATA, "estimate.html", "v2", showStamp=True)
+    assert key != PdfCache.make_key(DATA, "contract.html", "v1", showStamp=True)
+
+
+def test_put_and_restore(tmp_path):
+    cache = PdfCache(str(tmp_path / "cache"))
+    src = tmp_path / "out.pdf"
+    src.write_bytes(b"%PDF-1.4 test")
+
+    assert cache.restore("k", str(tmp_path / "miss.pdf")) is False
+    cache.put("k", str(src))
+
+    assert cache.restore("k", str(tmp_path / "copy.pdf")) is True
+    assert (tmp_path / "copy.pdf").read_bytes() == b"%PDF-1.4 test"
+
+
+def test_evict_removes_least_recently_used(tmp_path):
+    cache = PdfCache(str(tmp_path / "cache"))
+    for i, name in enumerate(("used", "old", "new")):
+        src = tmp_path / f"{name}.pdf"
+        src.write_bytes(b"x" * 100)
+        cache.put(name, str(src))
+        os.utime(cache.get(name), (1000 + i, 1000 + i))
+    os.utime(cache.get("used"), (2000, 2000))  # 가장 먼저 저장됐지만 최근에 사용
+
+    cache.max_bytes = 250
+    cache.evict()
+
+    assert cache.get("old") is None
+    assert cache.get("used") is not None
+    assert cache.get("new") is not None
@@ -0,0 +1,64 @@
+"""
+pdf.templates.TemplateRegistry 테스트
+- auto reload 는 debug 모드에서만
+- 운영 모드에서도 파일이 교체되면 version() 이 다시 로드 → 새 소스 해시 + 새 템플릿으로 렌더링
+"""
+import os
+
+import pytest
+from flask import Flask
+
+from pdf.templates import TemplateRegistry
+
+
+def _write(path, text):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def _touch_later(path):
+    # 수정시각 해상도가 낮은 파일시스템에서도 변경으로 보이도록
+    mtime = os.path.getmtime(path) + 2
+    os.utime(path, (mtime, mtime))
+
+
+@pytest.fixture
+def template_dir(tmp_path):
+    path = tmp_path / 'templates'
+    path.mkdir()
+    _write(path / 'doc.html', 'v1 {{ name }}')
+    return path
+
+
+@pytest.fixture
+def registry(template_dir, tmp_path):
+    return TemplateRegistry(str(template_dir), str(tmp_path / 'cache'))
+
+
+@pytest.mark.parametrize('debug', [False, True])
+def test_auto_reload_follows_app_debug(registry, debug):
+    app = Flask(__name__)
+    app.debug = debug
+    with app.app_context():
+        registry.get('doc.html')
+    assert registry.env.auto_reload is debug
+
+
+def test_version_is_stable_while_file_unchanged(registry):
+    with Flask(__name__).app_context():
+        assert registry.version('doc.html') == registry.version('doc.html')
+
+
+def test_swapped_template_is_reloaded_without_debug(registry, template_dir):
+    with Flask(__name__).app_context():
+        before = registry.version('doc.html')
+        assert registry.render('doc.html', name='a') == 'v1 a'
+
+        _write(template_dir / 'doc.html', 'v2 {{ name }}')
+        _touch_later(template_dir / 'doc.html')
+
+        assert registry.env.auto_reload is False
+        after = registry.version('doc.html')
+        assert after != before
+        assert registry.render('doc.html', name='a') == 'v2 a'
+        assert registry.version('doc.html') == after